@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+
+"""Create the ``hal_push_state`` table."""
+
+from __future__ import absolute_import, division, print_function
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = 'e3a5c4a1ed72'
+down_revision = '402af3fbf68b'
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.create_table(
+        'hal_push_state',
+        sa.Column('recid', sa.Integer, primary_key=True),
+        sa.Column('status', sa.Text, nullable=False),
+        sa.Column('hal_id', sa.Text, nullable=True),
+        sa.Column('payload_hash', sa.Text, nullable=True),
+        sa.Column('error', sa.Text, nullable=True),
+        sa.Column('updated', sa.DateTime, nullable=False),
+    )
+    op.create_index(
+        'ix_hal_push_state_status', 'hal_push_state', ['status'])
+    op.create_index(
+        'ix_hal_push_state_updated', 'hal_push_state', ['updated'])
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_index('ix_hal_push_state_updated', table_name='hal_push_state')
+    op.drop_index('ix_hal_push_state_status', table_name='hal_push_state')
+    op.drop_table('hal_push_state')
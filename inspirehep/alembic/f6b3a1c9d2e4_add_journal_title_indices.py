@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+
+"""Add indices on the titles of the Journal records."""
+
+from __future__ import absolute_import, division, print_function
+
+from alembic import op
+
+
+revision = 'f6b3a1c9d2e4'
+down_revision = 'e3a5c4a1ed72'
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.execute(
+        "CREATE INDEX idxjournalshorttitle ON records_metadata "
+        "(CAST(json -> 'short_title' AS VARCHAR)) "
+        "WHERE (json -> '_collections') ? 'Journals'"
+    )
+    op.execute(
+        "CREATE INDEX idxjournaltitletitle ON records_metadata "
+        "((json -> 'journal_title' ->> 'title')) "
+        "WHERE (json -> '_collections') ? 'Journals'"
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.execute("DROP INDEX IF EXISTS idxjournaltitletitle")
+    op.execute("DROP INDEX IF EXISTS idxjournalshorttitle")
@@ -28,6 +28,8 @@ import os
 import sys
 import pkg_resources
 
+from datetime import timedelta
+
 from celery.schedules import crontab
 from logging.config import dictConfig
 
@@ -52,6 +54,9 @@ FEATURE_FLAG_ENABLE_ORCID_PUSH = False
 #   some ORCIDs -> "^(0000-0002-7638-5686|0000-0002-7638-5687)$"
 FEATURE_FLAG_ORCID_PUSH_WHITELIST_REGEX = '.*'
 FEATURE_FLAG_ENABLE_FUZZY_MATCHER = False
+FEATURE_FLAG_ENABLE_BATCH_EXACT_MATCH = False
+"""This feature flag resolves the exact matches of all the records of a harvest
+at once, see ``inspirehep.modules.workflows.batch_matching``."""
 FEATURE_FLAG_ENABLE_MERGER = False
 FEATURE_FLAG_ENABLE_UPDATE_TO_LEGACY = False
 """This feature flag will prevent to send a ``replace`` update to legacy."""
@@ -91,7 +96,15 @@ CELERYBEAT_SCHEDULE = {
     'journal_kb_builder': {
         'task': 'inspirehep.modules.refextract.tasks.create_journal_kb_file',
         'schedule': crontab(minute='0', hour='*/1'),
-    }
+    },
+    'orcid_push_queue_drainer': {
+        'task': 'inspirehep.modules.orcid.tasks.drain_orcid_push_queue',
+        'schedule': timedelta(seconds=30),
+    },
+    'landing_page_blocks_refresher': {
+        'task': 'inspirehep.modules.theme.tasks.refresh_landing_page_blocks',
+        'schedule': timedelta(minutes=5),
+    },
 }
 # Cache
 # =====
@@ -108,6 +121,25 @@ BASE_FILES_LOCATION = os.path.join(sys.prefix, 'var/data')
 # This is needed in order to be able to use EOS files locations
 MAX_CONTENT_LENGTH = 100 * 1024 * 1024  # 100 MiB
 
+FILES_DOWNLOAD_MAX_WORKERS = 8
+"""Maximum number of concurrent downloads of documents and figures."""
+FILES_DOWNLOAD_TIMEOUT = 60
+"""Seconds to wait for a document or figure host to send data."""
+INSTITUTION_DATATABLES_CACHE_TIMEOUT = 300
+"""Seconds during which the people and experiments of an institution are
+cached for its detailed page."""
+LANDING_PAGES_CACHE_TIMEOUT = 600
+"""Seconds after which a cached block of the landing pages is refreshed in
+the background, while still being served."""
+LANDING_PAGES_CACHE_MAX_AGE = 86400
+"""Seconds after which a cached block of the landing pages is dropped, so
+that it is computed again during the request."""
+PROBED_LINKS_CACHE_TIMEOUT = 600
+"""Seconds during which a worker remembers the links it found to point to a
+PDF, and the content it downloaded while checking them."""
+PROBED_LINKS_CACHE_SIZE = 16
+"""Maximum number of link contents kept around by a worker."""
+
 # REST
 # ====
 REST_ENABLE_CORS = True
@@ -870,6 +902,7 @@ RECORDS_UI_ENDPOINTS = dict(
         template='inspirehep_theme/format/record/'
                  'Inspire_Default_HTML_detailed.tpl',
         record_class='inspirehep.modules.records.wrappers:LiteratureRecord',
+        view_imp='inspirehep.modules.theme.views:record_detail',
     ),
     authors=dict(
         pid_type='aut',
@@ -1196,6 +1229,8 @@ Note:
   This variable takes precedence over ``RECORDS_SKIP_FILES``, but can be
   overriden by the tasks in the ``inspirehep.modules.migrator.tasks`` module.
 """
+RECORDS_MIGRATION_BATCH_SIZE = 100
+"""Number of records pushed by legacy migrated in a single transaction."""
 
 JSONSCHEMAS_HOST = "localhost:5000"
 JSONSCHEMAS_REPLACE_REFS = True
@@ -1236,6 +1271,21 @@ OAUTHCLIENT_ORCID_CREDENTIALS = dict(
 )
 ORCID_PUSH_TASK_ENDPOINT = 'inspirehep.modules.orcid.tasks.orcid_push'
 ORCID_ALLOW_PUSH_DEFAULT = False
+ORCID_PUSH_LOCK_TIMEOUT = 300
+"""Seconds a push of a record not yet on ORCID waits for the other pushes
+of new records to the same ORCID to finish."""
+ORCID_PUSH_DEBOUNCE_DELAY = 0
+"""Seconds to wait before pushing a record to ORCID after it was saved, so
+that the other saves happening meanwhile don't cause more pushes. If 0 the
+record is pushed right away."""
+ORCID_API_RATE_LIMIT = 8
+"""Requests per second each process sends at most to the ORCID member API.
+
+ORCID allows 24 requests per second per client, shared by all the workers
+consuming the ORCID queues."""
+ORCID_WORKS_FETCH_MAX_WORKERS = 4
+"""Batches of detailed works fetched concurrently when recaching the
+put-codes of an author."""
 
 OAUTHCLIENT_SETTINGS_TEMPLATE = 'inspirehep_theme/page.html'
 
@@ -1251,6 +1301,17 @@ THEME_500_TEMPLATE = "inspirehep_theme/errors/500.html"
 CFG_SITE_SUPPORT_EMAIL = "admin@inspirehep.net"
 INSPIRELABS_FEEDBACK_EMAIL = "labsfeedback@inspirehep.net"
 
+# RT tickets
+# ==========
+RT_TICKETS_CACHE_TIMEOUT = 60
+"""Time in seconds during which the tickets of a record are cached."""
+
+RT_USERS_AND_QUEUES_CACHE_TIMEOUT = 3600
+"""Time in seconds during which the lists of RT users and queues are cached."""
+
+RT_TICKETS_CONCURRENT_REQUESTS = 10
+"""Maximum number of concurrent requests sent to RT to fetch ticket details."""
+
 # Submission
 # ==========
 LEGACY_ROBOTUPLOAD_URL = None  # Disabled by default
@@ -1263,6 +1324,18 @@ MAGPIE_API_URL = None  # e.g. "http://magpie.inspirehep.net/api"
 LEGACY_BASE_URL = "http://inspirehep.net"
 LEGACY_RECORD_URL_PATTERN = 'http://inspirehep.net/record/{recid}'
 
+WORKFLOWS_PREDICTION_BATCH_MAX_WAIT = 0
+"""Seconds a Magpie or Beard request waits for concurrent requests to be
+sent together with them to ``<endpoint>/batch``. Batching is disabled when
+not positive. Requests are only batched within a worker process, so this
+requires a ``threads``, ``eventlet`` or ``gevent`` Celery pool: with the
+default ``prefork`` pool requests are always sent right away."""
+WORKFLOWS_PREDICTION_BATCH_MAX_SIZE = 50
+"""Maximum number of predictions sent in a single batch request."""
+WORKFLOWS_PREDICTION_BATCH_REPROBE_AFTER = 600
+"""Seconds during which predictions are sent one by one after a batch
+endpoint failed to answer a batch, before trying it again."""
+
 
 # Harvesting and Workflows
 # ========================
@@ -1471,6 +1544,10 @@ CRAWLER_SETTINGS = {
 # ===================
 LEGACY_PID_PROVIDER = None  # e.g. "http://example.org/batchuploader/allocaterecord"
 
+PIDSTORE_RECID_RESERVATION_SIZE = 10
+"""Number of record identifiers reserved at once by each process, either on
+legacy or on the local sequence."""
+
 # Inspire subject translation
 # ===========================
 ARXIV_TO_INSPIRE_CATEGORY_MAPPING = {
@@ -1679,11 +1756,17 @@ INSPIRE_REF_UPDATER_WHITELISTS = {
 }
 """Controls which fields are updated when the referred record is updated."""
 
+INSPIRE_REF_UPDATER_CHUNK_SIZE = 500
+"""Number of records whose references are updated in a single transaction."""
+
 # Configuration for the matcher
 # =============================
 EXACT_MATCH = exact_match
 EXACT_MATCH['source'] = ['control_number']
 
+WORKFLOWS_BATCH_EXACT_MATCH_CACHE_TIMEOUT = 600
+"""Seconds during which the exact matches resolved for a harvest are cached."""
+
 FUZZY_MATCH = {
     'algorithm': [
         {
@@ -32,8 +32,14 @@ from redis_lock import Lock
 
 
 @contextmanager
-def redis_locking_context(lock_name, expire=120, auto_renewal=True):
-    """Locked Context Manager to perform operations on Redis."""
+def redis_locking_context(lock_name, expire=120, auto_renewal=True,
+                          blocking=False, timeout=None):
+    """Locked Context Manager to perform operations on Redis.
+
+    By default the lock is not waited for: if it is already taken a
+    ``RedisLockError`` is raised right away. With ``blocking`` the lock is
+    waited for, at most ``timeout`` seconds if given.
+    """
     if not lock_name:
         raise RedisLockError('Lock name not specified.')
 
@@ -42,7 +48,7 @@ def redis_locking_context(lock_name, expire=120, auto_renewal=True):
     redis = StrictRedis.from_url(redis_url)
     lock = Lock(redis, lock_name, expire=expire, auto_renewal=auto_renewal)
 
-    if lock.acquire(blocking=False):
+    if lock.acquire(blocking=blocking, timeout=timeout if blocking else None):
         try:
             yield redis
         finally:
@@ -30,7 +30,9 @@ from fs.opener import fsopendir
 from sqlalchemy_continuum import transaction_class, version_class
 from werkzeug.utils import secure_filename
 
+from invenio_accounts.models import User
 from invenio_db import db
+from invenio_pidstore.models import PersistentIdentifier
 from invenio_records.models import RecordMetadata
 from refextract import (
     extract_references_from_string,
@@ -127,29 +129,56 @@ def revert_to_revision(endpoint, pid_value):
 @blueprint_api.route('/<endpoint>/<int:pid_value>/revisions', methods=['GET'])
 @editor_permission
 def get_revisions(endpoint, pid_value):
-    """Get revisions of given record"""
+    """Get revisions of given record.
+
+    The revisions are returned from the latest, ``size`` at a time if the
+    ``size`` and ``page`` query parameters are given. Their content can be
+    fetched with ``get_revision``.
+    """
+    RecordMetadataVersion = version_class(RecordMetadata)
     Transaction = transaction_class(RecordMetadata)
     pid_type = get_pid_type_from_endpoint(endpoint)
-    record = get_db_record(pid_type, pid_value)
 
-    revisions = []
-    for revision in reversed(record.revisions):
-        transaction_id = revision.model.transaction_id
-
-        user = Transaction.query.filter(
-            Transaction.id == transaction_id).one().user
-        if user:
-            user_email = user.email
-        else:
-            user_email = 'system'
-
-        revisions.append({
-            'updated': revision.updated,
-            'revision_id': revision.revision_id,
-            'user_email': user_email,
-            'transaction_id': transaction_id,
-            'rec_uuid': record.id
-        })
+    query = db.session.query(
+        RecordMetadataVersion.id,
+        RecordMetadataVersion.version_id,
+        RecordMetadataVersion.updated,
+        RecordMetadataVersion.transaction_id,
+        User.email,
+    ).join(
+        PersistentIdentifier,
+        PersistentIdentifier.object_uuid == RecordMetadataVersion.id,
+    ).join(
+        Transaction,
+        Transaction.id == RecordMetadataVersion.transaction_id,
+    ).outerjoin(
+        User,
+        User.id == Transaction.user_id,
+    ).filter(
+        PersistentIdentifier.pid_type == pid_type,
+        PersistentIdentifier.pid_value == str(pid_value),
+    ).order_by(
+        RecordMetadataVersion.version_id.desc(),
+    )
+
+    size = request.args.get('size', type=int)
+    page = request.args.get('page', 1, type=int)
+    if (size is not None and size < 0) or page < 1:
+        return jsonify(
+            success=False,
+            message='size must not be negative and page must be at least 1',
+        ), 400
+
+    if size:
+        query = query.limit(size).offset((page - 1) * size)
+
+    revisions = [{
+        'updated': revision.updated,
+        'revision_id': revision.version_id - 1,
+        'user_email': revision.email or 'system',
+        'transaction_id': revision.transaction_id,
+        'rec_uuid': revision.id,
+    } for revision in query]
     return jsonify(revisions)
 
 
@@ -196,7 +225,7 @@ def create_rt_ticket(endpoint, pid_value):
 @editor_permission
 def resolve_rt_ticket(endpoint, pid_value, ticket_id):
     """View to resolve an rt ticket"""
-    tickets.resolve_ticket(ticket_id)
+    tickets.resolve_ticket(ticket_id, recid=pid_value)
     return jsonify(success=True)
 
 
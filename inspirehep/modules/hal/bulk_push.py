@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 #
 # This file is part of INSPIRE.
-# Copyright (C) 2014-2017 CERN.
+# Copyright (C) 2014-2018 CERN.
 #
 # INSPIRE is free software: you can redistribute it and/or modify
 # it under the terms of the GNU General Public License as published by
@@ -20,98 +20,258 @@
 # granted to it by virtue of its status as an Intergovernmental Organization
 # or submit itself to any jurisdiction.
 
-"""
-IMPORTANT This script is a copy/paste of:
-https://github.com/inspirehep/inspire-next/issues/2629
 
-It is unreliable and absolutely unmaintainable.
-It will be refactored with this user story:
-https://its.cern.ch/jira/browse/INSPIR-249
+"""Bulk push of records to HAL.
+
+The records to push are split in chunks, pushed by Celery tasks. The
+chunks are distributed among a bounded number of chains of tasks, so
+that at most that many chunks are pushed at the same time.
+
+The outcome of the last push of each record is kept in the
+``hal_push_state`` table, together with the hash of the TEI that was
+pushed: records whose TEI didn't change since their last successful push
+are skipped, so that an interrupted push can be started again.
 
 To be run with:
-$ /usr/bin/time -v inspirehep hal push
+$ inspirehep hal push
 """
 
 from __future__ import absolute_import, division, print_function
 
-import datetime
-import time
-
-import click
+import hashlib
 
+from celery import chain, group
 from flask import current_app
+from sqlalchemy import func
 
+from invenio_db import db
+from invenio_pidstore.models import PersistentIdentifier
 from invenio_records.models import RecordMetadata
-from inspirehep.modules.hal.core.tei import convert_to_tei
+from inspire_utils.logging import getStackTraceLogger
+
 from inspirehep.modules.hal.core.sword import create, update
+from inspirehep.modules.hal.core.tei import (
+    cache_tei,
+    convert_to_tei,
+    get_cached_tei,
+    prefetch_tei_context,
+)
+from inspirehep.modules.hal.models import HALPushState
+from inspirehep.modules.hal.utils import _get_hal_id
+from inspirehep.modules.records.api import InspireRecord
+
+
+LOGGER = getStackTraceLogger(__name__)
+
+PUSHED = HALPushState.PUSHED
+FAILED = HALPushState.FAILED
+SKIPPED = 'skipped'
+
+
+def get_recids_to_push(limit=0):
+    """Return the ids of the records to push to HAL.
+
+    Args:
+        limit(int): maximum number of records to return, 0 means no limit.
+
+    Returns:
+        List[int]: the ids of the records to push.
+    """
+    query = db.session.query(
+        RecordMetadata.json['control_number'],
+        RecordMetadata.json['_collections'],
+    ).filter(
+        RecordMetadata.json['_export_to'].op('@>')('{"HAL": true}')
+    ).order_by(RecordMetadata.created)
+
+    recids = []
+    for recid, collections in query.yield_per(1000):
+        if 'Literature' in collections or 'HAL Hidden' in collections:
+            recids.append(recid)
+            if limit and len(recids) >= limit:
+                break
+
+    return recids
+
+
+def get_records_to_push(recids):
+    """Return the records with the given ids, along with their revision.
+
+    Args:
+        recids(List[int]): the ids of the records to push.
+
+    Returns:
+        List[InspireRecord]: the records to push.
+    """
+    query = RecordMetadata.query.join(
+        PersistentIdentifier,
+        RecordMetadata.id == PersistentIdentifier.object_uuid,
+    ).filter(
+        PersistentIdentifier.pid_type == 'lit',
+        PersistentIdentifier.pid_value.in_([str(recid) for recid in recids]),
+    )
+
+    models = query.all()
+    # Detach the models, so that the commits of the push states don't expire
+    # them and their revision can be read without querying them again.
+    for model in models:
+        db.session.expunge(model)
+
+    return [InspireRecord(model.json, model=model) for model in models]
+
+
+def push_records(records, connection):
+    """Push a batch of records to HAL, skipping the unchanged ones.
+
+    The TEI of the records is taken from the cache when their revision
+    didn't change, and everything needed to convert the others is
+    prefetched at once.
+
+    Args:
+        records(List[InspireRecord]): the records to push.
+        connection(sword2.Connection): the connection to HAL to use.
+
+    Returns:
+        List[str]: the outcome of the push of each record.
+    """
+    cached = get_cached_tei(records)
+    context = prefetch_tei_context(
+        record for record in records
+        if record['control_number'] not in cached
+    )
+
+    return [
+        push_record(
+            record,
+            connection,
+            context=context,
+            tei=cached.get(record['control_number']),
+        ) for record in records
+    ]
+
+
+def push_record(record, connection, context=None, tei=None):
+    """Push a record to HAL, unless it didn't change since its last push.
+
+    Args:
+        record(dict): the record to push.
+        connection(sword2.Connection): the connection to HAL to use.
+        context(Optional[dict]): the context prefetched to convert the
+            record to TEI.
+        tei(Optional[string]): the TEI of the record, if already known.
+
+    Returns:
+        str: the outcome of the push, one of ``pushed``, ``skipped`` and
+        ``failed``.
+    """
+    recid = record['control_number']
+    state = HALPushState.query.get(recid) or HALPushState(recid=recid)
+
+    if tei is None:
+        try:
+            tei = convert_to_tei(record, context)
+        except Exception as e:
+            LOGGER.exception('Failed to convert #%s to TEI', recid)
+            return _save_state(state, status=FAILED, error='TEI: %s' % e)
+        cache_tei(record, tei)
+
+    tei = tei.encode('utf8')
+    payload_hash = hashlib.sha1(tei).hexdigest()
+    if state.status == PUSHED and state.payload_hash == payload_hash:
+        return SKIPPED
+
+    hal_id = _get_hal_id(record) or state.hal_id
+    for _ in range(2):
+        try:
+            if hal_id:
+                update(tei, hal_id.encode('utf8'), connection=connection)
+            else:
+                hal_id = create(tei, connection=connection).id
+            break
+        except Exception as e:
+            error = e
+    else:
+        LOGGER.error('Failed to push #%s to HAL: %s', recid, error)
+        return _save_state(state, status=FAILED, error='HAL: %s' % error)
+
+    return _save_state(
+        state,
+        status=PUSHED,
+        hal_id=hal_id,
+        payload_hash=payload_hash,
+        error=None,
+    )
+
+
+def _save_state(state, **kwargs):
+    for key, value in kwargs.items():
+        setattr(state, key, value)
+
+    db.session.add(state)
+    db.session.commit()
+
+    return state.status
+
+
+def run(limit=0, chunk_size=None, concurrency=None):
+    """Queue the push to HAL of all the records to export to HAL.
+
+    Args:
+        limit(int): maximum number of records to push, 0 means no limit.
+        chunk_size(Optional[int]): number of records pushed by each task,
+            defaults to ``HAL_PUSH_CHUNK_SIZE``.
+        concurrency(Optional[int]): maximum number of tasks running at the
+            same time, defaults to ``HAL_PUSH_MAX_CONCURRENCY``.
+
+    Returns:
+        Tuple[int, int]: the number of records and of chunks queued.
+    """
+    from inspirehep.modules.hal.tasks import push_records_to_hal
+
+    chunk_size = chunk_size or current_app.config['HAL_PUSH_CHUNK_SIZE']
+    concurrency = concurrency or current_app.config['HAL_PUSH_MAX_CONCURRENCY']
+
+    recids = get_recids_to_push(limit)
+    chunks = [
+        recids[i:i + chunk_size] for i in range(0, len(recids), chunk_size)
+    ]
+    lanes = [chunks[i::concurrency] for i in range(concurrency)]
+
+    group([
+        chain([push_records_to_hal.si(chunk) for chunk in lane])
+        for lane in lanes if lane
+    ]).apply_async()
+
+    return len(recids), len(chunks)
+
+
+def get_push_stats(since):
+    """Return statistics about the pushes to HAL since the given time.
+
+    Args:
+        since(datetime.datetime): the time since which to count the pushes.
+
+    Returns:
+        dict: the number of records ``pushed`` and ``failed`` since then,
+        and the ``throughput`` in records per second, or ``None`` if no
+        record was pushed yet.
+    """
+    counts = dict(db.session.query(
+        HALPushState.status,
+        func.count(HALPushState.recid),
+    ).filter(
+        HALPushState.updated >= since,
+    ).group_by(HALPushState.status))
+
+    last_update = db.session.query(func.max(HALPushState.updated)).filter(
+        HALPushState.updated >= since,
+    ).scalar()
 
+    done = counts.get(PUSHED, 0) + counts.get(FAILED, 0)
+    elapsed = (last_update - since).total_seconds() if last_update else 0
 
-def _set_config():
-    # Set the proper configuration.
-    current_app.config['HAL_COL_IRI'] = 'https://api.archives-ouvertes.fr/sword/hal'
-    current_app.config['HAL_EDIT_IRI'] = 'https://api.archives-ouvertes.fr/sword/'
-
-
-def run():
-    click.echo('>> PUSH TO HAL\n')
-    username = raw_input('Username: ')
-    password = raw_input('Password: ')
-    limit = raw_input('Limit the query? [number, 0 means no limit] ')
-    limit = int(limit)
-    yield_amt = raw_input('Yield amount? [suggested 100] ')
-    yield_amt = int(yield_amt)
-    if yield_amt < 10:
-        raise Exception('Yield amount should be >= 10')
-    click.echo('\n')
-
-    start = time.time()
-    _set_config()
-    current_app.config['HAL_USER_NAME'] = username
-    current_app.config['HAL_USER_PASS'] = password
-    records = RecordMetadata.query.filter(RecordMetadata.json['_export_to'].op('@>')('{"HAL": true}'))
-    if limit > 0:
-        records = records.limit(limit)
-    # log_file = os.path.join(os.path.dirname(__file__), 'HAL.log')
-    log_file = '/opt/inspire/HAL.log'
-    ok = ko = 0
-    with open(log_file, 'w') as f:
-        for i, raw_record in enumerate(records.yield_per(yield_amt)):
-            if i % 10 == 0:
-                now = str(datetime.timedelta(seconds=time.time() - start))
-                click.echo('%s records processed in %s: %s ok, %s ko' % (i, now, ok, ko))
-            record = raw_record.json
-            if 'Literature' in record['_collections'] or 'HAL Hidden' in record['_collections']:
-                try:
-                    tei = convert_to_tei(record)
-                except Exception as e:
-                    f.write('EXC TEI: %s %s\n' % (record['control_number'], str(e)))
-                    # ko.append(record['control_number'])
-                    ko += 1
-                    continue
-
-                success = False
-                for _ in range(2):
-                    try:
-                        hal_id = ''
-                        ids = record.get('external_system_identifiers', [])
-                        for id_ in ids:
-                            if id_['schema'] == 'HAL':
-                                hal_id = id_['value']
-                        if hal_id:
-                            update(tei.encode('utf8'), hal_id.encode('utf8'))
-                            f.write('UPD: %s %s\n' % (record['control_number'], hal_id))
-                        else:
-                            receipt = create(tei.encode('utf8'))
-                            f.write('NEW: %s %s\n' % (record['control_number'], receipt.id))
-                        success = True
-                        break
-                    except Exception as e:
-                        continue
-                if success:
-                    # ok.append(record['control_number'])
-                    ok += 1
-                else:
-                    f.write('EXC HAL: %s %s\n' % (record['control_number'], str(e)))
-                    # ko.append(record['control_number'])
-                    ko += 1
-    click.echo('%s records processed in %s: %s ok, %s ko' % (i, now, ok, ko))
+    return {
+        'pushed': counts.get(PUSHED, 0),
+        'failed': counts.get(FAILED, 0),
+        'throughput': done / elapsed if elapsed > 0 else None,
+    }
@@ -22,11 +22,13 @@
 
 from __future__ import absolute_import, division, print_function
 
+from datetime import datetime
+
 import click
 
 from flask.cli import with_appcontext
 
-from .bulk_push import run
+from .bulk_push import get_push_stats, run
 
 
 @click.group()
@@ -35,6 +37,29 @@ def hal():
 
 
 @hal.command()
+@click.option('--limit', default=0, help='Maximum number of records to push, 0 means no limit.')
+@click.option('--chunk-size', type=int, help='Number of records pushed by each task.')
+@click.option('--concurrency', type=int, help='Maximum number of tasks running at the same time.')
 @with_appcontext
-def push():
-    run()
+def push(limit, chunk_size, concurrency):
+    """Queue the push to HAL of the records to export to HAL."""
+    started = datetime.utcnow().replace(microsecond=0)
+    total, chunks = run(limit, chunk_size, concurrency)
+
+    click.echo('Queued the push of {} records in {} tasks.'.format(total, chunks))
+    click.echo('Follow its progress with:')
+    click.echo('  inspirehep hal stats --since {}'.format(started.isoformat()))
+
+
+@hal.command()
+@click.option('--since', required=True, help='UTC time since when to count the pushes, as YYYY-MM-DDTHH:MM:SS.')
+@with_appcontext
+def stats(since):
+    """Show how many records were pushed to HAL since a given time."""
+    since = datetime.strptime(since, '%Y-%m-%dT%H:%M:%S')
+    push_stats = get_push_stats(since)
+
+    click.echo('Pushed: {}'.format(push_stats['pushed']))
+    click.echo('Failed: {}'.format(push_stats['failed']))
+    if push_stats['throughput'] is not None:
+        click.echo('Throughput: {:.2f} records/s'.format(push_stats['throughput']))
@@ -48,6 +48,9 @@ HAL_DOMAIN_MAPPING = {
 }
 """Mapping used when converting from INSPIRE categories to HAL domains."""
 
+HAL_TEI_CACHE_TIMEOUT = 7 * 24 * 60 * 60
+"""Seconds during which the TEI of a record revision is cached."""
+
 
 #
 # Configuration used when connecting to HAL.
@@ -99,3 +102,14 @@ Note:
 
 HAL_IGNORE_CERTIFICATES = False
 """Whether to check certificates when connecting to HAL."""
+
+
+#
+# Configuration used when pushing records in bulk.
+#
+
+HAL_PUSH_CHUNK_SIZE = 50
+"""Number of records pushed to HAL by each task of a bulk push."""
+
+HAL_PUSH_MAX_CONCURRENCY = 4
+"""Maximum number of tasks of a bulk push running at the same time."""
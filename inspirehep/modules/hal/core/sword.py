@@ -33,9 +33,12 @@ from sword2 import Connection
 from sword2.http_layer import HttpLib2Layer
 
 
-def create(tei, doc_file=None):
+_CONNECTIONS = {}
+
+
+def create(tei, doc_file=None, connection=None):
     """Create a record on HAL using the SWORD2 protocol."""
-    connection = _new_connection()
+    connection = connection or _new_connection()
     payload, mimetype, filename = _create_payload(tei, doc_file)
 
     col_iri = current_app.config['HAL_COL_IRI']
@@ -50,9 +53,9 @@ def create(tei, doc_file=None):
     )
 
 
-def update(tei, hal_id, doc_file=None):
+def update(tei, hal_id, doc_file=None, connection=None):
     """Update a record on HAL using the SWORD2 protocol."""
-    connection = _new_connection()
+    connection = connection or _new_connection()
     payload, mimetype, filename = _create_payload(tei, doc_file)
 
     edit_iri = current_app.config['HAL_EDIT_IRI'] + hal_id
@@ -77,7 +80,27 @@ class HttpLib2LayerIgnoreCert(HttpLib2Layer):
             disable_ssl_certificate_validation=True)
 
 
-def _new_connection():
+def get_connection():
+    """Return the SWORD2 connection to HAL of this process.
+
+    The connection keeps its HTTP connections open between requests, and
+    doesn't keep the history and the receipts of the requests it sent, so
+    that it can be used for any number of them.
+    """
+    connection_key = (
+        current_app.config['HAL_USER_NAME'],
+        current_app.config['HAL_USER_PASS'],
+        current_app.config['HAL_IGNORE_CERTIFICATES'],
+    )
+    if connection_key not in _CONNECTIONS:
+        _CONNECTIONS[connection_key] = _new_connection(
+            keep_history=False,
+            cache_deposit_receipts=False,
+        )
+    return _CONNECTIONS[connection_key]
+
+
+def _new_connection(**kwargs):
     user_name = current_app.config['HAL_USER_NAME']
     user_pass = current_app.config['HAL_USER_PASS']
 
@@ -87,7 +110,8 @@ def _new_connection():
         http_impl = HttpLib2Layer('.cache')
 
     return Connection(
-        '', user_name=user_name, user_pass=user_pass, http_impl=http_impl)
+        '', user_name=user_name, user_pass=user_pass, http_impl=http_impl,
+        **kwargs)
 
 
 def _create_payload(tei, doc_file):
@@ -20,14 +20,24 @@
 # granted to it by virtue of its status as an Intergovernmental Organization
 # or submit itself to any jurisdiction.
 
-"""HAL TEI core."""
+"""HAL TEI core.
+
+The conversion of a record is split in two phases: first everything that
+needs to be queried or computed is prefetched, for a whole batch of records
+at once, with :func:`prefetch_tei_context`; then each record is rendered
+with :func:`convert_to_tei` without further queries.
+"""
 
 from __future__ import absolute_import, division, print_function
 
-from flask import render_template
+from flask import current_app, render_template
 from langdetect import detect
 from langdetect.lang_detect_exception import LangDetectException
 
+from invenio_cache import current_cache
+from inspire_dojson.utils import get_recid_from_ref
+from inspire_utils.record import get_value
+
 from inspirehep.utils.record import (
     get_abstract,
     get_arxiv_id,
@@ -41,7 +51,7 @@ from ..utils import (
     get_conference_city,
     get_conference_country,
     get_conference_end_date,
-    get_conference_record,
+    get_conference_records,
     get_conference_start_date,
     get_conference_title,
     get_divulgation,
@@ -58,14 +68,21 @@ from ..utils import (
     get_peer_reviewed,
     get_publication_date,
     is_published,
+    _get_hal_id_map,
 )
 
 
-def convert_to_tei(record):
+CACHE_KEY_PREFIX = 'hal_tei::'
+
+
+def convert_to_tei(record, context=None):
     """Return the record formatted in XML+TEI per HAL's specification.
 
     Args:
         record(InspireRecord): a record.
+        context(Optional[dict]): the context prefetched with
+            :func:`prefetch_tei_context` for a batch including ``record``.
+            If not given, it is prefetched for ``record`` alone.
 
     Returns:
         string: the record formatted in XML+TEI.
@@ -77,33 +94,126 @@ def convert_to_tei(record):
         ...
 
     """
+    if context is None:
+        context = prefetch_tei_context([record])
+
     if _is_comm(record):
-        ctx = _get_comm_context(record)
+        ctx = _get_comm_context(record, context)
         return render_template('hal/comm.xml', **ctx)
     elif _is_art(record):
-        ctx = _get_art_context(record)
+        ctx = _get_art_context(record, context)
         return render_template('hal/art.xml', **ctx)
     elif _is_preprint(record):
-        ctx = _get_preprint_context(record)
+        ctx = _get_preprint_context(record, context)
         return render_template('hal/preprint.xml', **ctx)
 
     raise NotImplementedError
 
 
+def prefetch_tei_context(records):
+    """Prefetch what is needed to convert a batch of records to TEI.
+
+    Fetches with one query per type the HAL identifiers of the institutions
+    and the Conference records referenced by all the ``records``, and
+    detects the language of their abstracts.
+
+    Args:
+        records(Iterable[InspireRecord]): the records to convert.
+
+    Returns:
+        dict: the context to pass to :func:`convert_to_tei`.
+    """
+    records = list(records)
+
+    return {
+        'conferences': get_conference_records(records),
+        'hal_id_map': _get_hal_id_map(*records),
+        'languages': {
+            abstract: _detect_language(abstract)
+            for abstract in set(get_abstract(record) for record in records)
+        },
+    }
+
+
+def get_cached_tei(records):
+    """Return the TEI of the records that was cached for their revision.
+
+    Args:
+        records(Iterable[InspireRecord]): some records.
+
+    Returns:
+        dict: maps the ids of the records whose TEI is cached to their TEI.
+    """
+    keys = [(record['control_number'], _get_cache_key(record)) for record in records]
+    keys = [(recid, key) for recid, key in keys if key]
+    if not keys:
+        return {}
+
+    recids, keys = zip(*keys)
+    cached = current_cache.get_many(*keys)
+
+    return {
+        recid: tei for recid, tei in zip(recids, cached) if tei is not None
+    }
+
+
+def cache_tei(record, tei):
+    """Cache the TEI of a record for its current revision.
+
+    The TEI is cached for ``HAL_TEI_CACHE_TIMEOUT`` seconds, which bounds
+    how long a change to the institutions or the conference of the record
+    can go unnoticed. Records without a revision are not cached.
+
+    Args:
+        record(InspireRecord): a record.
+        tei(string): the record formatted in XML+TEI.
+    """
+    key = _get_cache_key(record)
+    if key:
+        current_cache.set(
+            key, tei, timeout=current_app.config['HAL_TEI_CACHE_TIMEOUT'])
+
+
+def _get_cache_key(record):
+    revision_id = getattr(record, 'revision_id', None)
+    if revision_id is None:
+        return None
+
+    return '{prefix}{recid}::{revision_id}'.format(
+        prefix=CACHE_KEY_PREFIX,
+        recid=record['control_number'],
+        revision_id=revision_id,
+    )
+
+
+def _detect_language(text):
+    try:
+        return detect(text)
+    except LangDetectException:
+        return ''
+
+
+def _get_abstract_language(abstract, context):
+    languages = context['languages']
+    if abstract in languages:
+        return languages[abstract]
+
+    return _detect_language(abstract)
+
+
 def _is_comm(record):
     document_types = get_document_types(record)
 
     return 'conference paper' in document_types
 
 
-def _get_comm_context(record):
+def _get_comm_context(record, context):
     abstract = get_abstract(record)
-    try:
-        abstract_language = detect(abstract)
-    except LangDetectException:
-        abstract_language = ''
+    abstract_language = _get_abstract_language(abstract, context)
 
-    conference_record = get_conference_record(record)
+    conference_recid = get_recid_from_ref(
+        get_value(record, 'publication_info.conference_record[0]'))
+    conference_record = context['conferences'].get(conference_recid, {})
     conference_city = get_conference_city(conference_record)
     conference_country = get_conference_country(conference_record)
     conference_end_date = get_conference_end_date(conference_record)
@@ -114,7 +224,7 @@ def _get_comm_context(record):
         'abstract': abstract,
         'abstract_language': abstract_language,
         'arxiv_id': get_arxiv_id(record),
-        'authors': get_authors(record),
+        'authors': get_authors(record, context['hal_id_map']),
         'collaborations': get_collaborations(record),
         'conference_city': conference_city,
         'conference_country': conference_country,
@@ -145,18 +255,15 @@ def _is_art(record):
     return 'article' in document_types and published
 
 
-def _get_art_context(record):
+def _get_art_context(record, context):
     abstract = get_abstract(record)
-    try:
-        abstract_language = detect(abstract)
-    except LangDetectException:
-        abstract_language = ''
+    abstract_language = _get_abstract_language(abstract, context)
 
     return {
         'abstract': abstract,
         'abstract_language': abstract_language,
         'arxiv_id': get_arxiv_id(record),
-        'authors': get_authors(record),
+        'authors': get_authors(record, context['hal_id_map']),
         'collaborations': get_collaborations(record),
         'divulgation': get_divulgation(record),
         'doi': get_doi(record),
@@ -181,18 +288,15 @@ def _is_preprint(record):
     return 'article' in document_types
 
 
-def _get_preprint_context(record):
+def _get_preprint_context(record, context):
     abstract = get_abstract(record)
-    try:
-        abstract_language = detect(abstract)
-    except LangDetectException:
-        abstract_language = ''
+    abstract_language = _get_abstract_language(abstract, context)
 
     return {
         'abstract': abstract,
         'abstract_language': abstract_language,
         'arxiv_id': get_arxiv_id(record),
-        'authors': get_authors(record),
+        'authors': get_authors(record, context['hal_id_map']),
         'collaborations': get_collaborations(record),
         'divulgation': get_divulgation(record),
         'domains': get_domains(record),
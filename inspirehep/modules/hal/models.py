@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+
+"""HAL models."""
+
+from __future__ import absolute_import, division, print_function
+
+from datetime import datetime
+
+from invenio_db import db
+
+
+class HALPushState(db.Model):
+    """State of the last push of a record to HAL."""
+
+    __tablename__ = 'hal_push_state'
+
+    PUSHED = 'pushed'
+    FAILED = 'failed'
+
+    recid = db.Column(db.Integer, primary_key=True)
+    status = db.Column(db.Text, nullable=False, index=True)
+    hal_id = db.Column(db.Text, nullable=True)
+
+    # Hash of the last TEI payload pushed successfully.
+    payload_hash = db.Column(db.Text, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    updated = db.Column(
+        db.DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=False,
+        index=True,
+    )
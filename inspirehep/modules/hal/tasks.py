@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+
+"""HAL tasks."""
+
+from __future__ import absolute_import, division, print_function
+
+import time
+from collections import Counter
+
+from celery import shared_task
+
+from inspire_utils.logging import getStackTraceLogger
+
+from inspirehep.modules.hal.bulk_push import get_records_to_push, push_records
+from inspirehep.modules.hal.core.sword import get_connection
+
+
+LOGGER = getStackTraceLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def push_records_to_hal(recids):
+    """Push a chunk of records to HAL, skipping the unchanged ones.
+
+    Args:
+        recids(List[int]): the ids of the records to push.
+
+    Returns:
+        dict: how many records were ``pushed``, ``skipped`` and ``failed``.
+    """
+    start = time.time()
+    connection = get_connection()
+
+    records = get_records_to_push(recids)
+    outcomes = Counter(push_records(records, connection))
+
+    elapsed = time.time() - start
+    LOGGER.info(
+        'Processed %d records for HAL in %.1fs (%.2f records/s): %s',
+        len(recids), elapsed, len(recids) / elapsed if elapsed else 0,
+        dict(outcomes),
+    )
+
+    return dict(outcomes)
@@ -36,10 +36,10 @@ from inspire_utils.helpers import force_list
 from inspire_utils.name import ParsedName
 from inspire_utils.record import get_value
 from inspirehep.modules.records.json_ref_loader import replace_refs
-from inspirehep.utils.record_getter import get_es_records
+from inspirehep.utils.record_getter import get_db_records, get_es_records
 
 
-def get_authors(record):
+def get_authors(record, hal_id_map=None):
     """Return the authors of a record.
 
     Queries the Institution records linked from the authors affiliations
@@ -48,6 +48,9 @@ def get_authors(record):
 
     Args:
         record(InspireRecord): a record.
+        hal_id_map(Optional[dict]): maps the ids of the Institution records
+            to their HAL identifier. If given, Institution records are not
+            queried.
 
     Returns:
         list(dict): the authors of the record.
@@ -69,7 +72,8 @@ def get_authors(record):
         '300037'
 
     """
-    hal_id_map = _get_hal_id_map(record)
+    if hal_id_map is None:
+        hal_id_map = _get_hal_id_map(record)
 
     result = []
 
@@ -200,6 +204,45 @@ def get_conference_record(record, default=None):
         return default
 
 
+def get_conference_records(records):
+    """Return the first Conference record associated with each record.
+
+    Like :func:`get_conference_record`, but fetches the Conference records
+    of all the ``records`` with a single query.
+
+    Args:
+        records(Iterable[InspireRecord]): some records.
+
+    Returns:
+        dict: maps the ids of the Conference records to the records.
+
+    Examples:
+        >>> records = [
+        ...     {
+        ...         'publication_info': [
+        ...             {
+        ...                 'conference_record': {
+        ...                     '$ref': '/api/conferences/972464',
+        ...                 },
+        ...             },
+        ...         ],
+        ...     },
+        ... ]
+        >>> get_conference_records(records).keys()
+        [972464]
+
+    """
+    refs = (
+        get_value(record, 'publication_info.conference_record[0]')
+        for record in records
+    )
+    recids = {get_recid_from_ref(ref) for ref in refs if ref}
+
+    return {
+        el['control_number']: el for el in get_db_records('con', recids)
+    }
+
+
 def get_conference_start_date(record):
     """Return the opening date of a conference record.
 
@@ -561,10 +604,13 @@ def is_published(record):
     return citeable or submitted
 
 
-def _get_hal_id_map(record):
-    affiliation_records = chain.from_iterable(get_value(
-        record, 'authors.affiliations.record', default=[]))
-    affiliation_recids = [get_recid_from_ref(el) for el in affiliation_records]
+def _get_hal_id_map(*records):
+    affiliation_records = chain.from_iterable(chain.from_iterable(
+        get_value(record, 'authors.affiliations.record', default=[])
+        for record in records))
+    affiliation_recids = {get_recid_from_ref(el) for el in affiliation_records}
+    if not affiliation_recids:
+        return {}
 
     try:
         institutions = get_es_records('ins', affiliation_recids)
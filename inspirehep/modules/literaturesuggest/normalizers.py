@@ -64,12 +64,8 @@ def check_journal_existence(title):
         WHERE
             (r.json -> '_collections') ? 'Journals'
         AND
-            (r.json -> 'journal_title' @> :title)
-    """).bindparams(title=json.dumps(
-        {
-            "title": title
-        }
-    ))
+            (r.json -> 'journal_title' ->> 'title') = :title
+    """).bindparams(title=title)
 
     return db.session.execute(query)
 
@@ -28,7 +28,7 @@ import gzip
 import re
 import tarfile
 import zlib
-from collections import Counter
+from collections import Counter, OrderedDict
 from contextlib import closing
 from itertools import chain
 
@@ -46,7 +46,6 @@ from redis import StrictRedis
 from redis_lock import Lock
 
 from invenio_db import db
-from invenio_indexer.api import RecordIndexer, current_record_to_index
 from invenio_pidstore.models import PersistentIdentifier
 from invenio_search import current_search_client as es
 from invenio_search.utils import schema_to_index
@@ -61,6 +60,7 @@ from inspirehep.modules.pidstore.utils import (
     get_pid_types_from_endpoints,
 )
 from inspirehep.modules.records.receivers import index_after_commit
+from inspirehep.modules.records.utils import create_index_op
 from inspirehep.utils.schema import ensure_valid_schema
 
 from .models import LegacyRecordsMirror
@@ -226,61 +226,92 @@ def populate_mirror_from_file(source):
 
 @shared_task(ignore_result=True)
 def continuous_migration(skip_files=None):
-    """Task to continuously migrate what is pushed up by Legacy."""
+    """Task to continuously migrate what is pushed up by Legacy.
+
+    The records are read from the head of the ``legacy_records`` list in
+    batches of ``RECORDS_MIGRATION_BATCH_SIZE``. Only the last version of a
+    record pushed several times in a batch is migrated, then the batch is
+    committed, indexed and removed from the list.
+    """
     if skip_files is None:
         skip_files = current_app.config.get(
             'RECORDS_MIGRATION_SKIP_FILES',
             False,
         )
+    batch_size = current_app.config['RECORDS_MIGRATION_BATCH_SIZE']
     redis_url = current_app.config.get('CACHE_REDIS_URL')
     r = StrictRedis.from_url(redis_url)
     lock = Lock(r, 'continuous_migration', expire=120, auto_renewal=True)
     if lock.acquire(blocking=False):
         try:
-            while r.llen('legacy_records'):
-                raw_record = r.lrange('legacy_records', 0, 0)
-                if raw_record:
-                    migrate_and_insert_record(
-                        zlib.decompress(raw_record[0]),
-                        skip_files=skip_files,
-                    )
-                    db.session.commit()
-                r.lpop('legacy_records')
+            while True:
+                raw_records = r.lrange('legacy_records', 0, batch_size - 1)
+                if not raw_records:
+                    break
+
+                prod_records = [
+                    db.session.merge(prod_record)
+                    for prod_record in get_last_versions(raw_records)
+                ]
+                migrate_and_index_records(prod_records, skip_files=skip_files)
+                r.ltrim('legacy_records', len(raw_records), -1)
         finally:
             lock.release()
     else:
         LOGGER.info("Continuous_migration already executed. Skipping.")
 
 
-def create_index_op(record):
-    index, doc_type = current_record_to_index(record)
+def get_last_versions(raw_records):
+    """Return the last version of each record of a batch pushed by legacy.
 
-    return {
-        '_op_type': 'index',
-        '_index': index,
-        '_type': doc_type,
-        '_id': str(record.id),
-        '_version': record.revision_id,
-        '_version_type': 'external_gte',
-        '_source': RecordIndexer._prepare_record(record, index, doc_type),
-    }
+    Args:
+        raw_records(List[str]): the compressed MARCXML records, in the order
+            in which they were pushed.
 
+    Returns:
+        List[LegacyRecordsMirror]: the mirrored records, in the order in which
+        their last version was pushed.
+    """
+    last_versions = OrderedDict()
+    for raw_record in raw_records:
+        try:
+            prod_record = LegacyRecordsMirror.from_marcxml(
+                zlib.decompress(raw_record))
+        except ValueError:
+            LOGGER.exception('Migrator Recid Error')
+            continue
 
-@shared_task(ignore_result=False, queue='migrator')
-def migrate_recids_from_mirror(prod_recids, skip_files=False):
+        last_versions.pop(prod_record.recid, None)
+        last_versions[prod_record.recid] = prod_record
+
+    return list(last_versions.values())
+
+
+def migrate_and_index_records(prod_records, skip_files=False):
+    """Migrate mirrored records in a single transaction and index them in bulk.
+
+    Args:
+        prod_records(List[LegacyRecordsMirror]): the mirrored records.
+        skip_files(bool): flag indicating whether the files in the records
+            metadata should be copied over from legacy and attach to the
+            records.
+    """
     models_committed.disconnect(index_after_commit)
 
     index_queue = []
 
-    for recid in prod_recids:
-        with db.session.begin_nested():
-            record = migrate_record_from_mirror(
-                LegacyRecordsMirror.query.get(recid),
-                skip_files=skip_files,
-            )
-            if record:
-                index_queue.append(create_index_op(record))
-    db.session.commit()
+    try:
+        for prod_record in prod_records:
+            with db.session.begin_nested():
+                record = migrate_record_from_mirror(
+                    prod_record,
+                    skip_files=skip_files,
+                )
+                if record:
+                    index_queue.append(create_index_op(record))
+        db.session.commit()
+    finally:
+        models_committed.connect(index_after_commit)
 
     req_timeout = current_app.config['INDEXER_BULK_REQUEST_TIMEOUT']
     es_bulk(
@@ -290,7 +321,13 @@ def migrate_recids_from_mirror(prod_recids, skip_files=False):
         request_timeout=req_timeout,
     )
 
-    models_committed.connect(index_after_commit)
+
+@shared_task(ignore_result=False, queue='migrator')
+def migrate_recids_from_mirror(prod_recids, skip_files=False):
+    migrate_and_index_records(
+        (LegacyRecordsMirror.query.get(recid) for recid in prod_recids),
+        skip_files=skip_files,
+    )
 
 
 def _build_recid_to_uuid_map(citations_lookup):
@@ -24,30 +24,38 @@
 
 from __future__ import absolute_import, division, print_function
 
-import requests
-
 from itertools import chain
+from multiprocessing.pool import ThreadPool
+
 from flask import current_app as app
 from orcid import MemberAPI
 
 from inspire_utils.logging import getStackTraceLogger
 from inspire_utils.record import get_value
-from inspirehep.modules.orcid import OrcidConverter
+from inspirehep.modules.orcid import OrcidBuilder, OrcidConverter
 from inspirehep.modules.orcid.utils import (
-    _get_api_url_for_recid,
     _split_lists,
     WORKS_BULK_QUERY_LIMIT,
     RECID_FROM_INSPIRE_URL,
+    RateLimiter,
     hash_xml_element,
     log_time_context,
 )
+from inspirehep.modules.records.serializers import bibtex_v1
+from inspirehep.utils.record_getter import get_db_record
 
 LOGGER = getStackTraceLogger(__name__)
 
+_API_CLIENTS = {}
+_API_RATE_LIMITER = RateLimiter()
+
 
 def push_record_with_orcid(recid, orcid, oauth_token, put_code=None, old_hash=None):
     """Push record to ORCID with a specific ORCID ID.
 
+    The record is loaded and serialized in-process, and its ORCID XML is
+    built once: to compute the hash and, if that changed, to be pushed.
+
     Args:
         recid (string): HEP record to push
         orcid (string): ORCID identifier to push onto
@@ -61,9 +69,13 @@ def push_record_with_orcid(recid, orcid, oauth_token, put_code=None, old_hash=No
             - the put-code of the inserted item,
             - and the new hash of the ORCID record
     """
-    record = _get_hep_record(app.config, recid)
+    record = _get_hep_record(recid)
+
+    orcid_xml = OrcidConverter(
+        record, app.config['LEGACY_RECORD_URL_PATTERN']
+    ).get_xml()
 
-    new_hash = calculate_hash_for_record(record)
+    new_hash = hash_xml_element(orcid_xml)
     if new_hash == old_hash:
         LOGGER.info(
             'Hash unchanged: not pushing #%s as not a meaningful update', recid
@@ -71,18 +83,23 @@ def push_record_with_orcid(recid, orcid, oauth_token, put_code=None, old_hash=No
         return put_code, new_hash
 
     try:
-        bibtex = _get_bibtex_record(app.config, recid)
-    except requests.RequestException:
+        bibtex = _get_bibtex_record(record)
+    except Exception:
         bibtex = None
         LOGGER.error(
-            'Pushing record #%s without BibTex, as fetching it failed!', recid
+            'Pushing record #%s without BibTex, as serializing it failed!', recid
         )
 
-    orcid_api = _get_api()
+    # The hash covers neither the BibTeX nor the put-code, so they are only
+    # added now to the XML which was hashed.
+    builder = OrcidBuilder(orcid_xml)
+    if bibtex is not None:
+        builder.add_citation('bibtex', bibtex)
+    if put_code:
+        builder.set_put_code(put_code)
 
-    orcid_xml = OrcidConverter(
-        record, app.config['LEGACY_RECORD_URL_PATTERN'], put_code=put_code, bibtex_citation=bibtex
-    ).get_xml()
+    orcid_api = _get_api()
+    _API_RATE_LIMITER.wait(app.config.get('ORCID_API_RATE_LIMIT'))
 
     if put_code:
         LOGGER.info(
@@ -128,60 +145,29 @@ def calculate_hash_for_record(record):
     return hash_xml_element(orcid_rec.get_xml())
 
 
-def _get_record_by_mime(config, recid, mime_type):
+def _get_hep_record(recid):
     """
 
     Args:
-        config (inspire_utils.config.Config): configuration
-        recid (string): HEP record ID
-        mime_type (string): accept type
-
-    Returns:
-        requests.Response: response form API
-    """
-    server_name = config['SERVER_NAME']
-
-    record_api_endpoint = _get_api_url_for_recid(
-        server_name, config['SEARCH_UI_SEARCH_API'], recid
-    )
-
-    with log_time_context(
-        'Getting %s #%s record from inspire' % (mime_type, recid),
-        LOGGER,
-    ):
-        response = requests.get(record_api_endpoint, headers={
-            'Accept': mime_type
-        })
-        response.raise_for_status()
-        return response
-
-
-def _get_hep_record(config, recid):
-    """
-
-    Args:
-        config (inspire_utils.config.Config): configuration
         recid (string): HEP record ID
 
     Returns:
         dict: HEP record
     """
-    hep_response = _get_record_by_mime(config, recid, 'application/json')
-    return hep_response.json()['metadata']
+    with log_time_context('Getting #%s record from the DB' % recid, LOGGER):
+        return get_db_record('lit', recid)
 
 
-def _get_bibtex_record(config, recid):
+def _get_bibtex_record(record):
     """
 
     Args:
-        config (inspire_utils.config.Config): configuration
-        recid (string): HEP record ID
+        record (dict): HEP record
 
     Returns:
         string: BibTeX serialized record
     """
-    bibtex_response = _get_record_by_mime(config, recid, 'application/x-bibtex')
-    return bibtex_response.text
+    return bibtex_v1.create_bibliography([record])
 
 
 def get_author_putcodes(orcid, oauth_token):
@@ -196,6 +182,7 @@ def get_author_putcodes(orcid, oauth_token):
             (recid, put_code) with results.
     """
     def timed_read_record_member(orcid, request_type, oauth_token, accept_type, put_code=None):
+        _API_RATE_LIMITER.wait(rate_limit)
         with log_time_context(
             'Request for %s for %s' % (request_type, orcid),
             LOGGER
@@ -208,7 +195,18 @@ def get_author_putcodes(orcid, oauth_token):
                 put_code=put_code,
             )
 
+    def read_detailed_works(put_code_batch):
+        batch = timed_read_record_member(
+            orcid,
+            'works',
+            oauth_token,
+            accept_type='application/orcid+json',
+            put_code=put_code_batch,
+        )
+        return batch['bulk']
+
     api = _get_api()
+    rate_limit = app.config.get('ORCID_API_RATE_LIMIT')
     # This reads the record _summary_ (no URLs attached):
     user_works = timed_read_record_member(
         orcid,
@@ -228,19 +226,22 @@ def get_author_putcodes(orcid, oauth_token):
                 put_codes.append(str(put_code))
 
     # We can batch requests for _detailed_ records for maximum
-    # `WORKS_BULK_QUERY_LIMIT` put-codes at once:
+    # `WORKS_BULK_QUERY_LIMIT` put-codes at once, and send a few batches
+    # concurrently:
+    put_code_batches = _split_lists(put_codes, WORKS_BULK_QUERY_LIMIT)
     detailed_works = []
 
-    for put_code_batch in _split_lists(put_codes, WORKS_BULK_QUERY_LIMIT):
-        batch = timed_read_record_member(
-            orcid,
-            'works',
-            oauth_token,
-            accept_type='application/orcid+json',
-            put_code=put_code_batch,
-        )
-
-        detailed_works.extend(batch['bulk'])
+    if put_code_batches:
+        pool = ThreadPool(min(
+            len(put_code_batches),
+            app.config.get('ORCID_WORKS_FETCH_MAX_WORKERS', 1),
+        ))
+        try:
+            for batch in pool.map(read_detailed_works, put_code_batches):
+                detailed_works.extend(batch)
+        finally:
+            pool.close()
+            pool.join()
 
     # Now that we have all of the detailed records, we extract recids.
     # If it's not possible (and it should always be), we put the put-code in
@@ -277,10 +278,16 @@ def get_author_putcodes(orcid, oauth_token):
 def _get_api():
     """Get ORCID API.
 
+    The client is created once per process and configuration.
+
     Returns:
         MemberAPI: ORCID API
     """
     client_key = app.config['ORCID_APP_CREDENTIALS']['consumer_key']
     client_secret = app.config['ORCID_APP_CREDENTIALS']['consumer_secret']
     sandbox = app.config['ORCID_SANDBOX']
-    return MemberAPI(client_key, client_secret, sandbox)
+
+    api_key = (client_key, client_secret, sandbox)
+    if api_key not in _API_CLIENTS:
+        _API_CLIENTS[api_key] = MemberAPI(client_key, client_secret, sandbox)
+    return _API_CLIENTS[api_key]
@@ -46,8 +46,14 @@ _ELEMENT_MAKERS = {
 class OrcidBuilder(object):
     """Class used to build ORCID-compatible work records in JSON."""
 
-    def __init__(self):
-        self.record = _WORK.work()
+    def __init__(self, record=None):
+        """Constructor.
+
+        Args:
+            record (Optional[lxml.etree._Element]): an existing ORCID work
+                record to amend, if None a new one is started.
+        """
+        self.record = _WORK.work() if record is None else record
 
     def get_xml(self):
         """Get an XML record.
@@ -176,13 +182,18 @@ class OrcidBuilder(object):
             _type (string): citation type, one of: https://git.io/vdKXv#L313-L321
             value (string): citation string for the provided citation type
         """
-        self.record.append(
-            _WORK.citation(
-                _WORK('citation-type', _type),
-                _WORK('citation-value', value)
-            )
+        citation = _WORK.citation(
+            _WORK('citation-type', _type),
+            _WORK('citation-value', value)
         )
 
+        # The citation must precede the type, which might be there already
+        work_type = self.record.find(_WORK.type().tag)
+        if work_type is not None:
+            work_type.addprevious(citation)
+        else:
+            self.record.append(citation)
+
     def add_journal_title(self, journal_title):
         """Set title of the publication containing the record.
 
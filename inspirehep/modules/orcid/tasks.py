@@ -25,8 +25,11 @@
 from __future__ import absolute_import, division, print_function
 
 import re
+import time
+from email.utils import mktime_tz, parsedate_tz
 
 from flask import current_app
+from requests.exceptions import HTTPError
 from sqlalchemy.exc import SQLAlchemyError
 
 from celery import shared_task
@@ -46,8 +49,11 @@ from inspirehep.modules.orcid.api import (
 )
 from inspirehep.modules.orcid.utils import (
     get_literature_recids_for_orcid,
-    get_orcid_recid_key,
+    get_orcid_cache_key,
+    get_orcid_push_queue_stats,
+    get_push_access_tokens,
     log_time,
+    pop_due_orcid_pushes,
 )
 
 
@@ -181,16 +187,13 @@ def import_legacy_orcid_tokens():
                     'allow_push now enabled on %s, will push all works now',
                     orcid_to_push
                 )
-                recids = get_literature_recids_for_orcid(orcid_to_push)
-                for recid in recids:
-                    orcid_push.apply_async(
-                        queue='orcid_push_legacy_tokens',
-                        kwargs={
-                            'orcid': orcid_to_push,
-                            'rec_id': recid,
-                            'oauth_token': token,
-                        },
-                    )
+                orcid_sync_author.apply_async(
+                    queue='orcid_push_legacy_tokens',
+                    kwargs={
+                        'orcid': orcid_to_push,
+                        'oauth_token': token,
+                    },
+                )
         except SQLAlchemyError as ex:
             LOGGER.exception(ex)
 
@@ -217,6 +220,163 @@ def orcid_push(self, orcid, rec_id, oauth_token):
         raise self.retry(max_retries=3, countdown=300, exc=e)
 
 
+@shared_task(ignore_result=True)
+def drain_orcid_push_queue():
+    """Task to queue the pushes to ORCID scheduled by ``push_to_orcid``.
+
+    The tokens are looked up now, so that pushes to ORCIDs which revoked
+    their permission in the meantime are dropped.
+    """
+    due_pushes = pop_due_orcid_pushes()
+    if not due_pushes:
+        return
+
+    tokens = dict(get_push_access_tokens({orcid for orcid, _ in due_pushes}))
+    for orcid, rec_id in due_pushes:
+        if orcid not in tokens:
+            continue
+        orcid_push.apply_async(
+            queue='orcid_push',
+            kwargs={
+                'orcid': orcid,
+                'rec_id': int(rec_id),
+                'oauth_token': tokens[orcid],
+            },
+        )
+
+    stats = get_orcid_push_queue_stats()
+    LOGGER.info(
+        'Queued %d ORCID pushes: %d scheduled so far, %d avoided by coalescing',
+        len(due_pushes), stats['scheduled'], stats['coalesced'],
+    )
+
+
+@shared_task(bind=True)
+def orcid_sync_author(self, orcid, oauth_token):
+    """Celery task to push all the records of an author to ORCID.
+
+    Records that fail to be pushed are queued again one by one, with
+    ``orcid_push``. When ORCID rate-limits us the whole sync is queued
+    again after the delay it asks for, without counting as a retry: as
+    only changed works get pushed, it resumes where this attempt stopped.
+
+    Args:
+        self(celery.Task): the task
+        orcid(string): an orcid identifier.
+        oauth_token(string): orcid token.
+    """
+    if not re.match(current_app.config.get(
+            'FEATURE_FLAG_ORCID_PUSH_WHITELIST_REGEX', '^$'), orcid):
+        return None
+
+    try:
+        failed_recids = sync_author(orcid, oauth_token)
+    except HTTPError as e:
+        if not _is_rate_limited(e):
+            raise self.retry(max_retries=3, countdown=300, exc=e)
+
+        countdown = _get_retry_countdown(e)
+        LOGGER.info(
+            'Rate limited while syncing %s, queued again in %d seconds',
+            orcid, countdown)
+        delivery_info = self.request.delivery_info or {}
+        self.apply_async(
+            queue=delivery_info.get('routing_key'),
+            countdown=countdown,
+            kwargs={
+                'orcid': orcid,
+                'oauth_token': oauth_token,
+            },
+        )
+        return None
+    except Exception as e:
+        raise self.retry(max_retries=3, countdown=300, exc=e)
+
+    for rec_id in failed_recids:
+        orcid_push.apply_async(
+            queue='orcid_push',
+            kwargs={
+                'orcid': orcid,
+                'rec_id': rec_id,
+                'oauth_token': oauth_token,
+            },
+        )
+
+
+def _is_rate_limited(error):
+    response = getattr(error, 'response', None)
+    return isinstance(error, HTTPError) and response is not None and \
+        response.status_code == 429
+
+
+def _parse_retry_after(retry_after, default):
+    """Return the seconds to wait according to a ``Retry-After`` header.
+
+    The header holds either a number of seconds or an HTTP-date
+    (RFC 7231, section 7.1.3). ``default`` is returned if it holds neither.
+    """
+    if not retry_after:
+        return default
+
+    try:
+        return max(0, int(retry_after))
+    except ValueError:
+        pass
+
+    parsed_date = parsedate_tz(retry_after)
+    if parsed_date is None:
+        return default
+    return max(0, int(mktime_tz(parsed_date) - time.time()))
+
+
+def _get_retry_countdown(error):
+    if _is_rate_limited(error):
+        return _parse_retry_after(
+            error.response.headers.get('Retry-After'), default=60)
+    return 300
+
+
+def sync_author(orcid, oauth_token):
+    """Push to ORCID the records of an author whose ORCID work changed.
+
+    The put-codes of the author are recached once, then every Literature
+    record claimed by the author is pushed unless its hash is unchanged.
+
+    Args:
+        orcid(string): an orcid identifier.
+        oauth_token(string): orcid token.
+
+    Returns:
+        List[int]: the ids of the records which failed to be pushed.
+
+    Raises:
+        requests.exceptions.HTTPError: if ORCID rate-limits us.
+    """
+    recids = get_literature_recids_for_orcid(orcid)
+    LOGGER.info('Will attempt to sync %d records onto %s', len(recids), orcid)
+
+    failed_recids = []
+    with redis_locking_context(
+        'orcid_push:{}'.format(orcid),
+        blocking=True,
+        timeout=current_app.config.get('ORCID_PUSH_LOCK_TIMEOUT'),
+    ):
+        recache_all_author_putcodes(orcid, oauth_token)
+        cached = get_all_putcodes_and_hashes_from_redis(orcid)
+
+        for rec_id in recids:
+            put_code, previous_hash = cached.get(str(rec_id), (None, None))
+            try:
+                _push_and_store(orcid, rec_id, oauth_token, put_code, previous_hash)
+            except Exception as e:
+                if _is_rate_limited(e):
+                    raise
+                LOGGER.exception('Failed to push #%s onto %s', rec_id, orcid)
+                failed_recids.append(rec_id)
+
+    return failed_recids
+
+
 def attempt_push(orcid, rec_id, oauth_token):
     """Push a record to ORCID.
 
@@ -229,11 +389,28 @@ def attempt_push(orcid, rec_id, oauth_token):
 
     put_code, previous_hash = get_putcode_and_hash_from_redis(orcid, rec_id)
 
-    if not put_code:
-        LOGGER.info('Put-code %s not found in cache - will recache now')
-        recache_all_author_putcodes(orcid, oauth_token)
+    if put_code:
+        _push_and_store(orcid, rec_id, oauth_token, put_code, previous_hash)
+        return
+
+    # Pushing without put-code adds a new work on ORCID, so pushes of the
+    # same ORCID must not race here, or a record might end up there twice.
+    with redis_locking_context(
+        'orcid_push:{}'.format(orcid),
+        blocking=True,
+        timeout=current_app.config.get('ORCID_PUSH_LOCK_TIMEOUT'),
+    ):
         put_code, previous_hash = get_putcode_and_hash_from_redis(orcid, rec_id)
 
+        if not put_code:
+            LOGGER.info('Put-code of #%s not found in cache - will recache now', rec_id)
+            recache_all_author_putcodes(orcid, oauth_token)
+            put_code, previous_hash = get_putcode_and_hash_from_redis(orcid, rec_id)
+
+        _push_and_store(orcid, rec_id, oauth_token, put_code, previous_hash)
+
+
+def _push_and_store(orcid, rec_id, oauth_token, put_code, previous_hash):
     new_code, new_hash = push_record_with_orcid(
         recid=str(rec_id),
         orcid=orcid,
@@ -256,12 +433,24 @@ def recache_all_author_putcodes(orcid, oauth_token):
     """
     record_put_codes = get_author_putcodes(orcid, oauth_token)
 
-    for fetched_rec_id, fetched_put_code in record_put_codes:
-        store_record_in_redis(orcid, fetched_rec_id, fetched_put_code, None)
+    store_author_putcodes_in_redis(orcid, record_put_codes)
+
+
+def _get_redis():
+    redis_url = current_app.config.get('CACHE_REDIS_URL')
+    return StrictRedis.from_url(redis_url)
+
+
+def _get_putcode_field(rec_id):
+    return '{}:putcode'.format(rec_id)
+
+
+def _get_hash_field(rec_id):
+    return '{}:hash'.format(rec_id)
 
 
 def store_record_in_redis(orcid, rec_id, put_code, hashed=None):
-    """Store the entry <orcid:recid, value> in Redis.
+    """Store the put_code and hash of a record in the Redis hash of ``orcid``.
 
     Args:
         orcid(string): the author's orcid.
@@ -269,21 +458,85 @@ def store_record_in_redis(orcid, rec_id, put_code, hashed=None):
         put_code(string): the put_code used to push the record to ORCID.
         hashed(Optional[string]): hashed ORCID record
     """
-    with redis_locking_context('orcid_push') as r:
-        orcid_recid_key = get_orcid_recid_key(orcid, rec_id)
-        to_cache = {'putcode': put_code}
-        if hashed:
-            to_cache['hash'] = hashed
-        r.hmset(orcid_recid_key, to_cache)
+    to_cache = {_get_putcode_field(rec_id): put_code}
+    if hashed:
+        to_cache[_get_hash_field(rec_id)] = hashed
+
+    _get_redis().hmset(get_orcid_cache_key(orcid), to_cache)
+
+
+def store_author_putcodes_in_redis(orcid, record_put_codes):
+    """Store the put_codes of many records in the Redis hash of ``orcid``.
+
+    The hashes of the records whose put_code changed are dropped, as they
+    were computed for another ORCID work. The update is done in a
+    transaction, retried if the hash of ``orcid`` changes in the meantime.
+
+    Args:
+        orcid(string): the author's orcid.
+        record_put_codes(List[Tuple[string, string]]): list of tuples of
+            the form (recid, put_code).
+    """
+    record_put_codes = [
+        (rec_id, str(put_code)) for rec_id, put_code in record_put_codes
+    ]
+    if not record_put_codes:
+        return
+
+    orcid_key = get_orcid_cache_key(orcid)
+    to_cache = {
+        _get_putcode_field(rec_id): put_code
+        for rec_id, put_code in record_put_codes
+    }
+
+    def _update(pipe):
+        cached_put_codes = pipe.hmget(
+            orcid_key,
+            [_get_putcode_field(rec_id) for rec_id, _ in record_put_codes],
+        )
+        stale_hashes = [
+            _get_hash_field(rec_id)
+            for (rec_id, put_code), cached_put_code
+            in zip(record_put_codes, cached_put_codes)
+            if cached_put_code is not None and cached_put_code != put_code
+        ]
+
+        pipe.multi()
+        pipe.hmset(orcid_key, to_cache)
+        if stale_hashes:
+            pipe.hdel(orcid_key, *stale_hashes)
+
+    _get_redis().transaction(_update, orcid_key)
+
+
+def get_all_putcodes_and_hashes_from_redis(orcid):
+    """Retrieve from Redis the put_codes and hashes of all records of an ORCID.
+
+    Returns:
+        dict: mapping the record ids (as strings) to (put_code, hash) tuples.
+    """
+    cached = _get_redis().hgetall(get_orcid_cache_key(orcid))
+
+    result = {}
+    for field, value in cached.items():
+        rec_id, kind = field.rsplit(':', 1)
+        put_code, hashed = result.get(rec_id, (None, None))
+        if kind == 'putcode':
+            put_code = value
+        else:
+            hashed = value
+        result[rec_id] = (put_code, hashed)
+    return result
 
 
 def get_putcode_and_hash_from_redis(orcid, rec_id):
-    """Retrieve from Redis the put_code for the given ORCID - record id"""
-    with redis_locking_context('orcid_push') as r:
-        orcid_recid_key = get_orcid_recid_key(orcid, rec_id)
-        put_code = r.hget(orcid_recid_key, 'putcode')
-        hashed = r.hget(orcid_recid_key, 'hash')
-        return put_code, hashed
+    """Retrieve from Redis the put_code and hash for the given ORCID - record id"""
+    put_code, hashed = _get_redis().hmget(
+        get_orcid_cache_key(orcid),
+        _get_putcode_field(rec_id),
+        _get_hash_field(rec_id),
+    )
+    return put_code, hashed
 
 
 def _find_user_matching(orcid, email):
@@ -26,6 +26,7 @@ from __future__ import absolute_import, division, print_function
 
 import hashlib
 import re
+import threading
 import time
 
 from contextlib import contextmanager
@@ -47,6 +48,7 @@ from invenio_oauthclient.models import (
 from invenio_oauthclient.utils import oauth_link_external_id
 from invenio_pidstore.models import PersistentIdentifier
 from invenio_records.models import RecordMetadata
+from redis import StrictRedis
 
 from inspire_dojson.utils import get_recid_from_ref
 from inspire_utils.record import get_values_for_schema
@@ -62,6 +64,30 @@ RECID_FROM_INSPIRE_URL = re.compile(
 
 WORKS_BULK_QUERY_LIMIT = 50
 
+ORCID_PUSH_QUEUE_KEY = 'orcid_push_queue'
+ORCID_PUSH_QUEUE_STATS_KEY = 'orcid_push_queue:stats'
+
+# Schedule a push unless one is already waiting, counting both outcomes.
+_SCHEDULE_PUSH_SCRIPT = """
+if redis.call('ZSCORE', KEYS[1], ARGV[2]) then
+    redis.call('HINCRBY', KEYS[2], 'coalesced', 1)
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[1], ARGV[2])
+redis.call('HINCRBY', KEYS[2], 'scheduled', 1)
+return 1
+"""
+
+# Pop the pushes which are due, so that a single drain gets each of them.
+_POP_DUE_PUSHES_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+if #due > 0 then
+    redis.call('ZREM', KEYS[1], unpack(due))
+    redis.call('HINCRBY', KEYS[2], 'pushed', #due)
+end
+return due
+"""
+
 
 def _split_lists(sequence, chunk_size):
     """Get a list created by splitting the original list every n-th element
@@ -96,9 +122,67 @@ def _get_api_url_for_recid(server_name, api_endpoint, recid):
     return urljoin(api_url, recid)
 
 
-def get_orcid_recid_key(orcid, rec_id):
-    """Return the string 'orcidcache:``orcid_value``:``rec_id``'"""
-    return 'orcidcache:{}:{}'.format(orcid, rec_id)
+def get_orcid_cache_key(orcid):
+    """Return the string 'orcidcache:``orcid_value``'"""
+    return 'orcidcache:{}'.format(orcid)
+
+
+def _get_redis():
+    redis_url = current_app.config.get('CACHE_REDIS_URL')
+    return StrictRedis.from_url(redis_url)
+
+
+def schedule_orcid_push(orcid, rec_id, delay):
+    """Schedule the push of a record to ORCID in ``delay`` seconds.
+
+    If a push of the same record to the same ORCID is already scheduled,
+    nothing is done: when it runs, that push will send the latest revision
+    of the record anyway.
+
+    Args:
+        orcid (str): the ORCID to push to.
+        rec_id (int): the id of the record to push.
+        delay (int): the seconds to wait before pushing.
+
+    Returns:
+        bool: whether a new push was scheduled.
+    """
+    schedule_push = _get_redis().register_script(_SCHEDULE_PUSH_SCRIPT)
+    return bool(schedule_push(
+        keys=[ORCID_PUSH_QUEUE_KEY, ORCID_PUSH_QUEUE_STATS_KEY],
+        args=[time.time() + delay, '{}:{}'.format(orcid, rec_id)],
+    ))
+
+
+def pop_due_orcid_pushes(limit=1000):
+    """Remove from the schedule the pushes to ORCID which are due.
+
+    Args:
+        limit (int): the maximum number of pushes to return.
+
+    Returns:
+        List[Tuple[str, str]]: the due pushes, as (orcid, recid) pairs.
+    """
+    pop_due_pushes = _get_redis().register_script(_POP_DUE_PUSHES_SCRIPT)
+    due = pop_due_pushes(
+        keys=[ORCID_PUSH_QUEUE_KEY, ORCID_PUSH_QUEUE_STATS_KEY],
+        args=[time.time(), limit],
+    )
+    return [tuple(push.rsplit(':', 1)) for push in due]
+
+
+def get_orcid_push_queue_stats():
+    """Return the counters of the ORCID push schedule.
+
+    Returns:
+        dict: the number of pushes ``scheduled``, ``coalesced`` with an
+        already scheduled one (that is, pushes avoided) and ``pushed``.
+    """
+    stats = _get_redis().hgetall(ORCID_PUSH_QUEUE_STATS_KEY)
+    return {
+        name: int(stats.get(name, 0))
+        for name in ('scheduled', 'coalesced', 'pushed')
+    }
 
 
 def get_push_access_tokens(orcids):
@@ -248,6 +332,36 @@ def get_literature_recids_for_orcid(orcid):
     return [el['control_number'] for el in search_by_curated_author]
 
 
+class RateLimiter(object):
+    """Space calls out so that at most ``rate`` of them happen per second.
+
+    The limiter is thread-safe, and limits the calls of the process it
+    lives in.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next_call = 0
+
+    def wait(self, rate):
+        """Wait until the next call is allowed.
+
+        Args:
+            rate (Optional[float]): calls allowed per second, if falsy
+                calls are not limited.
+        """
+        if not rate:
+            return
+
+        with self._lock:
+            now = time.time()
+            delay = self._next_call - now
+            self._next_call = max(now, self._next_call) + 1.0 / rate
+
+        if delay > 0:
+            time.sleep(delay)
+
+
 @contextmanager
 def log_time_context(name, logger):
     initial = time.time()
@@ -24,25 +24,119 @@
 
 from __future__ import absolute_import, division, print_function
 
+import threading
+from collections import deque
+
 import requests
 from flask import current_app
+from sqlalchemy.exc import IntegrityError
 
+from inspire_utils.helpers import force_list
+from invenio_db import db
 from invenio_pidstore.models import PIDStatus, RecordIdentifier
 from invenio_pidstore.providers.base import BaseProvider
 
 
-def _get_next_pid_from_legacy():
-    """Reserve the next pid on legacy.
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _reserve_pids_from_legacy(count):
+    """Reserve the next pids on legacy.
 
-    Sends a request to a legacy instance to reserve the next available
-    identifier, and returns it to the caller.
+    Sends a request to a legacy instance to reserve the next ``count``
+    available identifiers, and returns them to the caller. If legacy
+    doesn't support reserving several identifiers at once, it reserves
+    only the next one.
     """
     headers = {
         'User-Agent': 'invenio_webupload'
     }
 
     url = current_app.config.get('LEGACY_PID_PROVIDER')
-    next_pid = requests.get(url, headers=headers).json()
+    next_pids = requests.get(
+        url, headers=headers, params={'count': count}).json()
+
+    return [int(pid) for pid in force_list(next_pids)]
+
+
+def _reserve_pids_from_sequence(count):
+    """Reserve the next ``count`` values of the sequence of recids."""
+    next_pids = db.session.execute(
+        "SELECT nextval(pg_get_serial_sequence('{0}', 'recid')) "
+        "FROM generate_series(1, :count)".format(
+            RecordIdentifier.__tablename__),
+        {'count': count},
+    )
+
+    return [row[0] for row in next_pids]
+
+
+class RecidPool(object):
+    """Per-process pool of reserved record identifiers.
+
+    The identifiers are reserved in blocks through ``reserve``, which must
+    never return the same identifier twice, even across processes and
+    restarts: the identifiers of the pool lost in a crash are skipped,
+    never reused.
+    """
+
+    def __init__(self, reserve):
+        self.reserve = reserve
+        self._recids = deque()
+        self._lock = threading.Lock()
+
+    def next(self, count):
+        """Return the next identifier, reserving ``count`` more if needed."""
+        with self._lock:
+            if not self._recids:
+                self._recids.extend(self.reserve(count))
+            return self._recids.popleft()
+
+    def clear(self):
+        """Discard the identifiers left in the pool."""
+        with self._lock:
+            self._recids.clear()
+
+
+def get_recid_pool(legacy_url=None):
+    """Return the pool of identifiers reserved on legacy or locally."""
+    with _POOLS_LOCK:
+        pool = _POOLS.get(legacy_url)
+        if pool is None:
+            if legacy_url:
+                pool = RecidPool(_reserve_pids_from_legacy)
+            else:
+                pool = RecidPool(_reserve_pids_from_sequence)
+            _POOLS[legacy_url] = pool
+        return pool
+
+
+def _get_next_pid():
+    """Return the next record identifier and record its reservation.
+
+    The identifiers are reserved in blocks of
+    ``PIDSTORE_RECID_RESERVATION_SIZE`` on legacy if
+    ``LEGACY_PID_PROVIDER`` is set, otherwise on the local sequence.
+    """
+    legacy_url = current_app.config.get('LEGACY_PID_PROVIDER')
+    count = current_app.config['PIDSTORE_RECID_RESERVATION_SIZE']
+    pool = get_recid_pool(legacy_url)
+
+    next_pid = pool.next(count)
+    if legacy_url:
+        RecordIdentifier.insert(next_pid)
+        return next_pid
+
+    try:
+        RecordIdentifier.insert(next_pid)
+    except IntegrityError:
+        # Someone has inserted identifiers without using the sequence,
+        # like RecordIdentifier.next we move the sequence past them.
+        pool.clear()
+        RecordIdentifier._set_sequence(RecordIdentifier.max())
+        next_pid = pool.next(count)
+        RecordIdentifier.insert(next_pid)
 
     return next_pid
 
@@ -67,11 +161,7 @@ class InspireRecordIdProvider(BaseProvider):
         """Create a new record identifier."""
         # Request next integer in recid sequence.
         if 'pid_value' not in kwargs:
-            if current_app.config.get('LEGACY_PID_PROVIDER'):
-                kwargs['pid_value'] = _get_next_pid_from_legacy()
-                RecordIdentifier.insert(kwargs['pid_value'])
-            else:
-                kwargs['pid_value'] = RecordIdentifier.next()
+            kwargs['pid_value'] = _get_next_pid()
         else:
             RecordIdentifier.insert(kwargs['pid_value'])
 
@@ -25,7 +25,6 @@
 from __future__ import absolute_import, division, print_function
 
 from flask import current_app
-from six import iteritems
 from six.moves.urllib.parse import urlsplit
 
 
@@ -34,27 +33,17 @@ def get_pid_types_from_endpoints():
 
 
 def _get_pid_type_endpoint_map():
-    pid_type_endpoint_map = {}
-    for key, value in iteritems(current_app.config['RECORDS_REST_ENDPOINTS']):
-        if value.get('default_endpoint_prefix'):
-            pid_type_endpoint_map[value['pid_type']] = key
-
-    return pid_type_endpoint_map
+    return current_app.extensions['inspire-records'].pid_type_to_endpoint
 
 
 def get_endpoint_from_pid_type(pid_type):
     """Return the endpoint corresponding to a ``pid_type``."""
-    PID_TYPE_TO_ENDPOINT = _get_pid_type_endpoint_map()
-
-    return PID_TYPE_TO_ENDPOINT[pid_type]
+    return _get_pid_type_endpoint_map()[pid_type]
 
 
 def get_pid_type_from_endpoint(endpoint):
     """Return the ``pid_type`` corresponding to an endpoint."""
-    ENDPOINT_TO_PID_TYPE = {
-        v: k for k, v in iteritems(_get_pid_type_endpoint_map())}
-
-    return ENDPOINT_TO_PID_TYPE[endpoint]
+    return current_app.extensions['inspire-records'].endpoint_to_pid_type[endpoint]
 
 
 def get_pid_type_from_schema(schema):
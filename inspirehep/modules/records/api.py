@@ -48,11 +48,16 @@ from inspirehep.utils.record_getter import (
     RecordGetterError,
     get_es_record_by_uuid
 )
+from inspirehep.utils.url import download_files
 
 
 MAX_UNIQUE_KEY_COUNT = 50000
 
 
+def _is_files_api_url(url):
+    return url.startswith('/api/files/')
+
+
 class InspireRecord(Record):
 
     """Record class that fetches records from DataBase."""
@@ -303,6 +308,24 @@ class InspireRecord(Record):
             self.files[key] = stream
 
         builder = LiteratureBuilder(record=self.dumps())
+        metadata = self._add_document_or_figure_metadata(
+            builder=builder,
+            metadata=metadata,
+            key=key,
+            is_document=is_document,
+        )
+
+        super(InspireRecord, self).update(builder.record)
+        return metadata
+
+    def _add_document_or_figure_metadata(
+        self,
+        builder,
+        metadata,
+        key,
+        is_document,
+    ):
+        """Add to ``builder`` the metadata of a file already in the record."""
         metadata['key'] = key
         metadata['url'] = '/api/files/{bucket}/{key}'.format(
             bucket=self.files[key].bucket_id,
@@ -313,7 +336,6 @@ class InspireRecord(Record):
         else:
             builder.add_figure(**metadata)
 
-        super(InspireRecord, self).update(builder.record)
         return metadata
 
     def _resolve_doc_or_fig_url(
@@ -380,9 +402,6 @@ class InspireRecord(Record):
                 key in self.files
             )
 
-        def _is_internal_document(doc_or_fig_obj):
-            return doc_or_fig_obj['url'].startswith('/api/files/')
-
         def _get_meaningful_exception(
             self,
             key,
@@ -412,7 +431,7 @@ class InspireRecord(Record):
 
             return exception
 
-        if not _is_internal_document(doc_or_fig_obj):
+        if not _is_files_api_url(doc_or_fig_obj['url']):
             return doc_or_fig_obj
 
         if _should_take_from_src_records(self, key, src_record_file, only_new):
@@ -430,43 +449,6 @@ class InspireRecord(Record):
             doc_or_fig_obj,
         )
 
-    def _download_to_docs_or_figs(
-        self,
-        document=None,
-        figure=None,
-        src_records=(),
-        only_new=False,
-    ):
-        if not document and not figure:
-            raise TypeError(
-                'No document nor figure passed, at least one is needed.'
-            )
-
-        is_document = bool(document)
-        doc_or_fig_obj = self._resolve_doc_or_fig_url(
-            doc_or_fig_obj=document or figure,
-            src_records=src_records,
-            only_new=only_new,
-        )
-        if doc_or_fig_obj['url'].startswith('/api/files/'):
-            return self.add_document_or_figure(
-                metadata=doc_or_fig_obj,
-                key=doc_or_fig_obj['key'],
-                is_document=is_document,
-            )
-
-        key = doc_or_fig_obj['key']
-        if key not in self.files:
-            key = self._get_unique_files_key(base_file_name=key)
-
-        stream = fsopen(doc_or_fig_obj['url'], mode='rb')
-        return self.add_document_or_figure(
-            metadata=doc_or_fig_obj,
-            key=key,
-            stream=stream,
-            is_document=is_document,
-        )
-
     def download_documents_and_figures(self, only_new=False, src_records=()):
         """Gets all the documents and figures of the record, and downloads them
         to the files property.
@@ -530,20 +512,58 @@ class InspireRecord(Record):
         documents_to_download = self.pop('documents', [])
         figures_to_download = self.pop('figures', [])
 
-        for document in documents_to_download:
-            self._download_to_docs_or_figs(
-                document=document,
-                src_records=src_records,
-                only_new=only_new,
+        docs_and_figs = [
+            (document, True) for document in documents_to_download
+        ] + [
+            (figure, False) for figure in figures_to_download
+        ]
+        docs_and_figs = [
+            (
+                self._resolve_doc_or_fig_url(
+                    doc_or_fig_obj=doc_or_fig_obj,
+                    src_records=src_records,
+                    only_new=only_new,
+                ),
+                is_document,
             )
+            for doc_or_fig_obj, is_document in docs_and_figs
+        ]
+        urls_to_download = [
+            doc_or_fig_obj['url']
+            for doc_or_fig_obj, _ in docs_and_figs
+            if not _is_files_api_url(doc_or_fig_obj['url'])
+        ]
+
+        with download_files(
+            urls_to_download,
+            open_file=fsopen,
+        ) as (downloaded, errors):
+            for url in urls_to_download:
+                if url in errors:
+                    raise errors[url]
+
+            keys = []
+            for doc_or_fig_obj, _ in docs_and_figs:
+                key = doc_or_fig_obj['key']
+                url = doc_or_fig_obj['url']
+                if not _is_files_api_url(url):
+                    if key not in self.files:
+                        key = self._get_unique_files_key(base_file_name=key)
+                    downloaded[url].seek(0)
+                    self.files[key] = downloaded[url]
+                keys.append(key)
 
-        for figure in figures_to_download:
-            self._download_to_docs_or_figs(
-                figure=figure,
-                src_records=src_records,
-                only_new=only_new,
+        builder = LiteratureBuilder(record=self.dumps())
+        for (doc_or_fig_obj, is_document), key in zip(docs_and_figs, keys):
+            self._add_document_or_figure_metadata(
+                builder=builder,
+                metadata=doc_or_fig_obj,
+                key=key,
+                is_document=is_document,
             )
 
+        super(InspireRecord, self).update(builder.record)
+
     def _get_unique_files_key(self, base_file_name):
         def _strip_old_control_number(base_name):
             base_name = base_name.split('_', 1)[-1]
@@ -24,6 +24,9 @@
 
 from __future__ import absolute_import, division, print_function
 
+from six import iteritems
+from werkzeug.utils import cached_property, import_string
+
 
 class InspireRecords(object):
     def __init__(self, app=None):
@@ -31,7 +34,31 @@ class InspireRecords(object):
             self.init_app(app)
 
     def init_app(self, app):
+        self.app = app
         app.extensions['inspire-records'] = self
 
         # Register the receivers:
         from inspirehep.modules.records import receivers  # noqa: F401
+
+    @cached_property
+    def pid_type_to_endpoint(self):
+        """Map the ``pid_type`` of each record type to its endpoint."""
+        return {
+            value['pid_type']: key for key, value in
+            iteritems(self.app.config['RECORDS_REST_ENDPOINTS'])
+            if value.get('default_endpoint_prefix')
+        }
+
+    @cached_property
+    def endpoint_to_pid_type(self):
+        """Map each endpoint to the ``pid_type`` of its record type."""
+        return {v: k for k, v in iteritems(self.pid_type_to_endpoint)}
+
+    @cached_property
+    def search_classes(self):
+        """Map each endpoint to its search class."""
+        return {
+            key: import_string(value['search_class']) for key, value in
+            iteritems(self.app.config['RECORDS_REST_ENDPOINTS'])
+            if 'search_class' in value
+        }
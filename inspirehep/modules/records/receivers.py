@@ -52,7 +52,9 @@ from inspirehep.modules.authors.utils import phonetic_blocks
 from inspirehep.modules.orcid.utils import (
     get_push_access_tokens,
     get_orcids_for_push,
+    schedule_orcid_push,
 )
+from inspirehep.utils.journals import invalidate_journal_index
 
 
 def is_hep(record):
@@ -132,9 +134,24 @@ def index_after_commit(sender, changes):
                 indexer.delete(Record(model_instance.json, model_instance))
 
 
+@models_committed.connect
+def invalidate_journal_index_after_commit(sender, changes):
+    """Make every process reload its index of journals after one changed."""
+    for model_instance, change in changes:
+        if isinstance(model_instance, RecordMetadata):
+            collections = get_value(model_instance.json or {}, '_collections', [])
+            if 'Journals' in collections:
+                invalidate_journal_index()
+                return
+
+
 @after_record_update.connect
 def push_to_orcid(sender, record, *args, **kwargs):
     """If needed, queue the push of the new changes to ORCID.
+
+    If ``ORCID_PUSH_DEBOUNCE_DELAY`` is positive, the pushes are scheduled
+    to happen after that delay instead, so that several saves of the same
+    record in a short time result in a single push.
     """
     if not is_hep(record) or not current_app.config['FEATURE_FLAG_ENABLE_ORCID_PUSH']:
         return
@@ -144,10 +161,15 @@ def push_to_orcid(sender, record, *args, **kwargs):
         return
 
     task_name = current_app.config['ORCID_PUSH_TASK_ENDPOINT']
+    debounce_delay = current_app.config.get('ORCID_PUSH_DEBOUNCE_DELAY', 0)
 
     orcids = get_orcids_for_push(record)
     orcids_and_tokens = get_push_access_tokens(orcids)
     for orcid, access_token in orcids_and_tokens:
+        if debounce_delay > 0:
+            schedule_orcid_push(orcid, record['control_number'], debounce_delay)
+            continue
+
         push_to_orcid_task = Task()
         push_to_orcid_task.name = task_name
         push_to_orcid_task.apply_async(
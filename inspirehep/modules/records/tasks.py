@@ -24,41 +24,109 @@
 
 from __future__ import absolute_import, division, print_function
 
-from celery import shared_task
+import copy
+import time
+import uuid
+
+from celery import group, shared_task
 from celery.utils.log import get_task_logger
+from elasticsearch.helpers import bulk as es_bulk
 from elasticsearch.helpers import scan
 from flask import current_app
+from flask_sqlalchemy import models_committed
 from six import iteritems
+from sqlalchemy import tuple_
 
 from invenio_db import db
-from invenio_pidstore.models import PersistentIdentifier
+from invenio_pidstore.errors import PIDInvalidAction
+from invenio_pidstore.models import PersistentIdentifier, PIDStatus, Redirect
+from invenio_records.models import RecordMetadata
 from invenio_search import current_search_client as es
 
-from inspire_dojson.utils import get_recid_from_ref
+from inspire_dojson.utils import get_recid_from_ref, get_record_ref
 from inspirehep.modules.records.api import InspireRecord
-from inspirehep.modules.records.utils import get_endpoint_from_record
+from inspirehep.modules.records.receivers import index_after_commit
+from inspirehep.modules.records.utils import (
+    create_index_op,
+    get_endpoint_from_record,
+)
 from inspirehep.modules.pidstore.utils import get_pid_type_from_schema
 
 
 logger = get_task_logger(__name__)
 
 
-@shared_task(ignore_result=True)
-def update_refs(old_ref, new_ref):
+@shared_task(bind=True, ignore_result=True, max_retries=5)
+def update_refs(self, old_ref, new_ref):
     """Update references in the entire database.
 
     Replaces all occurrences of ``old_ref`` with ``new_ref``,
     provided that they happen at one of the paths listed in
     ``INSPIRE_REF_UPDATER_WHITELISTS``.
-    """
-    records = get_records_to_update(old_ref)
 
-    with db.session.begin_nested():
-        for record in records:
-            logger.info('Updated reference: %s -> %s, Record: %s', old_ref, new_ref, record.id)
-            update_links(record, old_ref, new_ref)
-            record.commit()
-    db.session.commit()
+    The records are updated in chunks of ``INSPIRE_REF_UPDATER_CHUNK_SIZE``,
+    each one committed in its own transaction and then indexed with a
+    single ES bulk request. If a chunk fails the task is retried: as the
+    records to update are looked up in ES, it resumes from the records
+    that were not updated and indexed yet.
+    """
+    uuids = get_uuids_to_update(old_ref)
+    chunk_size = current_app.config['INSPIRE_REF_UPDATER_CHUNK_SIZE']
+
+    try:
+        for start in range(0, len(uuids), chunk_size):
+            chunk = uuids[start:start + chunk_size]
+            updated = update_refs_in_chunk(chunk, old_ref, new_ref)
+            logger.info(
+                'Updated reference %s -> %s: %d/%d records processed, '
+                '%d updated in the last chunk',
+                old_ref, new_ref, start + len(chunk), len(uuids), updated)
+    except Exception as exc:
+        db.session.rollback()
+        raise self.retry(exc=exc)
+
+
+def update_refs_in_chunk(uuids, old_ref, new_ref):
+    """Update the references of a chunk of records and index them.
+
+    The records whose references are unchanged are indexed nonetheless, as
+    they are found through ES, which might not have been updated after a
+    previous attempt.
+
+    Args:
+        uuids(List[str]): the uuids of the records to update.
+        old_ref(str): the reference to replace.
+        new_ref(str): its replacement.
+
+    Returns:
+        int: the number of records that were updated.
+    """
+    query = RecordMetadata.query.filter(RecordMetadata.id.in_(uuids))
+    models = query.all()
+
+    updated = 0
+    for model in models:
+        json = copy.deepcopy(model.json)
+        update_links(json, old_ref, new_ref)
+        if json != model.json:
+            model.json = json
+            updated += 1
+
+    models_committed.disconnect(index_after_commit)
+    try:
+        db.session.commit()
+    finally:
+        models_committed.connect(index_after_commit)
+
+    models = query.all()  # reload the committed records in a single query
+    es_bulk(
+        es,
+        (create_index_op(InspireRecord(model.json, model=model))
+         for model in models),
+        request_timeout=current_app.config['INDEXER_BULK_REQUEST_TIMEOUT'],
+    )
+
+    return updated
 
 
 def update_links(record, old_ref, new_ref):
@@ -84,82 +152,170 @@ def update_links(record, old_ref, new_ref):
         _update_links(record, path.split('.'), old_ref, new_ref)
 
 
-def get_records_to_update(old_ref):
-    def _get_uuids_to_update(old_ref):
-        def _replace_record_with_recid(path):
-            return path.replace('record', 'recid')
-
-        def _ref_to_recid(ref):
-            return int(ref.split('/')[-1])
-
-        result = []
-
-        whitelists = current_app.config['INSPIRE_REF_UPDATER_WHITELISTS']
-        for endpoint, whitelist in iteritems(whitelists):
-            fields = [_replace_record_with_recid(path) for path in whitelist]
-            body = {
-                'query': {
-                    'bool': {
-                        'should': [
-                            {
-                                'term': {
-                                    field: {
-                                        'value': _ref_to_recid(old_ref),
-                                    },
-                                },
-                            } for field in fields
-                        ],
-                    },
-                },
-            }
+def get_uuids_to_update(old_ref):
+    """Return the sorted uuids of the records pointing to ``old_ref``."""
+    def _replace_record_with_recid(path):
+        return path.replace('record', 'recid')
 
-            index = current_app.config['INSPIRE_ENDPOINT_TO_INDEX'][endpoint]
-            query = scan(es, query=body, index=index)
+    def _ref_to_recid(ref):
+        return int(ref.split('/')[-1])
 
-            result.extend(el['_id'] for el in list(query))
+    result = set()
 
-        return result
+    whitelists = current_app.config['INSPIRE_REF_UPDATER_WHITELISTS']
+    for endpoint, whitelist in iteritems(whitelists):
+        if not whitelist:
+            continue
 
-    def _get_records_to_update(uuids):
-        return InspireRecord.get_records(uuids)
+        fields = [_replace_record_with_recid(path) for path in whitelist]
+        body = {
+            '_source': False,
+            'query': {
+                'bool': {
+                    'should': [
+                        {
+                            'term': {
+                                field: {
+                                    'value': _ref_to_recid(old_ref),
+                                },
+                            },
+                        } for field in fields
+                    ],
+                },
+            },
+        }
 
-    uuids = _get_uuids_to_update(old_ref)
-    records = _get_records_to_update(uuids)
+        index = current_app.config['INSPIRE_ENDPOINT_TO_INDEX'][endpoint]
+        query = scan(es, query=body, index=index)
 
-    return records
+        result.update(el['_id'] for el in query)
+
+    return sorted(result)
 
 
 @shared_task
 def merge_merged_records():
-    """Merge all records that were marked as merged."""
-    records = get_merged_records()
+    """Merge all records that were marked as merged.
 
-    for record in records:
+    The PIDs of the deleted records are redirected to the PIDs of the
+    records they were merged into, all in a single transaction, then the
+    references to the deleted records are updated by ``update_refs``.
+    """
+    start = time.time()
+    records = list(get_merged_records())
+    logger.info(
+        'Loaded %d merged records in %.1fs', len(records), time.time() - start)
 
-        record_pid = PersistentIdentifier.query.filter_by(object_uuid=record.id).one()
-        deleted_ids = [get_recid_from_ref(ref) for ref in record['deleted_records']]
+    start = time.time()
+    merges = redirect_merged_pids(records)
+    db.session.commit()
+    logger.info(
+        'Redirected the PIDs of %d deleted records in %.1fs',
+        len(merges), time.time() - start)
 
-        for deleted_id in deleted_ids:
-                deleted_pid = PersistentIdentifier.query.filter_by(
-                    pid_value=str(deleted_id)
-                ).one_or_none()
+    if merges:
+        group([
+            update_refs.si(old_ref, new_ref) for old_ref, new_ref in merges
+        ]).apply_async()
 
-                if not deleted_pid:
-                    deleted_pid = PersistentIdentifier.create(
-                        pid_type=get_pid_type_from_schema(record['$schema']),
-                        pid_value=deleted_id,
-                        object_type='rec'
-                    )
-                    deleted_pid.register()
-                    db.session.add(deleted_pid)
 
-                deleted_pid.redirect(record_pid)
-    db.session.commit()
+def redirect_merged_pids(records):
+    """Redirect the PIDs of the records deleted by a merge.
+
+    The PIDs of the merged and of the deleted records, and the existing
+    redirections, are loaded with one query each. The missing PIDs of the
+    deleted records are created, and all the redirections are flushed
+    together.
+
+    Args:
+        records(List[InspireRecord]): the merged records.
+
+    Returns:
+        List[Tuple[str, str]]: the reference of each deleted record paired
+        with the reference of the record it was merged into.
+    """
+    uuids = [record.id for record in records]
+    record_pids = {
+        pid.object_uuid: pid for pid in PersistentIdentifier.query.filter(
+            PersistentIdentifier.object_uuid.in_(uuids))
+    }
+
+    deleted = []
+    for record in records:
+        pid_type = get_pid_type_from_schema(record['$schema'])
+        endpoint = get_endpoint_from_record(record)
+        new_ref = get_record_ref(record['control_number'], endpoint)['$ref']
+        for ref in record['deleted_records']:
+            deleted_id = str(get_recid_from_ref(ref))
+            deleted.append(
+                (pid_type, deleted_id, record.id, ref['$ref'], new_ref))
+
+    if not deleted:
+        return []
+
+    pid_keys = [(pid_type, deleted_id) for pid_type, deleted_id, _, _, _ in deleted]
+    deleted_pids = {
+        (pid.pid_type, pid.pid_value): pid
+        for pid in PersistentIdentifier.query.filter(tuple_(
+            PersistentIdentifier.pid_type,
+            PersistentIdentifier.pid_value,
+        ).in_(pid_keys))
+    }
+
+    redirect_uuids = [
+        pid.object_uuid for pid in deleted_pids.values() if pid.is_redirected()
+    ]
+    redirects = {
+        redirect.id: redirect
+        for redirect in Redirect.query.filter(Redirect.id.in_(redirect_uuids))
+    } if redirect_uuids else {}
+
+    merges = []
+    for pid_type, deleted_id, record_uuid, old_ref, new_ref in deleted:
+        deleted_pid = deleted_pids.get((pid_type, deleted_id))
+        if not deleted_pid:
+            deleted_pid = PersistentIdentifier(
+                pid_type=pid_type,
+                pid_value=deleted_id,
+                object_type='rec',
+                status=PIDStatus.REGISTERED,
+            )
+            db.session.add(deleted_pid)
+            deleted_pids[(pid_type, deleted_id)] = deleted_pid
+
+        _redirect_pid(deleted_pid, record_pids[record_uuid], redirects)
+        merges.append((old_ref, new_ref))
+
+    db.session.flush()
+
+    return merges
+
+
+def _redirect_pid(pid, target, redirects):
+    """Redirect ``pid`` to ``target`` like ``PersistentIdentifier.redirect``.
+
+    Unlike it, no savepoint is created, and the existing redirection of
+    ``pid`` is looked up in ``redirects``.
+    """
+    if not (pid.is_registered() or pid.is_redirected()):
+        raise PIDInvalidAction('Persistent identifier is not registered.')
+
+    redirect = redirects.get(pid.object_uuid) if pid.is_redirected() else None
+    if redirect is None:
+        redirect = Redirect(id=uuid.uuid4())
+        db.session.add(redirect)
+        redirects[redirect.id] = redirect
+    redirect.pid = target
+
+    pid.status = PIDStatus.REDIRECTED
+    pid.object_type = None
+    pid.object_uuid = redirect.id
 
 
 def get_merged_records():
     def _get_uuids_to_merge():
         body = {
+            '_source': False,
             'query': {
                 'exists': {
                     'field': 'deleted_records',
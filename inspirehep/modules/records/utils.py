@@ -24,6 +24,8 @@
 
 from __future__ import absolute_import, division, print_function
 
+from invenio_indexer.api import RecordIndexer, current_record_to_index
+
 from inspirehep.modules.pidstore.utils import (
     get_endpoint_from_pid_type,
     get_pid_type_from_schema
@@ -36,3 +38,18 @@ def get_endpoint_from_record(record):
     endpoint = get_endpoint_from_pid_type(pid_type)
 
     return endpoint
+
+
+def create_index_op(record):
+    """Return the ES bulk action indexing a record."""
+    index, doc_type = current_record_to_index(record)
+
+    return {
+        '_op_type': 'index',
+        '_index': index,
+        '_type': doc_type,
+        '_id': str(record.id),
+        '_version': record.revision_id,
+        '_version_type': 'external_gte',
+        '_source': RecordIndexer._prepare_record(record, index, doc_type),
+    }
@@ -29,6 +29,14 @@ from inspirehep.modules.records.json_ref_loader import replace_refs
 from inspirehep.modules.records.api import ESRecord
 from inspirehep.modules.records.permissions import has_update_permission
 from inspirehep.modules.search import JobsSearch
+from inspirehep.utils.template_prefetch import get_template_prefetch_context
+
+
+def _resolve_es_ref(ref):
+    context = get_template_prefetch_context()
+    if context is not None and context.has_ref(ref):
+        return context.get_ref(ref)
+    return replace_refs(ref, 'es')
 
 
 class AdminToolsMixin(object):
@@ -85,14 +93,13 @@ class LiteratureRecord(ESRecord, AdminToolsMixin):
             parent_rec = {}
             conference_rec = {}
             if 'conference_record' in pub_info:
-                conference_rec = replace_refs(pub_info['conference_record'],
-                                              'es')
+                conference_rec = _resolve_es_ref(pub_info['conference_record'])
                 if conference_rec and conference_rec.get('control_number'):
                     conference_recid = conference_rec['control_number']
                 else:
                     conference_rec = {}
             if 'parent_record' in pub_info:
-                parent_rec = replace_refs(pub_info['parent_record'], 'es')
+                parent_rec = _resolve_es_ref(pub_info['parent_record'])
                 if parent_rec and parent_rec.get('control_number'):
                     parent_recid = parent_rec['control_number']
                 else:
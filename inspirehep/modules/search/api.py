@@ -77,6 +77,9 @@ class SearchMixin(object):
     def mget(self, uuids, **kwargs):
         """Get source from a list of uuids.
 
+        Documents which are not found (e.g. because the uuid belongs to a
+        deleted record) are left out of the results.
+
         :param uuids: uuids of documents to be retrieved.
         :type uuids: list of strings representing uuids
         :returns: list of JSON documents
@@ -90,7 +93,10 @@ class SearchMixin(object):
                 body={'ids': uuids},
                 **kwargs
             )
-            results = [document['_source'] for document in documents['docs']]
+            results = [
+                document['_source'] for document in documents['docs']
+                if document.get('found')
+            ]
         except RequestError:
             pass
 
@@ -42,6 +42,7 @@ from inspirehep.modules.records.wrappers import LiteratureRecord
 from inspirehep.modules.search import InstitutionsSearch, LiteratureSearch
 from inspirehep.utils.jinja2 import render_template_to_string
 from inspirehep.utils.template import render_macro_from_template
+from inspirehep.utils.template_prefetch import get_template_prefetch_context
 
 from .views import blueprint
 
@@ -214,6 +215,16 @@ def experiment_date(record):
         return ', '.join(r for r in result)
 
 
+def _get_proceedings(cnum):
+    prefetch_context = get_template_prefetch_context()
+    if prefetch_context is not None and cnum in prefetch_context.proceedings:
+        return prefetch_context.proceedings[cnum]
+
+    return list(LiteratureSearch().query_from_iq(
+        'cnum:%s and 980__a:proceedings' % cnum
+    ).execute().hits)
+
+
 @blueprint.app_template_filter()
 def proceedings_link(record):
     cnum = record.get('cnum', '')
@@ -221,15 +232,13 @@ def proceedings_link(record):
     if not cnum:
         return out
 
-    records = LiteratureSearch().query_from_iq(
-        'cnum:%s and 980__a:proceedings' % cnum
-    ).execute()
+    records = _get_proceedings(cnum)
 
     if len(records):
         if len(records) > 1:
             proceedings = []
 
-            for i, record in enumerate(records.hits, start=1):
+            for i, record in enumerate(records, start=1):
                 try:
                     dois = record['dois']
                     proceedings.append(
@@ -305,6 +314,16 @@ def format_cnum_with_hyphons(value):
             return cnum + day
 
 
+def _get_affiliation_count(icn):
+    prefetch_context = get_template_prefetch_context()
+    if prefetch_context is not None and icn in prefetch_context.affiliation_counts:
+        return prefetch_context.affiliation_counts[icn]
+
+    return InstitutionsSearch().query_from_iq(
+        'affiliation:%s' % icn
+    ).execute().hits.total
+
+
 @blueprint.app_template_filter()
 def link_to_hep_affiliation(record):
     try:
@@ -312,10 +331,7 @@ def link_to_hep_affiliation(record):
     except KeyError:
         return ''
 
-    records = InstitutionsSearch().query_from_iq(
-        'affiliation:%s' % icn
-    ).execute()
-    results = records.hits.total
+    results = _get_affiliation_count(icn)
 
     if results:
         if results == 1:
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+
+"""Cached data of the collection landing pages."""
+
+from __future__ import absolute_import, division, print_function
+
+import time
+from datetime import date
+
+from dateutil.relativedelta import relativedelta
+from flask import current_app
+
+from invenio_cache import current_cache
+
+from inspirehep.modules.search import (
+    AuthorsSearch,
+    ConferencesSearch,
+    DataSearch,
+    ExperimentsSearch,
+    InstitutionsSearch,
+    JournalsSearch,
+    LiteratureSearch,
+)
+
+
+def _get_some_institutions():
+    some_institutions = InstitutionsSearch().query_from_iq(
+        ''
+    )[:250].execute()
+
+    return [hit['_source'] for hit in some_institutions.to_dict()['hits']['hits']]
+
+
+def _get_upcoming_conferences():
+    today = date.today()
+    in_six_months = today + relativedelta(months=+6)
+
+    upcoming_conferences = ConferencesSearch().query_from_iq(
+        'opening_date:{0}->{1}'.format(str(today), str(in_six_months))
+    ).sort(
+        {'opening_date': 'asc'}
+    )[1:100].execute()
+
+    return [hit['_source'] for hit in upcoming_conferences.to_dict()['hits']['hits']]
+
+
+LANDING_PAGE_BLOCKS = {
+    'authors_count': lambda: AuthorsSearch().count(),
+    'conferences_count': lambda: ConferencesSearch().count(),
+    'data_count': lambda: DataSearch().count(),
+    'experiments_count': lambda: ExperimentsSearch().count(),
+    'institutions_count': lambda: InstitutionsSearch().count(),
+    'journals_count': lambda: JournalsSearch().count(),
+    'literature_count': lambda: LiteratureSearch().count(),
+    'some_institutions': _get_some_institutions,
+    'upcoming_conferences': _get_upcoming_conferences,
+}
+"""Functions computing the blocks of the landing pages, by name."""
+
+
+def _get_cache_key(name):
+    return 'landing_pages::{}'.format(name)
+
+
+def _get_refresh_lock_key(name):
+    return 'landing_pages::refreshing::{}'.format(name)
+
+
+def compute_landing_page_block(name):
+    """Compute a block of the landing pages from Elasticsearch.
+
+    The block is computed outside of the current request, so that it
+    contains what an anonymous user would see whoever triggered it.
+    """
+    with current_app.test_request_context():
+        return LANDING_PAGE_BLOCKS[name]()
+
+
+def refresh_landing_page_block(name):
+    """Compute a block of the landing pages and store it in the cache."""
+    value = compute_landing_page_block(name)
+    current_cache.set(
+        _get_cache_key(name),
+        {'value': value, 'refreshed': time.time()},
+        timeout=current_app.config['LANDING_PAGES_CACHE_MAX_AGE'],
+    )
+    current_cache.delete(_get_refresh_lock_key(name))
+
+    return value
+
+
+def get_landing_page_block(name):
+    """Return a block of the landing pages from the cache.
+
+    Blocks older than ``LANDING_PAGES_CACHE_TIMEOUT`` are still served, but
+    a refresh is scheduled in the background (at most once at a time). The
+    block is only computed in the request when nothing is cached at all.
+
+    Args:
+        name(str): one of the keys of ``LANDING_PAGE_BLOCKS``.
+
+    Returns:
+        the value of the block.
+    """
+    cached = current_cache.get(_get_cache_key(name))
+    if cached is None:
+        return refresh_landing_page_block(name)
+
+    timeout = current_app.config['LANDING_PAGES_CACHE_TIMEOUT']
+    is_stale = time.time() - cached['refreshed'] > timeout
+    if is_stale and current_cache.add(
+        _get_refresh_lock_key(name), True, timeout=timeout
+    ):
+        from inspirehep.modules.theme.tasks import refresh_landing_page_blocks
+        refresh_landing_page_blocks.delay([name])
+
+    return cached['value']
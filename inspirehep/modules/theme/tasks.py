@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+
+"""Theme tasks."""
+
+from __future__ import absolute_import, division, print_function
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from elasticsearch import ElasticsearchException
+
+from inspirehep.modules.theme.landing import (
+    LANDING_PAGE_BLOCKS,
+    refresh_landing_page_block,
+)
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(ignore_result=True)
+def refresh_landing_page_blocks(names=None):
+    """Refresh the cached blocks of the landing pages.
+
+    Args:
+        names(list): names of the blocks to refresh, all of them if not given.
+    """
+    for name in names or sorted(LANDING_PAGE_BLOCKS):
+        try:
+            refresh_landing_page_block(name)
+        except ElasticsearchException:
+            logger.exception('Could not refresh landing page block %s', name)
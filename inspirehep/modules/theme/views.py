@@ -25,11 +25,9 @@
 from __future__ import absolute_import, division, print_function
 
 import sys
-from datetime import date
 from functools import wraps
 
 import six
-from dateutil.relativedelta import relativedelta
 from flask import (
     Blueprint,
     abort,
@@ -44,8 +42,10 @@ from flask_login import current_user
 from flask_menu import current_menu
 from sqlalchemy.orm.exc import NoResultFound
 
+from invenio_cache import current_cache
 from invenio_mail.tasks import send_email
 from invenio_pidstore.models import PersistentIdentifier
+from invenio_records_ui.signals import record_viewed
 
 from inspirehep.modules.pidstore.utils import (
     get_endpoint_from_pid_type,
@@ -53,13 +53,11 @@ from inspirehep.modules.pidstore.utils import (
 )
 from inspirehep.modules.search import (
     AuthorsSearch,
-    ConferencesSearch,
-    DataSearch,
     ExperimentsSearch,
     InstitutionsSearch,
-    JournalsSearch,
     LiteratureSearch
 )
+from inspirehep.modules.theme.landing import get_landing_page_block
 from inspirehep.utils.citations import get_and_format_citations
 from inspirehep.utils.conferences import (
     render_conferences_contributions,
@@ -72,6 +70,7 @@ from inspirehep.utils.experiments import (
 from inspirehep.utils.record import get_title
 from inspirehep.utils.references import get_and_format_references
 from inspirehep.utils.template import render_macro_from_template
+from inspirehep.utils.template_prefetch import template_prefetch
 
 CONFERENCE_CATEGORIES_TO_SERIES = [
     {
@@ -223,7 +222,7 @@ blueprint = Blueprint(
 def index():
     """View for literature collection landing page."""
     if current_app.config['INSPIRE_FULL_THEME']:
-        number_of_records = LiteratureSearch().count()
+        number_of_records = get_landing_page_block('literature_count')
 
         return render_template(
             'inspirehep_theme/search/collection_literature.html',
@@ -238,7 +237,7 @@ def index():
 @blueprint.route('/collection/authors', methods=['GET', ])
 def hepnames():
     """View for authors collection landing page."""
-    number_of_records = AuthorsSearch().count()
+    number_of_records = get_landing_page_block('authors_count')
 
     return render_template(
         'inspirehep_theme/search/collection_authors.html',
@@ -250,8 +249,8 @@ def hepnames():
 @blueprint.route('/conferences', methods=['GET', ])
 def conferences():
     """View for conferences collection landing page."""
-    number_of_records = ConferencesSearch().count()
-    upcoming_conferences = _get_upcoming_conferences()
+    number_of_records = get_landing_page_block('conferences_count')
+    upcoming_conferences = get_landing_page_block('upcoming_conferences')
 
     return render_template(
         'inspirehep_theme/search/collection_conferences.html',
@@ -271,8 +270,8 @@ def jobs():
 @blueprint.route('/institutions', methods=['GET', ])
 def institutions():
     """View for institutions collection landing page."""
-    number_of_records = InstitutionsSearch().count()
-    some_institutions = _get_some_institutions()
+    number_of_records = get_landing_page_block('institutions_count')
+    some_institutions = get_landing_page_block('some_institutions')
 
     return render_template(
         'inspirehep_theme/search/collection_institutions.html',
@@ -285,7 +284,7 @@ def institutions():
 @blueprint.route('/experiments', methods=['GET', ])
 def experiments():
     """View for experiments collection landing page."""
-    number_of_records = ExperimentsSearch().count()
+    number_of_records = get_landing_page_block('experiments_count')
 
     return render_template(
         'inspirehep_theme/search/collection_experiments.html',
@@ -297,7 +296,7 @@ def experiments():
 @blueprint.route('/journals', methods=['GET', ])
 def journals():
     """View for journals collection landing page."""
-    number_of_records = JournalsSearch().count()
+    number_of_records = get_landing_page_block('journals_count')
 
     return render_template(
         'inspirehep_theme/search/collection_journals.html',
@@ -309,7 +308,7 @@ def journals():
 @blueprint.route('/data', methods=['GET', ])
 def data():
     """View for data collection landing page."""
-    number_of_records = DataSearch().count()
+    number_of_records = get_landing_page_block('data_count')
 
     return render_template(
         'inspirehep_theme/search/collection_data.html',
@@ -318,6 +317,22 @@ def data():
     )
 
 
+def record_detail(pid, record, template=None, **kwargs):
+    """View for record detail pages.
+
+    Same as the default view of ``invenio-records-ui``, except that what the
+    template filters need is prefetched before rendering.
+    """
+    record_viewed.send(
+        current_app._get_current_object(),
+        pid=pid,
+        record=record,
+    )
+
+    with template_prefetch(record):
+        return render_template(template, pid=pid, record=record)
+
+
 #
 # Error handlers
 #
@@ -445,19 +460,36 @@ def get_institution_papers_from_es(recid):
     ).execute().hits
 
 
-def get_experiment_publications(experiment_name):
+def get_experiments_publications(experiment_recids):
     """
-    Get paper count for a given experiment.
+    Get paper counts for the given experiments with a single aggregation.
 
-    :param experiment_name: canonical name of the experiment.
-    :type experiment_name: string
+    :param experiment_recids: ids of the experiments.
+    :type experiment_recids: list
+
+    :returns: the number of papers of each experiment, by experiment id.
+    :rtype: dict
     """
-    query = {
-        "term": {"accelerator_experiments.experiment": experiment_name}
-    }
-    search = LiteratureSearch().query(query)
+    if not experiment_recids:
+        return {}
+
+    search = LiteratureSearch().filter(
+        "terms",
+        accelerator_experiments__recid=experiment_recids
+    )
     search = search.params(search_type="count")
-    return search.execute().hits.total
+    search.aggs.bucket("experiments", "filters", filters={
+        str(recid): {"term": {"accelerator_experiments.recid": recid}}
+        for recid in experiment_recids
+    })
+
+    buckets = search.execute().to_dict()[
+        'aggregations'
+    ]['experiments']['buckets']
+
+    return {
+        int(recid): bucket['doc_count'] for recid, bucket in buckets.items()
+    }
 
 
 def get_institution_people_datatables_rows(recid):
@@ -487,19 +519,14 @@ def get_institution_people_datatables_rows(recid):
     ]['authors']['affiliated']['byrecid']['buckets']
     recids = [int(paper['key']) for paper in papers_per_author]
 
-    # Generate query to retrieve records from author index
-    query = ""
-    for i, recid in enumerate(recids):
-        query += "recid:{}".format(recid)
-        if i != len(recids) - 1:
-            query += " OR "
-
-    results = AuthorsSearch().query_from_iq(
-        query
+    # Retrieve the records of these authors from author index
+    results = AuthorsSearch().filter(
+        "terms",
+        control_number=recids
     ).params(
-        size=9999,
+        size=len(recids),
         _source=['control_number', 'name']
-    ).execute()
+    ).execute() if recids else []
 
     recid_map = dict(
         [(result.control_number, result.name) for result in results]
@@ -535,6 +562,9 @@ def get_institution_experiments_datatables_rows(hits):
     result = []
 
     name_html = "<a href='/experiments/{id}'>{name}</a>"
+    publications = get_experiments_publications(
+        [hit.control_number for hit in hits]
+    )
 
     for hit in hits:
         row = []
@@ -547,7 +577,7 @@ def get_institution_experiments_datatables_rows(hits):
             )
         except ValueError:
             row.append(hit.collaboration)
-        row.append(get_experiment_publications(hit.legacy_name))
+        row.append(publications.get(hit.control_number, 0))
         result.append(row)
     return result
 
@@ -596,16 +626,65 @@ def get_institution_papers_datatables_rows(hits):
     return result
 
 
+def _get_cached_institution_rows(table, recid, get_rows):
+    """Return the rows of an institution table, cached for a short time.
+
+    :param table: name of the table.
+    :type table: string
+
+    :param recid: id of the institution.
+    :type recid: string
+
+    :param get_rows: function computing the rows and their total.
+    :type get_rows: callable
+    """
+    cache_key = 'institution_datatables::{}::{}'.format(table, recid)
+    rows = current_cache.get(cache_key)
+    if rows is None:
+        rows = get_rows()
+        current_cache.set(
+            cache_key,
+            rows,
+            timeout=current_app.config[
+                'INSTITUTION_DATATABLES_CACHE_TIMEOUT'],
+        )
+
+    return rows
+
+
+def _paginate_datatables_rows(data, total):
+    """Slice the rows according to the datatables ``start`` and ``length``.
+
+    All the rows are returned when ``length`` is not given.
+    """
+    response = {
+        "data": data,
+        "total": total,
+        "recordsTotal": len(data),
+        "recordsFiltered": len(data),
+    }
+
+    length = request.args.get('length', -1, type=int)
+    if length >= 0:
+        start = request.args.get('start', 0, type=int)
+        response['data'] = data[start:start + length]
+        response['draw'] = request.args.get('draw', 0, type=int)
+
+    return jsonify(response)
+
+
 @blueprint.route('/ajax/institutions/people', methods=['GET'])
 def ajax_institutions_people():
     """Datatable handler to get people working in an institution."""
     institution_recid = request.args.get('recid', '')
 
-    return jsonify(
-        {
-            "data": get_institution_people_datatables_rows(institution_recid)
-        }
-    )
+    def _get_rows():
+        data = get_institution_people_datatables_rows(institution_recid)
+        return data, len(data)
+
+    data, total = _get_cached_institution_rows(
+        'people', institution_recid, _get_rows)
+    return _paginate_datatables_rows(data, total)
 
 
 @blueprint.route('/ajax/institutions/experiments', methods=['GET'])
@@ -613,21 +692,20 @@ def ajax_institutions_experiments():
     """Datatable handler to get experiments in an institution."""
     recid = request.args.get('recid', '')
 
-    pid = PersistentIdentifier.get('institutions', recid)
+    def _get_rows():
+        pid = PersistentIdentifier.get('institutions', recid)
 
-    record = InstitutionsSearch().get_source(pid.object_uuid)
-    try:
-        icn = record.get('ICN', [])[0]
-    except KeyError:
-        icn = ''
+        record = InstitutionsSearch().get_source(pid.object_uuid)
+        try:
+            icn = record.get('ICN', [])[0]
+        except KeyError:
+            icn = ''
 
-    hits = get_institution_experiments_from_es(icn)
-    return jsonify(
-        {
-            "data": get_institution_experiments_datatables_rows(hits),
-            "total": hits.total
-        }
-    )
+        hits = get_institution_experiments_from_es(icn)
+        return get_institution_experiments_datatables_rows(hits), hits.total
+
+    data, total = _get_cached_institution_rows('experiments', recid, _get_rows)
+    return _paginate_datatables_rows(data, total)
 
 
 @blueprint.route('/ajax/institutions/papers', methods=['GET'])
@@ -811,28 +889,3 @@ def ajax_experiments_people():
 def linkedaccounts():
     """Redirect to the homepage when logging in with ORCID."""
     return redirect('/')
-
-
-#
-# Helpers
-#
-
-def _get_some_institutions():
-    some_institutions = InstitutionsSearch().query_from_iq(
-        ''
-    )[:250].execute()
-
-    return [hit['_source'] for hit in some_institutions.to_dict()['hits']['hits']]
-
-
-def _get_upcoming_conferences():
-    today = date.today()
-    in_six_months = today + relativedelta(months=+6)
-
-    upcoming_conferences = ConferencesSearch().query_from_iq(
-        'opening_date:{0}->{1}'.format(str(today), str(in_six_months))
-    ).sort(
-        {'opening_date': 'asc'}
-    )[1:100].execute()
-
-    return [hit['_source'] for hit in upcoming_conferences.to_dict()['hits']['hits']]
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+
+"""Exact matching of all the records of a harvest at once."""
+
+from __future__ import absolute_import, division, print_function
+
+from collections import defaultdict
+from itertools import chain
+
+import six
+from elasticsearch.helpers import scan
+from flask import current_app
+
+from invenio_cache import current_cache
+from invenio_db import db
+from invenio_search import current_search_client as es
+from invenio_workflows.models import WorkflowObjectModel
+
+from inspire_crawler.models import CrawlerWorkflowObject
+from inspire_utils.dedupers import dedupe_list
+from inspire_utils.helpers import force_list
+from inspire_utils.record import get_value
+
+
+CACHE_KEY_PREFIX = 'exact_match::'
+MAX_CLAUSES_PER_QUERY = 500
+"""Maximum number of identifiers looked up by a single query."""
+
+
+def can_batch_match(config):
+    """Return whether ``config`` can be resolved by :func:`get_exact_matches`.
+
+    Only configurations made of ``exact`` queries without validators nor
+    collections restrictions can be resolved in batch.
+    """
+    for step in config['algorithm']:
+        if step.get('validator'):
+            return False
+        for query in step['queries']:
+            if query.get('type') != 'exact' or query.get('collections'):
+                return False
+    return True
+
+
+def _get_queries(config):
+    return [
+        (query['path'], query['search_path'])
+        for step in config['algorithm']
+        for query in step['queries']
+    ]
+
+
+def _get_identifiers(record, queries):
+    return [
+        (search_path, value)
+        for path, search_path in queries
+        for value in force_list(get_value(record, path))
+    ]
+
+
+def _get_batch_cache_key(batch_id):
+    return u'{prefix}batch::{batch_id}'.format(
+        prefix=CACHE_KEY_PREFIX,
+        batch_id=batch_id,
+    )
+
+
+def _get_cache_key(identifier):
+    return u'{prefix}{search_path}::{value}'.format(
+        prefix=CACHE_KEY_PREFIX,
+        search_path=identifier[0],
+        value=identifier[1],
+    )
+
+
+def _get_stored_cache_key(identifier):
+    return u'{prefix}stored::{search_path}::{value}'.format(
+        prefix=CACHE_KEY_PREFIX,
+        search_path=identifier[0],
+        value=_normalize(identifier[1]),
+    )
+
+
+def _normalize(value):
+    if isinstance(value, six.string_types):
+        return value.lower()
+    return value
+
+
+def _get_match_query(search_path, values):
+    return {
+        'query': {
+            'bool': {
+                'should': [
+                    {'match': {search_path: value}} for value in values
+                ],
+                'minimum_should_match': 1,
+            },
+        },
+    }
+
+
+def resolve_exact_matches(records, config):
+    """Find the records matching exactly any identifier of ``records``.
+
+    Instead of running the queries of ``config`` for each record, it runs a
+    single query per identifier type (and per ``MAX_CLAUSES_PER_QUERY``
+    values) with the values found in all the ``records``. As in
+    ``inspire-matcher``, the values are matched with ``match`` queries, so
+    that they are analyzed like the indexed ones, e.g. lowercased.
+
+    Args:
+        records(Iterable[dict]): the records to match.
+        config(dict): an ``inspire-matcher`` configuration accepted by
+            :func:`can_batch_match`.
+
+    Returns:
+        dict: maps every ``(search_path, value)`` identifier found in
+        ``records`` to the sorted list of the control numbers matching it.
+    """
+    queries = _get_queries(config)
+    records = list(records)
+    matches = {}
+
+    for path, search_path in queries:
+        values = set(chain.from_iterable(
+            force_list(get_value(record, path)) for record in records
+        ))
+        if not values:
+            continue
+
+        identifiers_by_value = defaultdict(list)
+        for value in values:
+            matches[(search_path, value)] = set()
+            identifiers_by_value[_normalize(value)].append(
+                (search_path, value))
+
+        values = sorted(values)
+        for start in range(0, len(values), MAX_CLAUSES_PER_QUERY):
+            hits = scan(
+                es,
+                query=_get_match_query(
+                    search_path,
+                    values[start:start + MAX_CLAUSES_PER_QUERY],
+                ),
+                index=config['index'],
+                doc_type=config['doc_type'],
+                _source=['control_number', path],
+            )
+            for hit in hits:
+                for value in force_list(get_value(hit['_source'], path)):
+                    for identifier in identifiers_by_value.get(
+                        _normalize(value), []
+                    ):
+                        matches[identifier].add(
+                            hit['_source']['control_number'])
+
+    return {
+        identifier: sorted(control_numbers)
+        for identifier, control_numbers in matches.items()
+    }
+
+
+def get_exact_matches(record, config, get_batch_records=None, batch_id=None):
+    """Return the control numbers of the records matching exactly ``record``.
+
+    The matches of each identifier are cached for
+    ``WORKFLOWS_BATCH_EXACT_MATCH_CACHE_TIMEOUT`` seconds. When some
+    identifiers of ``record`` aren't cached yet, the ones of all the records
+    returned by ``get_batch_records`` are resolved and cached at the same
+    time, so that the other records of the batch find them in the cache.
+
+    The batch identified by ``batch_id`` is loaded only once during that
+    time: afterwards, a record whose identifiers aren't cached (e.g. because
+    they were invalidated, or because it was added to the batch later) is
+    resolved on its own.
+
+    Args:
+        record(dict): the record to match.
+        config(dict): an ``inspire-matcher`` configuration accepted by
+            :func:`can_batch_match`.
+        get_batch_records(callable): returns the other records to resolve
+            along with ``record``.
+        batch_id(str): identifies the batch returned by
+            ``get_batch_records``.
+
+    Returns:
+        list: the control numbers of the matched records.
+    """
+    identifiers = _get_identifiers(record, _get_queries(config))
+    if not identifiers:
+        return []
+
+    timeout = current_app.config['WORKFLOWS_BATCH_EXACT_MATCH_CACHE_TIMEOUT']
+    cached = current_cache.get_many(*map(_get_cache_key, identifiers))
+    if any(matches is None for matches in cached):
+        batch_records = []
+        if get_batch_records and (batch_id is None or current_cache.add(
+            _get_batch_cache_key(batch_id), True, timeout=timeout
+        )):
+            batch_records = get_batch_records()
+        resolved = resolve_exact_matches(
+            chain([record], batch_records), config)
+        current_cache.set_many(
+            {
+                _get_cache_key(identifier): matches
+                for identifier, matches in resolved.items()
+            },
+            timeout=timeout,
+        )
+        cached = [resolved[identifier] for identifier in identifiers]
+
+    stored = current_cache.get_many(*map(_get_stored_cache_key, identifiers))
+
+    return dedupe_list(chain(
+        chain.from_iterable(cached),
+        chain.from_iterable(matches or [] for matches in stored),
+    ))
+
+
+def invalidate_exact_matches(record, config):
+    """Forget the cached matches of the identifiers of ``record``.
+
+    To be called when ``record`` is stored, so that the records of the same
+    batch with the same identifiers get matched with it.
+
+    Until the next refresh of the index, a worker can still resolve these
+    identifiers against Elasticsearch without finding ``record`` and cache
+    that result. The control number of ``record`` is therefore also
+    remembered under separate keys, which are added to the matches of its
+    identifiers by :func:`get_exact_matches`.
+    """
+    identifiers = _get_identifiers(record, _get_queries(config))
+    if not identifiers:
+        return
+
+    current_cache.delete_many(*map(_get_cache_key, identifiers))
+
+    stored_keys = [_get_stored_cache_key(identifier) for identifier in identifiers]
+    stored = current_cache.get_many(*stored_keys)
+    current_cache.set_many(
+        {
+            key: dedupe_list((matches or []) + [record['control_number']])
+            for key, matches in zip(stored_keys, stored)
+        },
+        timeout=current_app.config['WORKFLOWS_BATCH_EXACT_MATCH_CACHE_TIMEOUT'],
+    )
+
+
+def get_harvest_records(crawler_job_id):
+    """Return the records of all the workflows of a harvest.
+
+    Args:
+        crawler_job_id(str): the id of the crawler job of the harvest.
+
+    Returns:
+        list: the records of the workflows created by the job.
+    """
+    object_ids = db.session.query(CrawlerWorkflowObject.object_id).filter(
+        CrawlerWorkflowObject.job_id == crawler_job_id
+    )
+    objects = WorkflowObjectModel.query.filter(
+        WorkflowObjectModel.id.in_(object_ids.subquery())
+    )
+    return [obj.data for obj in objects]
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+
+"""Workflows CLI."""
+
+from __future__ import absolute_import, division, print_function
+
+import click
+
+from flask.cli import with_appcontext
+
+from .tasks.classifier import build_taxonomy_cache
+
+
+@click.group()
+def classifier():
+    """Commands related to the keyword classifier."""
+
+
+@classifier.command('build-cache')
+@click.option('--taxonomy', default=None,
+              help='Name or path of the ontology, defaults to '
+                   'HEP_ONTOLOGY_FILE.')
+@with_appcontext
+def build_cache(taxonomy):
+    """Compile the taxonomy and write its cache file."""
+    build_taxonomy_cache(taxonomy)
+    click.echo('Classifier taxonomy cache built.')
@@ -25,6 +25,8 @@ from __future__ import absolute_import, division, print_function
 import os
 import pkg_resources
 
+from . import receivers  # noqa: F401
+from .cli import classifier
 from .views import blueprint
 
 
@@ -40,12 +42,14 @@ class INSPIREWorkflows(object):
         """Initialize application object."""
         self.init_config(app)
         app.register_blueprint(blueprint)
+        app.cli.add_command(classifier)
         app.extensions['inspire-workflows'] = self
 
     def init_config(self, app):
         """Initialize configuration."""
         app.config.setdefault("WORKFLOWS_PENDING_RECORDS_CACHE_TIMEOUT",
                               2629743)
+        app.config.setdefault("WORKFLOWS_PRELOAD_CLASSIFIER_TAXONOMY", True)
         app.config["WORKFLOWS_STORAGEDIR"] = os.path.join(
             app.instance_path, "workflows", "storage"
         )
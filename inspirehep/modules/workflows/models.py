@@ -78,7 +78,7 @@ class WorkflowsPendingRecord(db.Model):
         primary_key=True,
         nullable=False,
     )
-    record_id = db.Column(db.Integer, nullable=False)
+    record_id = db.Column(db.Integer, nullable=False, index=True)
 
 
 class WorkflowsRecordSources(db.Model):
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+"""Micro-batching of prediction requests to Magpie and Beard.
+
+Requests are only coalesced between the threads (or green threads) of a
+single process, so batching is only useful for workers running with a
+``threads``, ``eventlet`` or ``gevent`` pool. Requests made from the main
+thread of a process, as with the default ``prefork`` pool, are always sent
+right away.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import logging
+import sys
+import threading
+import time
+
+from flask import current_app
+
+
+LOGGER = logging.getLogger(__name__)
+
+_BATCHERS = {}
+_BATCHERS_LOCK = threading.Lock()
+
+
+class _PendingPrediction(object):
+    """A prediction request waiting for its batch to be sent."""
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+    def resolve(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.done.set()
+
+
+class PredictionBatcher(object):
+    """Coalesce concurrent prediction requests to the same endpoint.
+
+    The first request arriving when no batch is being collected becomes
+    the leader: it waits up to ``max_wait`` seconds (or until ``max_size``
+    requests are queued), then sends all the queued payloads as a single
+    request to ``batch_url`` and hands every waiting caller its own result.
+
+    The batch endpoint is expected to accept a JSON list of payloads and to
+    answer with a JSON list of results in the same order. If it doesn't
+    (e.g. it answers with a non 200 status, in which case ``request``
+    returns ``None``), the payloads of that batch are sent with a single
+    request each, and so is every payload for the next ``reprobe_after``
+    seconds, after which the batch endpoint is tried again.
+    """
+
+    def __init__(self, url, batch_url, max_wait, max_size, reprobe_after=600):
+        self.url = url
+        self.batch_url = batch_url
+        self.max_wait = max_wait
+        self.max_size = max_size
+        self.reprobe_after = reprobe_after
+        self._batches_disabled_until = 0
+
+        self._condition = threading.Condition()
+        self._pending = []
+        self._collecting = False
+
+    @property
+    def supports_batches(self):
+        """Whether the batch endpoint is believed to work at the moment."""
+        return time.time() >= self._batches_disabled_until
+
+    def predict(self, payload, request):
+        """Return the prediction for ``payload``.
+
+        Args:
+            payload(dict): the payload of a single prediction request.
+            request(callable): function used to send a JSON request, with
+                the same signature as
+                :func:`inspirehep.modules.workflows.utils.json_api_request`.
+
+        Returns:
+            dict: the prediction, or ``None`` if the backend didn't answer.
+
+        Raises:
+            requests.exceptions.RequestException: if the request to the
+                backend failed.
+        """
+        if not self.supports_batches:
+            return request(self.url, payload)
+
+        pending = _PendingPrediction(payload)
+        with self._condition:
+            self._pending.append(pending)
+            is_leader = not self._collecting
+            self._collecting = True
+            if len(self._pending) >= self.max_size:
+                self._condition.notify_all()
+
+        if is_leader:
+            self._collect_and_send(request)
+
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def _collect_and_send(self, request):
+        deadline = time.time() + self.max_wait
+        with self._condition:
+            remaining = deadline - time.time()
+            while len(self._pending) < self.max_size and remaining > 0:
+                self._condition.wait(remaining)
+                remaining = deadline - time.time()
+
+            pending, self._pending = self._pending, []
+            self._collecting = False
+
+        for start in range(0, len(pending), self.max_size):
+            self._send(pending[start:start + self.max_size], request)
+
+    def _send(self, batch, request):
+        if len(batch) > 1 and self.supports_batches:
+            try:
+                results = request(
+                    self.batch_url, [el.payload for el in batch])
+            except Exception as err:
+                for el in batch:
+                    el.resolve(error=err)
+                return
+
+            if isinstance(results, list) and len(results) == len(batch):
+                LOGGER.debug(
+                    'Sent %d predictions to %s in one request',
+                    len(batch), self.batch_url)
+                for el, result in zip(batch, results):
+                    el.resolve(result=result)
+                return
+
+            LOGGER.warning(
+                '%s did not answer the batch, falling back to single '
+                'requests for %s seconds', self.batch_url, self.reprobe_after)
+            self._batches_disabled_until = time.time() + self.reprobe_after
+
+        for el in batch:
+            try:
+                el.resolve(result=request(self.url, el.payload))
+            except Exception as err:
+                el.resolve(error=err)
+
+
+def get_prediction_batcher(url):
+    """Return the per-process :class:`PredictionBatcher` of ``url``."""
+    with _BATCHERS_LOCK:
+        batcher = _BATCHERS.get(url)
+        if batcher is None:
+            batcher = PredictionBatcher(
+                url=url,
+                batch_url='{url}/batch'.format(url=url),
+                max_wait=current_app.config[
+                    'WORKFLOWS_PREDICTION_BATCH_MAX_WAIT'],
+                max_size=current_app.config[
+                    'WORKFLOWS_PREDICTION_BATCH_MAX_SIZE'],
+                reprobe_after=current_app.config[
+                    'WORKFLOWS_PREDICTION_BATCH_REPROBE_AFTER'],
+            )
+            _BATCHERS[url] = batcher
+        return batcher
+
+
+def _is_green_threaded():
+    for module, is_patched in (
+        ('eventlet.patcher', lambda m: m.is_monkey_patched('thread')),
+        ('gevent.monkey', lambda m: m.is_module_patched('threading')),
+    ):
+        if module in sys.modules and is_patched(sys.modules[module]):
+            return True
+    return False
+
+
+def can_coalesce_requests():
+    """Return whether this process can make concurrent prediction requests.
+
+    That's the case in the worker threads of a ``threads`` pool and when
+    running with ``eventlet`` or ``gevent``, but not in the main thread of a
+    ``prefork`` (or ``solo``) pool process, which runs one task at a time.
+    """
+    if not isinstance(threading.current_thread(), threading._MainThread):
+        return True
+    return _is_green_threaded()
+
+
+def batched_prediction_request(url, payload, request):
+    """Send a prediction request, batching it with concurrent ones if enabled.
+
+    Batching is disabled when ``WORKFLOWS_PREDICTION_BATCH_MAX_WAIT`` is not
+    positive, and bypassed when no concurrent request can be made from this
+    process (see :func:`can_coalesce_requests`): in both cases ``payload``
+    is sent right away.
+
+    Args:
+        url(str): the prediction endpoint.
+        payload(dict): the payload of the prediction request.
+        request(callable): function used to send the JSON requests.
+
+    Returns:
+        dict: the prediction, or ``None`` if the backend didn't answer.
+    """
+    if current_app.config.get('WORKFLOWS_PREDICTION_BATCH_MAX_WAIT', 0) <= 0:
+        return request(url, payload)
+
+    if not can_coalesce_requests():
+        return request(url, payload)
+
+    return get_prediction_batcher(url).predict(payload, request)
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+
+"""Workflows receivers."""
+
+from __future__ import absolute_import, division, print_function
+
+import logging
+
+from celery import current_app as current_celery_app
+from celery.signals import worker_init, worker_process_init
+
+from .tasks.classifier import preload_taxonomy
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+@worker_init.connect
+@worker_process_init.connect
+def preload_classifier_taxonomy(**kwargs):
+    """Load the classifier taxonomy when a worker starts.
+
+    ``worker_init`` is sent in the main worker process before it forks its
+    pool, so the loaded taxonomy is shared copy-on-write by the children.
+    ``worker_process_init`` covers the pool processes started later on, for
+    which the taxonomy is only loaded if it isn't already there.
+    """
+    flask_app = current_celery_app.flask_app
+    if not flask_app.config.get('WORKFLOWS_PRELOAD_CLASSIFIER_TAXONOMY'):
+        return
+
+    with flask_app.app_context():
+        try:
+            preload_taxonomy()
+        except Exception:
+            LOGGER.exception('Cannot preload the classifier taxonomy.')
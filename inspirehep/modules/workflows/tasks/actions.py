@@ -30,37 +30,29 @@ from six import reraise
 
 from flask import current_app
 from jsonschema.exceptions import ValidationError
-from sqlalchemy import (
-    JSON,
-    String,
-    cast,
-    type_coerce,
-)
 from timeout_decorator import timeout
 from werkzeug import secure_filename
 
 from invenio_db import db
 from invenio_workflows import ObjectStatus
 from invenio_workflows.errors import WorkflowsError
-from invenio_records.models import RecordMetadata
 from inspire_schemas.builders import LiteratureBuilder
 from inspire_schemas.utils import validate
 from inspire_utils.record import get_value
-from inspirehep.modules.records.json_ref_loader import replace_refs
 from inspirehep.modules.workflows.tasks.refextract import (
     extract_references_from_pdf,
     extract_references_from_raw_refs,
     extract_references_from_text,
 )
 from inspirehep.modules.workflows.utils import (
-    download_file_to_workflow,
+    download_files_to_workflow,
     get_document_in_workflow,
     get_resolve_validation_callback_url,
     get_validation_errors,
     log_workflows_action,
     with_debug_logging,
 )
-from inspirehep.utils.normalizers import normalize_journal_title
+from inspirehep.utils.journals import get_journal_index
 from inspirehep.utils.record import (
     get_arxiv_categories,
     get_inspire_categories,
@@ -318,7 +310,8 @@ def populate_journal_coverage(obj, eng):
         None
 
     """
-    journals = replace_refs(get_value(obj.data, 'publication_info.journal_record'), 'db')
+    journals = get_journal_index().get_by_refs(
+        get_value(obj.data, 'publication_info.journal_record'))
     if not journals:
         return
 
@@ -354,7 +347,7 @@ def fix_submission_number(obj, eng):
 @with_debug_logging
 def populate_submission_document(obj, eng):
     submission_pdf = obj.extra_data.get('submission_pdf')
-    if submission_pdf and is_pdf_link(submission_pdf):
+    if submission_pdf and is_pdf_link(submission_pdf, keep_content=True):
         filename = secure_filename('fulltext.pdf')
         obj.data['documents'] = [
             document for document in obj.data.get('documents', ())
@@ -374,15 +367,14 @@ def populate_submission_document(obj, eng):
 @with_debug_logging
 def download_documents(obj, eng):
     documents = obj.data.get('documents', [])
+    downloaded_files = download_files_to_workflow(
+        workflow=obj,
+        files=[(document['key'], document['url']) for document in documents],
+    )
     for document in documents:
         filename = document['key']
         url = document['url']
-        downloaded = download_file_to_workflow(
-            workflow=obj,
-            name=filename,
-            url=url,
-        )
-        if downloaded:
+        if filename in downloaded_files:
             document['url'] = '/api/files/{bucket}/{key}'.format(
                 bucket=obj.files[filename].bucket_id, key=filename)
             obj.log.info('Document downloaded from %s', url)
@@ -485,12 +477,10 @@ def normalize_journal_titles(obj, eng):
     contained in `publication_info`.
 
     Note:
-        The DB is queried in order to get the `$ref` of each journal and add it in
+        The journals are looked up in the index of the Journal records of
+        the process in order to get the `$ref` of each journal and add it in
         `journal_record`.
 
-    TODO:
-        Refactor: it must be checked that `normalize_journal_title` is appropriate.
-
     Args:
         obj: a workflow object.
         eng: a workflow engine.
@@ -503,17 +493,14 @@ def normalize_journal_titles(obj, eng):
     if not publications:
         return None
 
-    for index, publication in enumerate(publications):
+    journals = get_journal_index()
+    for publication in publications:
         if 'journal_title' in publication:
-            normalized_title = normalize_journal_title(publication['journal_title'])
-            obj.data['publication_info'][index]['journal_title'] = normalized_title
-            ref_query = RecordMetadata.query.filter(
-                RecordMetadata.json['_collections'].op('?')('Journals')).filter(
-                cast(RecordMetadata.json['short_title'], String) == type_coerce(normalized_title, JSON))
-            result = db.session.execute(ref_query).fetchone()
-
-            if result:
-                obj.data['publication_info'][index]['journal_record'] = result.records_metadata_json['self']
+            journal = journals.get_by_title(publication['journal_title'])
+            if journal:
+                publication['journal_title'] = journal.get(
+                    'short_title', publication['journal_title'])
+                publication['journal_record'] = dict(journal['self'])
 
 
 @with_debug_logging
@@ -538,7 +525,8 @@ def set_refereed_and_fix_document_type(obj, eng):
         None
 
     """
-    journals = replace_refs(get_value(obj.data, 'publication_info.journal_record'), 'db')
+    journals = get_journal_index().get_by_refs(
+        get_value(obj.data, 'publication_info.journal_record'))
     if not journals:
         return
 
@@ -26,6 +26,7 @@ from __future__ import absolute_import, division, print_function
 
 import os
 import re
+from contextlib import closing
 from functools import wraps
 
 import backoff
@@ -46,7 +47,11 @@ from plotextractor.errors import InvalidTarball, NoTexFilesFound
 
 from inspirehep.utils.latex import decode_latex
 from inspirehep.utils.record import get_arxiv_categories, get_arxiv_id
-from inspirehep.utils.url import is_pdf_link, retrieve_uri
+from inspirehep.utils.url import (
+    is_pdf_link,
+    pop_probed_content,
+    retrieve_uri,
+)
 from inspirehep.modules.workflows.errors import DownloadError
 from inspirehep.modules.workflows.utils import (
     convert,
@@ -69,11 +74,18 @@ def populate_arxiv_document(obj, eng):
 
     for conf_name in ('ARXIV_PDF_URL', 'ARXIV_PDF_URL_ALTERNATIVE'):
         url = current_app.config[conf_name].format(arxiv_id=arxiv_id)
-        is_valid_pdf_link = is_pdf_link(url)
+        is_valid_pdf_link = is_pdf_link(url, keep_content=True)
         if is_valid_pdf_link:
             break
 
-        if NO_PDF_ON_ARXIV in requests.get(url).content:
+        probed_content = pop_probed_content(url)
+        if probed_content is not None:
+            with closing(probed_content):
+                content = probed_content.read()
+        else:
+            content = requests.get(url).content
+
+        if NO_PDF_ON_ARXIV in content:
             obj.log.info('No PDF is available for %s', arxiv_id)
             return
 
@@ -28,6 +28,7 @@ import requests
 from flask import current_app
 
 from inspire_utils.record import get_value
+from inspirehep.modules.workflows.predictions import batched_prediction_request
 from inspirehep.modules.workflows.utils import json_api_request
 
 from ..utils import with_debug_logging
@@ -73,7 +74,8 @@ def guess_coreness(obj, eng):
     payload = prepare_payload(obj.data)
 
     try:
-        results = json_api_request(predictor_url, payload)
+        results = batched_prediction_request(
+            predictor_url, payload, json_api_request)
     except requests.exceptions.RequestException:
         results = {}
 
@@ -26,13 +26,20 @@ from __future__ import absolute_import, division, print_function
 
 from functools import wraps
 
+from flask import current_app
+
 from inspire_utils.record import get_value
 from invenio_classifier import (
     get_keywords_from_local_file,
     get_keywords_from_text,
 )
 from invenio_classifier.errors import ClassifierException
-from invenio_classifier.reader import KeywordToken
+from invenio_classifier.reader import (
+    KeywordToken,
+    get_cache,
+    get_regular_expressions,
+    set_cache,
+)
 
 from ..proxies import antihep_keywords
 from ..utils import with_debug_logging, get_document_in_workflow
@@ -53,6 +60,35 @@ def filter_core_keywords(obj, eng):
     obj.extra_data['classifier_results']["complete_output"] = result
 
 
+def build_taxonomy_cache(taxonomy=None):
+    """Compile the taxonomy and write its cache file.
+
+    The cache file is written in the ``classifier`` folder of the instance
+    path, where the classifier looks for it before parsing the ontology.
+
+    Args:
+        taxonomy(str): name or path of the ontology, defaults to the
+            ``HEP_ONTOLOGY_FILE`` configuration variable.
+    """
+    taxonomy = taxonomy or current_app.config['HEP_ONTOLOGY_FILE']
+    set_cache(taxonomy, get_regular_expressions(taxonomy, rebuild=True))
+
+
+def preload_taxonomy(taxonomy=None):
+    """Load the compiled taxonomy in the in-memory cache of the classifier.
+
+    It is read from the cache file if it exists, and compiled from the
+    ontology otherwise. Nothing is done if it is already loaded.
+
+    Args:
+        taxonomy(str): name or path of the ontology, defaults to the
+            ``HEP_ONTOLOGY_FILE`` configuration variable.
+    """
+    taxonomy = taxonomy or current_app.config['HEP_ONTOLOGY_FILE']
+    if not get_cache(taxonomy):
+        set_cache(taxonomy, get_regular_expressions(taxonomy))
+
+
 def classify_paper(taxonomy=None, rebuild_cache=False, no_cache=False,
                    output_limit=20, spires=False,
                    match_mode='full', with_author_keywords=False,
@@ -62,7 +98,6 @@ def classify_paper(taxonomy=None, rebuild_cache=False, no_cache=False,
     @with_debug_logging
     @wraps(classify_paper)
     def _classify_paper(obj, eng):
-        from flask import current_app
         params = dict(
             taxonomy_name=taxonomy or current_app.config['HEP_ONTOLOGY_FILE'],
             output_mode='dict',
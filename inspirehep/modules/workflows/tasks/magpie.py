@@ -29,6 +29,7 @@ import requests
 from flask import current_app
 
 from inspire_utils.record import get_value
+from inspirehep.modules.workflows.predictions import batched_prediction_request
 from inspirehep.modules.workflows.utils import json_api_request
 
 from ..utils import with_debug_logging
@@ -77,7 +78,8 @@ def guess_keywords(obj, eng):
         return
     payload = prepare_magpie_payload(obj.data, corpus="keywords")
     try:
-        results = json_api_request(magpie_url, payload)
+        results = batched_prediction_request(
+            magpie_url, payload, json_api_request)
     except requests.exceptions.RequestException:
         results = {}
 
@@ -104,7 +106,8 @@ def guess_categories(obj, eng):
         # Skip task if no API URL set
         return
     payload = prepare_magpie_payload(obj.data, corpus="categories")
-    results = json_api_request(magpie_url, payload)
+    results = batched_prediction_request(
+        magpie_url, payload, json_api_request)
     if results:
         labels = results.get('labels', [])
         categories = filter_magpie_response(labels, limit=0.22)
@@ -129,7 +132,8 @@ def guess_experiments(obj, eng):
         return
 
     payload = prepare_magpie_payload(obj.data, corpus="experiments")
-    results = json_api_request(magpie_url, payload)
+    results = batched_prediction_request(
+        magpie_url, payload, json_api_request)
     if results:
         all_predictions = results.get('labels', [])
         selected_experiments = filter_magpie_response(
@@ -32,6 +32,11 @@ from invenio_workflows import workflow_object_class, WorkflowEngine
 from inspire_matcher.api import match
 from inspire_utils.dedupers import dedupe_list
 from inspirehep.utils.record import get_arxiv_categories, get_value
+from inspirehep.modules.workflows.batch_matching import (
+    can_batch_match,
+    get_exact_matches,
+    get_harvest_records,
+)
 from inspirehep.modules.workflows.tasks.actions import mark
 
 from ..utils import with_debug_logging
@@ -47,6 +52,9 @@ def exact_match(obj, eng):
     Also sets the ``matches.exact`` property in ``extra_data`` to the list of
     control numbers that matched.
 
+    When ``FEATURE_FLAG_ENABLE_BATCH_EXACT_MATCH`` is set, the matches of the
+    harvested records are resolved for the whole harvest at once and cached.
+
     Arguments:
         obj: a workflow object.
         eng: a workflow engine.
@@ -57,8 +65,21 @@ def exact_match(obj, eng):
 
     """
     exact_match_config = current_app.config['EXACT_MATCH']
-    matches = dedupe_list(match(obj.data, exact_match_config))
-    record_ids = [el['_source']['control_number'] for el in matches]
+    crawler_job_id = obj.extra_data.get('crawler_job_id')
+    if (
+        current_app.config.get('FEATURE_FLAG_ENABLE_BATCH_EXACT_MATCH') and
+        crawler_job_id and
+        can_batch_match(exact_match_config)
+    ):
+        record_ids = get_exact_matches(
+            obj.data,
+            exact_match_config,
+            get_batch_records=lambda: get_harvest_records(crawler_job_id),
+            batch_id=crawler_job_id,
+        )
+    else:
+        matches = dedupe_list(match(obj.data, exact_match_config))
+        record_ids = [el['_source']['control_number'] for el in matches]
     obj.extra_data.setdefault('matches', {})['exact'] = record_ids
     return bool(record_ids)
 
@@ -35,6 +35,7 @@ from inspirehep.modules.workflows.utils import (
     get_resolve_merge_conflicts_callback_url,
     with_debug_logging
 )
+from inspirehep.modules.workflows.write_buffer import flush_workflows_writes
 
 
 def get_head_source(head_uuid):
@@ -49,6 +50,7 @@ def get_head_source(head_uuid):
         * ``arxiv`` if there are no publisher roots and an arxiv root
         * None if there are no root records
     """
+    flush_workflows_writes()
     roots_sources = set(
         r.source for r in
         WorkflowsRecordSources.query.filter_by(record_id=head_uuid).all()
@@ -30,6 +30,9 @@ from invenio_db import db
 
 from inspirehep.modules.pidstore.utils import get_pid_type_from_schema
 from inspirehep.modules.records.api import InspireRecord
+from inspirehep.modules.workflows.batch_matching import (
+    invalidate_exact_matches,
+)
 from inspirehep.modules.workflows.utils import with_debug_logging
 from inspirehep.utils.record_getter import get_db_record
 from inspirehep.utils.schema import ensure_valid_schema
@@ -81,6 +84,9 @@ def store_record(obj, eng):
     obj.save()
     db.session.commit()
 
+    if current_app.config.get('FEATURE_FLAG_ENABLE_BATCH_EXACT_MATCH'):
+        invalidate_exact_matches(obj.data, current_app.config['EXACT_MATCH'])
+
 
 @with_debug_logging
 def set_schema(obj, eng):
@@ -36,14 +36,15 @@ import lxml.etree as ET
 import requests
 from flask import current_app, url_for
 
-from invenio_db import db
 from inspire_schemas.utils import \
     get_validation_errors as _get_validation_errors
 
-from inspirehep.utils.url import retrieve_uri
-from inspirehep.modules.workflows.models import (
-    WorkflowsAudit,
-    WorkflowsRecordSources,
+from inspirehep.utils.url import download_files, retrieve_uri
+from inspirehep.modules.workflows.models import WorkflowsRecordSources
+from inspirehep.modules.workflows.write_buffer import (
+    buffer_wf_record_source,
+    buffer_workflows_audit,
+    flush_workflows_writes,
 )
 
 
@@ -78,7 +79,10 @@ def json_api_request(url, data, headers=None):
 def log_workflows_action(action, relevance_prediction,
                          object_id, user_id,
                          source, user_action=""):
-    """Log the action taken by user compared to a prediction."""
+    """Log the action taken by user compared to a prediction.
+
+    The audit log is written when the current DB session commits.
+    """
     if relevance_prediction:
         score = relevance_prediction.get("max_score")  # returns 0.222113
         decision = relevance_prediction.get("decision")  # returns "Rejected"
@@ -99,8 +103,7 @@ def log_workflows_action(action, relevance_prediction,
             'source': source,
             'action': action
         }
-        audit = WorkflowsAudit(**logging_info)
-        audit.save()
+        buffer_workflows_audit(**logging_info)
 
 
 def with_debug_logging(func):
@@ -209,6 +212,47 @@ def download_file_to_workflow(workflow, name, url):
             return workflow.files[name]
 
 
+def download_files_to_workflow(workflow, files):
+    """Download concurrently several files to a specified workflow.
+
+    The files are fetched in parallel into temporary files, which are then
+    stored one after the other in ``workflow.files``, as the database session
+    can't be shared between threads.
+
+    Args:
+        workflow: a workflow object.
+        files(List[Tuple[str, str]]): the ``(name, url)`` of each file.
+
+    Returns:
+        dict: maps the name of each downloaded file to its file object. The
+        files for which the server answered with an error status are
+        missing.
+
+    Raises:
+        Exception: the first error other than an error status raised while
+            downloading a file (e.g. a connection error), after the other
+            files have been stored.
+    """
+    stored = {}
+    with download_files([url for _, url in files]) as (downloaded, errors):
+        for name, url in files:
+            local_file = downloaded.get(url)
+            if local_file is None:
+                continue
+            local_file.seek(0)
+            workflow.files[name] = local_file
+            stored[name] = workflow.files[name]
+
+    for _, url in files:
+        error = errors.get(url)
+        if error is not None and not isinstance(
+            error, requests.exceptions.HTTPError
+        ):
+            raise error
+
+    return stored
+
+
 def convert(xml, xslt_filename):
     """Convert XML using given XSLT stylesheet."""
     if not os.path.isabs(xslt_filename):
@@ -232,10 +276,11 @@ def read_wf_record_source(record_uuid, source):
     Return:
         (dict): the given record, if any or None
     """
+    flush_workflows_writes()
     entry = WorkflowsRecordSources.query.filter_by(
         record_id=str(record_uuid),
         source=source.lower()
-    ).one_or_none()
+    ).populate_existing().one_or_none()
     return entry
 
 
@@ -248,29 +293,24 @@ def read_all_wf_record_sources(record_uuid):
     Return:
         (list): the ``WorkflowRecordSource``s related to ``record_uuid``
     """
-    entries = list(WorkflowsRecordSources.query.filter_by(record_id=str(record_uuid)))
+    flush_workflows_writes()
+    entries = list(WorkflowsRecordSources.query.filter_by(
+        record_id=str(record_uuid)).populate_existing())
     return entries
 
 
 def insert_wf_record_source(json, record_uuid, source):
     """Stores a record in the WorkflowRecordSource table in the db.
 
+    The record is upserted when the current DB session commits, or before
+    the record sources of ``record_uuid`` are read, whichever comes first.
+
     Args:
         json(dict): the record's content to store
         record_uuid(uuid): the record's uuid
         source(string): the source of the record
     """
-    record_source = read_wf_record_source(record_uuid=record_uuid, source=source)
-    if record_source is None:
-        record_source = WorkflowsRecordSources(
-            source=source.lower(),
-            json=json,
-            record_id=record_uuid
-        )
-        db.session.add(record_source)
-    else:
-        record_source.json = json
-    db.session.commit()
+    buffer_wf_record_source(json=json, record_uuid=record_uuid, source=source)
 
 
 def get_resolve_validation_callback_url():
@@ -26,6 +26,7 @@ from __future__ import absolute_import, division, print_function
 
 from os.path import join
 
+from celery import group
 from flask import (
     Blueprint,
     current_app,
@@ -37,6 +38,7 @@ from invenio_db import db
 from inspire_schemas.api import validate
 from invenio_workflows import workflow_object_class, ObjectStatus
 from invenio_workflows.errors import WorkflowsMissingObject
+from invenio_workflows.tasks import resume
 from jsonschema.exceptions import ValidationError
 
 from inspire_utils.urls import ensure_scheme
@@ -101,6 +103,15 @@ def _continue_workflow(workflow_id, recid, result=None):
         )
         return False
 
+    _set_callback_data(workflow_object, base_url, recid, result)
+    workflow_object.save()
+    db.session.commit()
+    workflow_object.continue_workflow(delayed=True)
+
+    return True
+
+
+def _set_callback_data(workflow_object, base_url, recid, result):
     workflow_object.extra_data['url'] = join(
         base_url,
         'record',
@@ -109,11 +120,68 @@ def _continue_workflow(workflow_id, recid, result=None):
     workflow_object.extra_data['recid'] = recid
     workflow_object.data['control_number'] = recid
     workflow_object.extra_data['callback_result'] = result
-    workflow_object.save()
+
+
+def _continue_pending_workflows(pending_records):
+    """Continue the workflows waiting for the given records.
+
+    The workflow objects are fetched with one query and saved in one
+    transaction, along with the removal of the pending records, then all
+    the workflows are continued by a group of Celery tasks.
+
+    :return: a dict mapping each record id to the response of its workflow.
+    """
+    base_url = _get_base_url()
+    recids = {
+        pending_record.workflow_id: int(pending_record.record_id)
+        for pending_record in pending_records
+    }
+    if not recids:
+        return {}
+
+    workflow_objects = workflow_object_class.query(
+        workflow_object_class.dbmodel.id.in_(recids.keys())
+    )
+
+    for workflow_object in workflow_objects:
+        _set_callback_data(
+            workflow_object, base_url, recids[workflow_object.id], {})
+        workflow_object.save()
+
+    WorkflowsPendingRecord.query.filter(
+        WorkflowsPendingRecord.workflow_id.in_(recids.keys())
+    ).delete(synchronize_session=False)
     db.session.commit()
-    workflow_object.continue_workflow(delayed=True)
 
-    return True
+    continued = {workflow_object.id for workflow_object in workflow_objects}
+    if continued:
+        group(
+            resume.si(workflow_id, 'continue_next')
+            for workflow_id in sorted(continued)
+        ).apply_async()
+
+    response = {}
+    for workflow_id, recid in recids.items():
+        if workflow_id in continued:
+            current_app.logger.debug(
+                'Successfully restarted workflow %s',
+                workflow_id,
+            )
+            response[recid] = {
+                'success': True,
+                'message': 'Successfully restarted workflow %s' % workflow_id,
+            }
+        else:
+            current_app.logger.warning(
+                'The workflow %s was not found.',
+                workflow_id,
+            )
+            response[recid] = {
+                'success': False,
+                'message': 'workflow with id %s not found.' % workflow_id,
+            }
+
+    return response
 
 
 def _find_and_continue_workflow(workflow_id, recid, result=None):
@@ -184,36 +252,7 @@ def webcoll_callback():
     pending_records = WorkflowsPendingRecord.query.filter(
         WorkflowsPendingRecord.record_id.in_(recids)
     ).all()
-    response = {}
-    for pending_record in pending_records:
-        recid = int(pending_record.record_id)
-        workflow_id = pending_record.workflow_id
-        continue_response = _find_and_continue_workflow(
-            workflow_id=workflow_id,
-            recid=recid,
-        )
-        if continue_response['success']:
-            current_app.logger.debug(
-                'Successfully restarted workflow %s',
-                workflow_id,
-            )
-            response[recid] = {
-                'success': True,
-                'message': 'Successfully restarted workflow %s' % workflow_id,
-            }
-        else:
-            current_app.logger.debug(
-                'Error restarting workflow %s: %s',
-                workflow_id,
-                continue_response['message'],
-            )
-            response[recid] = {
-                'success': False,
-                'message': continue_response['message'],
-            }
-
-        db.session.delete(pending_record)
-        db.session.commit()
+    response = _continue_pending_workflows(pending_records)
 
     return jsonify(response)
 
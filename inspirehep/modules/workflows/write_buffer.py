@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+
+"""Buffered writes of the audit logs and record sources of workflows.
+
+Instead of being written (and, for record sources, committed) one at a
+time, the rows are kept in a buffer attached to the DB session and
+written with one statement per table right before the session commits,
+so that they end up in the same transaction as the workflow step that
+produced them. Record sources are upserted with ``INSERT ... ON CONFLICT``.
+
+The buffer is also flushed before reading record sources, so that a read
+always sees the record sources written before it. It is discarded when
+the session rolls back.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from collections import OrderedDict
+
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from invenio_db import db
+
+from inspirehep.modules.workflows.models import (
+    WorkflowsAudit,
+    WorkflowsRecordSources,
+)
+
+
+BUFFER_KEY = 'inspire_workflows_write_buffer'
+
+
+class WriteBuffer(object):
+    """Rows waiting to be written to the DB."""
+
+    def __init__(self):
+        self.audits = []
+        self.record_sources = OrderedDict()
+
+    def __len__(self):
+        return len(self.audits) + len(self.record_sources)
+
+
+def _get_buffer(session):
+    return session.info.setdefault(BUFFER_KEY, WriteBuffer())
+
+
+def buffer_workflows_audit(**kwargs):
+    """Buffer the insertion of a ``WorkflowsAudit`` row.
+
+    Args:
+        kwargs: the values of the columns of the row.
+    """
+    _get_buffer(db.session()).audits.append(kwargs)
+
+
+def buffer_wf_record_source(json, record_uuid, source):
+    """Buffer the upsert of a ``WorkflowsRecordSources`` row.
+
+    If the same record source is buffered twice, only the last one is
+    written.
+
+    Args:
+        json(dict): the record's content to store
+        record_uuid(uuid): the record's uuid
+        source(string): the source of the record
+    """
+    key = (str(record_uuid), source.lower())
+    _get_buffer(db.session()).record_sources[key] = json
+
+
+def flush_workflows_writes(session=None):
+    """Write the buffered rows in the current transaction of the session.
+
+    Args:
+        session(Optional[sqlalchemy.orm.Session]): the session whose buffer
+            is written, defaults to the current one.
+    """
+    session = session or db.session()
+    if not session.info.get(BUFFER_KEY):
+        session.info.pop(BUFFER_KEY, None)
+        return
+
+    # The buffered rows may reference objects added to the session but not
+    # flushed yet (e.g. the ``RecordMetadata`` of a record source), and
+    # ``before_commit`` is fired before the ORM flushes them.
+    session.flush()
+    buffer = session.info.pop(BUFFER_KEY)
+
+    if buffer.audits:
+        session.execute(WorkflowsAudit.__table__.insert(), buffer.audits)
+
+    if buffer.record_sources:
+        statement = insert(WorkflowsRecordSources.__table__)
+        statement = statement.on_conflict_do_update(
+            index_elements=['record_id', 'source'],
+            set_={'json': statement.excluded.json},
+        )
+        session.execute(statement, [
+            {'record_id': record_id, 'source': source, 'json': json}
+            for (record_id, source), json in buffer.record_sources.items()
+        ])
+
+
+@event.listens_for(Session, 'before_commit')
+def _flush_before_commit(session):
+    flush_workflows_writes(session)
+
+
+@event.listens_for(Session, 'after_transaction_end')
+def _discard_after_rollback(session, transaction):
+    if transaction.parent is None:
+        session.info.pop(BUFFER_KEY, None)
@@ -26,6 +26,7 @@ from inspirehep.modules.search import ConferencesSearch, LiteratureSearch
 from inspirehep.utils.jinja2 import render_template_to_string
 from inspirehep.utils.record import get_title
 from inspirehep.utils.template import render_macro_from_template
+from inspirehep.utils.template_prefetch import template_prefetch
 
 
 def render_conferences_in_the_same_series(recid, seriesname):
@@ -118,37 +119,38 @@ def render_contributions(hits):
 
     title_html = u"<a href='/literature/{id}'>{name}</a>"
 
-    for hit in hits:
-        row = []
-        row.append(
-            title_html.format(
-                id=hit.control_number,
-                name=get_title(hit.to_dict())
+    with template_prefetch():
+        for hit in hits:
+            row = []
+            row.append(
+                title_html.format(
+                    id=hit.control_number,
+                    name=get_title(hit.to_dict())
+                )
             )
-        )
-        ctx = {
-            'record': hit.to_dict(),
-            'is_brief': 'true',
-            'number_of_displayed_authors': 1,
-            'show_affiliations': 'false',
-            'collaboration_only': 'true'
-        }
-        row.append(render_macro_from_template(
-            name="render_record_authors",
-            template="inspirehep_theme/format/record/Inspire_Default_HTML_general_macros.tpl",
-            ctx=ctx
-        )
-        )
-        try:
-            row.append(hit.publication_info[0].journal_title)
-        except AttributeError:
-            row.append('')
+            ctx = {
+                'record': hit.to_dict(),
+                'is_brief': 'true',
+                'number_of_displayed_authors': 1,
+                'show_affiliations': 'false',
+                'collaboration_only': 'true'
+            }
+            row.append(render_macro_from_template(
+                name="render_record_authors",
+                template="inspirehep_theme/format/record/Inspire_Default_HTML_general_macros.tpl",
+                ctx=ctx
+            )
+            )
+            try:
+                row.append(hit.publication_info[0].journal_title)
+            except AttributeError:
+                row.append('')
 
-        try:
-            row.append(hit.citation_count)
-        except AttributeError:
-            row.append(0)
+            try:
+                row.append(hit.citation_count)
+            except AttributeError:
+                row.append(0)
 
-        result.append(row)
+            result.append(row)
 
     return result, hits.total
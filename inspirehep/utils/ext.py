@@ -24,7 +24,9 @@
 
 from __future__ import absolute_import, division, print_function
 
+from requests.adapters import HTTPAdapter
 from rt import AuthorizationError
+
 from .tickets import InspireRt
 
 
@@ -59,6 +61,11 @@ class INSPIREUtils(object):
                 default_password=password,
                 verify_cert=verify_cert,
             )
+            pool_size = app.config.get("RT_TICKETS_CONCURRENT_REQUESTS", 10)
+            adapter = HTTPAdapter(
+                pool_connections=pool_size, pool_maxsize=pool_size)
+            tracker.session.mount("http://", adapter)
+            tracker.session.mount("https://", adapter)
             loggedin = tracker.login()
             if not loggedin:
                 raise AuthorizationError(
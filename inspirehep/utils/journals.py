@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+
+"""In-memory index of the Journal records.
+
+The Journal records are few and rarely change, so every process keeps all
+of them in memory instead of querying them each time a journal title has
+to be normalized. Each commit of a Journal record increments a version
+counter in Redis, and processes reload their index when they find that
+it changed.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import threading
+
+from flask import current_app
+from redis import StrictRedis
+
+from invenio_db import db
+from invenio_records.models import RecordMetadata
+
+from inspire_dojson.utils import get_recid_from_ref
+from inspire_utils.helpers import force_list
+from inspire_utils.record import get_value
+
+
+JOURNALS_VERSION_KEY = 'journals_index_version'
+
+JOURNAL_FIELDS = (
+    '_harvesting_info',
+    'control_number',
+    'proceedings',
+    'refereed',
+    'self',
+    'short_title',
+)
+"""Fields of the Journal records kept in the index."""
+
+TITLE_PATHS = (
+    'title_variants',
+    'journal_title.title',
+    'short_title',
+)
+"""Paths of the titles of the Journal records, from the one that yields to
+the others to the one that takes precedence when two journals share a
+title."""
+
+_INDEX = None
+_INDEX_LOCK = threading.Lock()
+
+
+class JournalIndex(object):
+    """Lookup of Journal records by title and by id.
+
+    Titles are matched case-insensitively against the short title, the
+    journal title and the title variants of the journals, like the
+    ``lowercase_journal_titles`` field of the ``records-journals`` index.
+    Only the fields in :data:`JOURNAL_FIELDS` of the journals are kept.
+    """
+
+    def __init__(self, journals, version=None):
+        self.version = version
+        self._by_recid = {}
+        self._by_title = {}
+
+        titles = {path: [] for path in TITLE_PATHS}
+        for journal in journals:
+            entry = {key: journal[key] for key in JOURNAL_FIELDS if key in journal}
+            self._by_recid[entry['control_number']] = entry
+            for path in TITLE_PATHS:
+                titles[path].extend(
+                    (title, entry) for title in force_list(get_value(journal, path)))
+
+        for path in TITLE_PATHS:
+            for title, entry in titles[path]:
+                if title:
+                    self._by_title[title.lower()] = entry
+
+    def __len__(self):
+        return len(self._by_recid)
+
+    def get_by_title(self, title):
+        """Return the journal with the given title, or ``None``."""
+        if not title:
+            return None
+        return self._by_title.get(title.lower())
+
+    def get_by_recid(self, recid):
+        """Return the journal with the given id, or ``None``."""
+        return self._by_recid.get(recid)
+
+    def get_by_refs(self, refs):
+        """Return the journals referenced by ``refs`` that exist."""
+        journals = (
+            self.get_by_recid(get_recid_from_ref(ref))
+            for ref in force_list(refs)
+        )
+        return [journal for journal in journals if journal]
+
+
+def get_journal_index():
+    """Return the index of the Journal records of this process.
+
+    The index is loaded the first time, and loaded again when the version
+    counter in Redis shows that a Journal record changed since.
+
+    Returns:
+        JournalIndex: the index of the Journal records.
+    """
+    global _INDEX
+
+    version = _get_redis().get(JOURNALS_VERSION_KEY)
+    index = _INDEX
+    if index is not None and index.version == version:
+        return index
+
+    with _INDEX_LOCK:
+        if _INDEX is None or _INDEX.version != version:
+            _INDEX = JournalIndex(_load_journals(), version)
+            current_app.logger.debug(
+                'Loaded %d journals in the journal index', len(_INDEX))
+        return _INDEX
+
+
+def invalidate_journal_index():
+    """Make every process reload its index of the Journal records."""
+    _get_redis().incr(JOURNALS_VERSION_KEY)
+
+
+def _get_redis():
+    redis_url = current_app.config.get('CACHE_REDIS_URL')
+    return StrictRedis.from_url(redis_url)
+
+
+def _load_journals():
+    query = db.session.query(RecordMetadata.json).filter(
+        RecordMetadata.json['_collections'].op('?')('Journals'))
+
+    return [
+        json for json, in query.yield_per(1000)
+        if json and not json.get('deleted')
+    ]
@@ -22,23 +22,12 @@
 
 from __future__ import absolute_import, division, print_function
 
-from flask import current_app
-
-from inspirehep.modules.search.api import JournalsSearch
+from inspirehep.utils.journals import get_journal_index
 
 
 def normalize_journal_title(journal_title):
-    normalized_journal_title = journal_title
-    hits = JournalsSearch().query(
-        'match',
-        lowercase_journal_titles=journal_title
-    ).execute()
+    journal = get_journal_index().get_by_title(journal_title)
+    if journal and journal.get('short_title'):
+        return journal['short_title']
 
-    if hits:
-        try:
-            normalized_journal_title = hits[0].short_title
-        except (AttributeError, IndexError):
-            current_app.logger.debug(
-                "Failed to normalize journal title in: %s", repr(hits[0])
-            )
-    return normalized_journal_title
+    return journal_title
@@ -27,7 +27,6 @@ from __future__ import absolute_import, division, print_function
 from functools import wraps
 
 from flask import current_app
-from werkzeug.utils import import_string
 
 from invenio_pidstore.models import PersistentIdentifier
 from invenio_records.models import RecordMetadata
@@ -63,13 +62,16 @@ def raise_record_getter_error_and_log(f):
     return wrapper
 
 
+def _get_search_class(pid_type):
+    endpoint = get_endpoint_from_pid_type(pid_type)
+    return current_app.extensions['inspire-records'].search_classes[endpoint]()
+
+
 @raise_record_getter_error_and_log
 def get_es_record(pid_type, recid, **kwargs):
     pid = PersistentIdentifier.get(pid_type, recid)
 
-    endpoint = get_endpoint_from_pid_type(pid_type)
-    search_conf = current_app.config['RECORDS_REST_ENDPOINTS'][endpoint]
-    search_class = import_string(search_conf['search_class'])()
+    search_class = _get_search_class(pid_type)
 
     return search_class.get_source(pid.object_uuid, **kwargs)
 
@@ -83,9 +85,7 @@ def get_es_records(pid_type, recids, **kwargs):
     ).all()
     uuids = [str(uuid.object_uuid) for uuid in uuids]
 
-    endpoint = get_endpoint_from_pid_type(pid_type)
-    search_conf = current_app.config['RECORDS_REST_ENDPOINTS'][endpoint]
-    search_class = import_string(search_conf['search_class'])()
+    search_class = _get_search_class(pid_type)
 
     return search_class.mget(uuids, **kwargs)
 
@@ -94,9 +94,7 @@ def get_es_records(pid_type, recids, **kwargs):
 def get_es_record_by_uuid(uuid):
     pid = PersistentIdentifier.query.filter_by(object_uuid=uuid).one()
 
-    endpoint = get_endpoint_from_pid_type(pid.pid_type)
-    search_conf = current_app.config['RECORDS_REST_ENDPOINTS'][endpoint]
-    search_class = import_string(search_conf['search_class'])()
+    search_class = _get_search_class(pid.pid_type)
 
     return search_class.get_source(uuid)
 
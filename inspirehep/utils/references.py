@@ -31,6 +31,7 @@ from inspire_utils.helpers import force_list
 
 from inspirehep.utils.jinja2 import render_template_to_string
 from inspirehep.utils.record_getter import get_es_records
+from inspirehep.utils.template_prefetch import template_prefetch
 from inspirehep.utils.url import retrieve_uri
 
 
@@ -61,25 +62,26 @@ def get_and_format_references(record):
         recid_to_reference = {
             ref['control_number']: ref for ref in resolved_references
         }
-        for reference in references:
-            row = []
-            ref_record = recid_to_reference.get(
-                reference.get('recid'), {}
-            )
-            if 'reference' in reference:
-                reference.update(reference['reference'])
-                del reference['reference']
-            if 'publication_info' in reference:
-                reference['publication_info'] = force_list(
-                    reference['publication_info']
+        with template_prefetch(*resolved_references):
+            for reference in references:
+                row = []
+                ref_record = recid_to_reference.get(
+                    reference.get('recid'), {}
                 )
-            row.append(render_template_to_string(
-                'inspirehep_theme/references.html',
-                record=ref_record,
-                reference=reference
-            ))
-            row.append(ref_record.get('citation_count', ''))
-            out.append(row)
+                if 'reference' in reference:
+                    reference.update(reference['reference'])
+                    del reference['reference']
+                if 'publication_info' in reference:
+                    reference['publication_info'] = force_list(
+                        reference['publication_info']
+                    )
+                row.append(render_template_to_string(
+                    'inspirehep_theme/references.html',
+                    record=ref_record,
+                    reference=reference
+                ))
+                row.append(ref_record.get('citation_count', ''))
+                out.append(row)
 
     return out
 
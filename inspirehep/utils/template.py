@@ -26,6 +26,8 @@ from __future__ import absolute_import, division, print_function
 
 from flask import current_app
 
+from inspirehep.utils.template_prefetch import get_template_prefetch_context
+
 
 def render_macro_from_template(name, template, app=None, ctx=None):
     """Render macro with the given context.
@@ -43,5 +45,10 @@ def render_macro_from_template(name, template, app=None, ctx=None):
     ctx = ctx or {}
     app = app or current_app
     tpl = app.jinja_env.get_template(template)
-    macro = getattr(tpl.make_module(), name)
+    prefetch_context = get_template_prefetch_context()
+    if prefetch_context is None:
+        module = tpl.make_module()
+    else:
+        module = prefetch_context.get_template_module(tpl)
+    macro = getattr(module, name)
     return unicode(macro(**ctx))
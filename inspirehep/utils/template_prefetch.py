@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+
+"""Bulk resolution of the data needed by the template filters."""
+
+from __future__ import absolute_import, division, print_function
+
+from collections import defaultdict
+from contextlib import contextmanager
+
+import six
+from flask import current_app, g, has_app_context
+from werkzeug.urls import url_parse
+
+from inspire_utils.urls import ensure_scheme
+from inspirehep.modules.pidstore.utils import get_pid_type_from_endpoint
+from inspirehep.modules.search import IQ, InstitutionsSearch, LiteratureSearch
+from inspirehep.utils.record_getter import get_es_records
+
+PROCEEDINGS_PER_CNUM = 10
+"""Number of proceedings prefetched for each conference."""
+
+
+def get_pid_from_ref(ref):
+    """Return the ``(pid_type, pid_value)`` pointed by a local JSON reference.
+
+    Args:
+        ref(dict): a JSON reference, e.g. ``{'$ref': 'http://x/api/literature/1'}``.
+
+    Returns:
+        tuple: the ``pid_type`` and ``pid_value`` of the referenced record, or
+        ``None`` if ``ref`` doesn't point to a record of this server.
+    """
+    try:
+        parsed_uri = url_parse(ref['$ref'])
+    except (KeyError, TypeError):
+        return None
+
+    server_name = current_app.config.get('SERVER_NAME')
+    parsed_server = url_parse(ensure_scheme(server_name))
+    if parsed_uri.netloc and parsed_uri.netloc != parsed_server.netloc:
+        return None
+
+    path_parts = parsed_uri.path.strip('/').split('/')
+    if len(path_parts) < 2:
+        return None
+
+    try:
+        pid_type = get_pid_type_from_endpoint(path_parts[-2])
+    except KeyError:
+        return None
+
+    return pid_type, path_parts[-1]
+
+
+class TemplatePrefetchContext(object):
+    """Data needed by the template filters, resolved in bulk.
+
+    The references, proceedings and affiliation counts of all the records
+    about to be rendered are fetched with one request per kind, so that the
+    filters only have to look them up. Whatever wasn't prefetched is still
+    resolved by the filters themselves.
+    """
+
+    def __init__(self):
+        self.records = {}
+        self.proceedings = {}
+        self.affiliation_counts = {}
+        self.template_modules = {}
+
+    def prefetch(self, *records):
+        """Prefetch everything the filters need to render ``records``."""
+        refs, cnums, icns = [], [], []
+        for record in records:
+            for pub_info in record.get('publication_info', []):
+                refs.extend(
+                    pub_info[key]
+                    for key in ('conference_record', 'parent_record')
+                    if key in pub_info
+                )
+            if record.get('cnum'):
+                cnums.append(record['cnum'])
+            if isinstance(record.get('ICN'), six.string_types):
+                icns.append(record['ICN'])
+
+        self.prefetch_refs(refs)
+        self.prefetch_proceedings(cnums)
+        self.prefetch_affiliation_counts(icns)
+
+    def prefetch_refs(self, refs):
+        """Resolve ``refs`` from Elasticsearch with one mget per pid type."""
+        pid_values_by_type = defaultdict(set)
+        for ref in refs:
+            pid = get_pid_from_ref(ref)
+            if pid and pid not in self.records:
+                pid_values_by_type[pid[0]].add(pid[1])
+
+        # References to records without a document in Elasticsearch (e.g.
+        # merged or deleted ones) are left out, so that the filters resolve
+        # them on their own as before.
+        for pid_type, pid_values in six.iteritems(pid_values_by_type):
+            for record in get_es_records(pid_type, sorted(pid_values)):
+                pid = (pid_type, str(record['control_number']))
+                self.records[pid] = record
+
+    def prefetch_proceedings(self, cnums):
+        """Fetch the proceedings of all ``cnums`` with a single search."""
+        cnums = sorted(set(cnums) - set(self.proceedings))
+        if not cnums:
+            return
+
+        search = LiteratureSearch().query_from_iq('980__a:proceedings')
+        search = search.params(search_type='count')
+        search.aggs.bucket('proceedings', 'filters', filters={
+            cnum: IQ('cnum:%s' % cnum, search).to_dict() for cnum in cnums
+        }).metric(
+            'hits', 'top_hits',
+            size=PROCEEDINGS_PER_CNUM,
+            _source=['control_number', 'dois'],
+        )
+
+        buckets = search.execute().to_dict()[
+            'aggregations'
+        ]['proceedings']['buckets']
+
+        for cnum, bucket in six.iteritems(buckets):
+            self.proceedings[cnum] = [
+                hit['_source'] for hit in bucket['hits']['hits']['hits']
+            ]
+
+    def prefetch_affiliation_counts(self, icns):
+        """Count the records of all affiliations ``icns`` with a single search."""
+        icns = sorted(set(icns) - set(self.affiliation_counts))
+        if not icns:
+            return
+
+        search = InstitutionsSearch().params(search_type='count')
+        search.aggs.bucket('affiliations', 'filters', filters={
+            icn: IQ('affiliation:%s' % icn, search).to_dict() for icn in icns
+        })
+
+        buckets = search.execute().to_dict()[
+            'aggregations'
+        ]['affiliations']['buckets']
+
+        for icn, bucket in six.iteritems(buckets):
+            self.affiliation_counts[icn] = bucket['doc_count']
+
+    def has_ref(self, ref):
+        return get_pid_from_ref(ref) in self.records
+
+    def get_ref(self, ref):
+        return self.records[get_pid_from_ref(ref)]
+
+    def get_template_module(self, template):
+        """Return the module of ``template``, creating it only once."""
+        if template.name not in self.template_modules:
+            self.template_modules[template.name] = template.make_module()
+        return self.template_modules[template.name]
+
+
+def get_template_prefetch_context():
+    """Return the prefetch context of the current render, if any."""
+    if not has_app_context():
+        return None
+    return getattr(g, 'inspire_template_prefetch', None)
+
+
+@contextmanager
+def template_prefetch(*records):
+    """Prefetch what the template filters need to render ``records``.
+
+    Examples:
+        >>> with template_prefetch(record):
+        ...     render_template('detail.html', record=record)
+
+    """
+    context = TemplatePrefetchContext()
+    context.prefetch(*records)
+
+    previous_context = get_template_prefetch_context()
+    g.inspire_template_prefetch = context
+    try:
+        yield context
+    finally:
+        g.inspire_template_prefetch = previous_context
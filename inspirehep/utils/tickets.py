@@ -24,12 +24,15 @@
 
 from __future__ import absolute_import, division, print_function
 
-from functools import wraps
+from functools import partial, wraps
+from multiprocessing.pool import ThreadPool
 from urlparse import urljoin, urlparse
 
 from flask import current_app, render_template
 from rt import ALL_QUEUES, AuthorizationError, Rt
 
+from invenio_cache import current_cache
+
 from .proxies import rt_instance
 
 
@@ -144,7 +147,11 @@ def create_ticket(queue,
     if requestors and "admin@inspirehep.net" not in requestors:
         payload["requestors"] = requestors
 
-    return rt_instance.create_ticket(**payload)
+    ticket_id = rt_instance.create_ticket(**payload)
+    if recid:
+        _invalidate_tickets_cache(recid)
+
+    return ticket_id
 
 
 def create_ticket_with_template(queue,
@@ -190,10 +197,14 @@ def create_ticket_with_template(queue,
 
 
 @relogin_if_needed
-def resolve_ticket(ticket_id):
+def resolve_ticket(ticket_id, recid=None):
     """Resolves the given ticket
 
     :type ticket_id: integer
+
+    :param recid: record id of the ticket, if known, otherwise it is looked
+        up among the cached tickets
+    :type recid: integer
     """
     try:
         rt_instance.edit_ticket(
@@ -206,6 +217,10 @@ def resolve_ticket(ticket_id):
         if ticket["Status"] != "resolved":
             raise EditTicketException()
 
+    recid = recid or current_cache.get(_get_ticket_recid_cache_key(ticket_id))
+    if recid:
+        _invalidate_tickets_cache(recid)
+
 
 def get_queues():
     """Returns list of all queues as {id, name} dict
@@ -228,10 +243,26 @@ def _get_all_of(query_type):
     """Utility function to share the code for performing custom get all requests
      and parsing the result
 
+    The result is cached for ``RT_USERS_AND_QUEUES_CACHE_TIMEOUT`` seconds.
+
     :param query_type: the type of quer, either ``'queue'`` or ``'user'``
 
     :rtype: dict - with ``name (string)``, ``id (integer)`` properties
     """
+    cache_key = 'rt_all_of::{}'.format(query_type)
+    result = current_cache.get(cache_key)
+    if result is None:
+        result = _query_all_of(query_type)
+        current_cache.set(
+            cache_key,
+            result,
+            timeout=current_app.config['RT_USERS_AND_QUEUES_CACHE_TIMEOUT'],
+        )
+
+    return result
+
+
+def _query_all_of(query_type):
     search_query = "search/" + query_type + "?query="
     url = urljoin(rt_instance.url, search_query)
     response = rt_instance.session.get(url)
@@ -263,14 +294,40 @@ def _strip_lines(multiline_string):
     )
 
 
+def _get_tickets_cache_key(recid, exclude_resolved, with_extra_attributes):
+    return 'rt_tickets::{}::{}::{}'.format(
+        recid, exclude_resolved, with_extra_attributes)
+
+
+def _get_ticket_recid_cache_key(ticket_id):
+    return 'rt_ticket_recid::{}'.format(ticket_id)
+
+
+def _invalidate_tickets_cache(recid):
+    current_cache.delete_many(*[
+        _get_tickets_cache_key(recid, exclude_resolved, with_extra_attributes)
+        for exclude_resolved in (True, False)
+        for with_extra_attributes in (True, False)
+    ])
+
+
 @relogin_if_needed
 def get_tickets_by_recid(recid,
                          exclude_resolved=True,
                          with_extra_attributes=True):
     """Returns all tickets that are associated with the given recid
 
+    The tickets are cached for ``RT_TICKETS_CACHE_TIMEOUT`` seconds, or
+    until a ticket of the record is created or resolved through this module.
+
     :type recid: integer
     """
+    cache_key = _get_tickets_cache_key(
+        recid, exclude_resolved, with_extra_attributes)
+    tickets_for_recid = current_cache.get(cache_key)
+    if tickets_for_recid is not None:
+        return tickets_for_recid
+
     search_params = dict(
         Queue=ALL_QUEUES,
         CF_RecordID=str(recid)
@@ -279,27 +336,53 @@ def get_tickets_by_recid(recid,
         search_params['Status__notexact'] = 'resolved'
     tickets_for_recid = rt_instance.search(**search_params)
     if with_extra_attributes:
-        return map(_set_extra_attributes, tickets_for_recid)
-    else:
-        return tickets_for_recid
+        tickets_for_recid = _set_extra_attributes_of_all(tickets_for_recid)
 
+    timeout = current_app.config['RT_TICKETS_CACHE_TIMEOUT']
+    current_cache.set(cache_key, tickets_for_recid, timeout=timeout)
+    current_cache.set_many({
+        _get_ticket_recid_cache_key(_get_ticket_id(ticket)): recid
+        for ticket in tickets_for_recid
+    }, timeout=timeout)
 
-def _set_extra_attributes(ticket):
-    """Sets better ticket id, Text and Link for given ticket"""
+    return tickets_for_recid
+
+
+def _get_ticket_id(ticket):
     # `ticket['id']` has format of `'ticket/<ticket_id>'`
-    ticket_id = ticket['id'].split('/')[1]
+    return ticket['id'].split('/')[1]
+
+
+def _set_extra_attributes_of_all(tickets):
+    """Sets the extra attributes of the tickets with concurrent requests."""
+    if not tickets:
+        return []
+
+    rt = rt_instance._get_current_object()
+    processes = min(
+        len(tickets), current_app.config['RT_TICKETS_CONCURRENT_REQUESTS'])
+    pool = ThreadPool(processes)
+    try:
+        return pool.map(partial(_set_extra_attributes, rt=rt), tickets)
+    finally:
+        pool.close()
+
+
+def _set_extra_attributes(ticket, rt=rt_instance):
+    """Sets better ticket id, Text and Link for given ticket"""
+    ticket_id = _get_ticket_id(ticket)
     ticket['Id'] = ticket_id
-    ticket['Text'] = _get_ticket_text(ticket_id)
-    ticket['Link'] = get_rt_link_for_ticket(ticket_id)
+    ticket['Text'] = _get_ticket_text(ticket_id, rt=rt)
+    ticket['Link'] = _get_rt_link(rt.url, ticket_id)
     return ticket
 
 
-def _get_ticket_text(ticket_id):
+def _get_ticket_text(ticket_id, rt=rt_instance):
     """Returns the first plain text attachment or empty string for given ticket
     """
-    attachments_ids = rt_instance.get_attachments_ids(ticket_id)
+    attachments_ids = rt.get_attachments_ids(ticket_id)
     for attachment_id in attachments_ids:
-        attachment = rt_instance.get_attachment(ticket_id, attachment_id)
+        attachment = rt.get_attachment(ticket_id, attachment_id)
         if attachment['ContentType'] == 'text/plain':
             return attachment['Content']
     return ''
@@ -312,7 +395,11 @@ def get_rt_link_for_ticket(ticket_id):
 
     :rtype: string
     """
-    parsed_url = urlparse(rt_instance.url)
+    return _get_rt_link(rt_instance.url, ticket_id)
+
+
+def _get_rt_link(rt_url, ticket_id):
+    parsed_url = urlparse(rt_url)
     return '{}://{}/Ticket/Display.html?id={}'.format(parsed_url.scheme,
                                                       parsed_url.netloc,
                                                       ticket_id)
@@ -25,17 +25,31 @@
 from __future__ import absolute_import, division, print_function
 
 import io
+import logging
 import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing, contextmanager
+from multiprocessing.pool import ThreadPool
 
+import backoff
 import requests
-from contextlib import contextmanager
 from flask import current_app
 from fs.opener import fsopen
+from six.moves.urllib.parse import urlparse
 
 from inspire_utils.urls import record_url_by_pattern
 from inspirehep import __version__
 
 
+LOGGER = logging.getLogger(__name__)
+
+
+class IncompleteDownloadError(IOError):
+    """The downloaded content doesn't match the declared length."""
+
+
 def make_user_agent_string(component=""):
     """Return a nice and uniform user-agent string to be used by INSPIRE."""
     ret = "InspireHEP-{0} (+{1};)".format(
@@ -47,32 +61,126 @@ def make_user_agent_string(component=""):
     return ret
 
 
-def is_pdf_link(url):
+class _ProbedLinksCache(object):
+    """Per-process cache of what is known about recently probed links.
+
+    It remembers for a short while the links found to point to a PDF, so
+    that they aren't probed again, and the content of the links probed with
+    ``keep_content``, so that the following download doesn't fetch them a
+    second time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pdf_links = {}
+        self._contents = OrderedDict()
+
+    def is_pdf_link(self, url):
+        with self._lock:
+            expires = self._pdf_links.get(url)
+            if expires is not None and expires < time.time():
+                del self._pdf_links[url]
+                expires = None
+            return expires is not None
+
+    def set_pdf_link(self, url, timeout):
+        with self._lock:
+            self._pdf_links[url] = time.time() + timeout
+
+    def set_content(self, url, content_file, timeout, max_size):
+        with self._lock:
+            self._discard(url)
+            self._contents[url] = (time.time() + timeout, content_file)
+            while len(self._contents) > max_size:
+                self._discard(next(iter(self._contents)))
+
+    def pop_content(self, url):
+        with self._lock:
+            expires, content_file = self._contents.pop(url, (None, None))
+        if content_file is not None and expires < time.time():
+            content_file.close()
+            return None
+        return content_file
+
+    def _discard(self, url):
+        _, content_file = self._contents.pop(url, (None, None))
+        if content_file is not None:
+            content_file.close()
+
+
+_PROBED_LINKS = _ProbedLinksCache()
+
+
+def is_pdf_link(url, keep_content=False):
     """Return ``True`` if ``url`` points to a PDF.
 
     Returns ``True`` if the first significant line of the response starts with
-    ``%PDF``.
+    ``%PDF``. Links found to point to a PDF are remembered for
+    ``PROBED_LINKS_CACHE_TIMEOUT`` seconds and not probed again.
 
     Args:
         url (string): a URL.
+        keep_content (bool): whether to keep the whole response in a temporary
+            file, so that :func:`pop_probed_content` or
+            :func:`download_files` can use it without fetching ``url``
+            again.
 
     Returns:
         bool: whether the url points to a PDF.
 
     """
+    if _PROBED_LINKS.is_pdf_link(url):
+        return True
+
     try:
         response = requests.get(url, allow_redirects=True, stream=True)
     except requests.exceptions.RequestException:
         return False
 
-    try:
-        first_significant_line = next(response.iter_lines(1))
-        while not first_significant_line.strip():
-            first_significant_line = next(response.iter_lines(1))
-    except StopIteration:
-        return False
+    with closing(response):
+        chunks = response.iter_content(io.DEFAULT_BUFFER_SIZE)
+        head = b''
+        for chunk in chunks:
+            head += chunk
+            if len(head.lstrip()) >= len(b'%PDF'):
+                break
+        is_pdf = head.lstrip().startswith(b'%PDF')
+
+        if keep_content and response.status_code == 200:
+            content_file = tempfile.TemporaryFile(prefix='inspire')
+            try:
+                content_file.write(head)
+                for chunk in chunks:
+                    content_file.write(chunk)
+            except requests.exceptions.RequestException:
+                content_file.close()
+            else:
+                content_file.seek(0)
+                _PROBED_LINKS.set_content(
+                    url,
+                    content_file,
+                    timeout=current_app.config['PROBED_LINKS_CACHE_TIMEOUT'],
+                    max_size=current_app.config['PROBED_LINKS_CACHE_SIZE'],
+                )
+
+    if is_pdf:
+        _PROBED_LINKS.set_pdf_link(
+            url, timeout=current_app.config['PROBED_LINKS_CACHE_TIMEOUT'])
+
+    return is_pdf
+
+
+def pop_probed_content(url):
+    """Take the content of a link kept by :func:`is_pdf_link`, if any.
+
+    Args:
+        url (string): a URL.
 
-    return first_significant_line.startswith('%PDF')
+    Returns:
+        Optional[file]: a temporary file with the content of ``url``, which
+        the caller has to close, or ``None`` if it is not available anymore.
+    """
+    return _PROBED_LINKS.pop_content(url)
 
 
 def copy_file(src_file, dst_file, buffer_size=io.DEFAULT_BUFFER_SIZE):
@@ -94,6 +202,124 @@ def retrieve_uri(uri, outdir=None):
         yield local_file.name
 
 
+def _make_download_session(pool_size):
+    """Session keeping ``pool_size`` connections open to each host."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = make_user_agent_string('files')
+    return session
+
+
+@backoff.on_exception(
+    backoff.expo,
+    (
+        requests.packages.urllib3.exceptions.ProtocolError,
+        requests.exceptions.ChunkedEncodingError,
+    ),
+    max_tries=5,
+)
+def _download_to_file(session, url, local_file, open_file, timeout):
+    local_file.seek(0)
+    local_file.truncate()
+
+    if urlparse(url).scheme not in ('http', 'https'):
+        with open_file(url, mode='rb') as remote_file:
+            copy_file(remote_file, local_file)
+        return
+
+    probed_content = pop_probed_content(url)
+    if probed_content is not None:
+        with closing(probed_content):
+            copy_file(probed_content, local_file)
+        return
+
+    with closing(session.get(url, stream=True, timeout=timeout)) as response:
+        if response.status_code != 200:
+            raise requests.exceptions.HTTPError(
+                'Got status %s downloading %s' % (response.status_code, url),
+                response=response,
+            )
+
+        for chunk in response.iter_content(io.DEFAULT_BUFFER_SIZE):
+            local_file.write(chunk)
+
+        content_length = response.headers.get('Content-Length')
+        if content_length and int(content_length) != response.raw.tell():
+            raise IncompleteDownloadError(
+                'Expected %s bytes from %s, got %s' % (
+                    content_length, url, response.raw.tell())
+            )
+
+
+@contextmanager
+def download_files(urls, max_workers=None, open_file=fsopen):
+    """Download several files concurrently into temporary files.
+
+    HTTP(S) URLs are streamed through a shared session reusing the
+    connections to each host, and downloads that don't match their declared
+    ``Content-Length`` are discarded. Other URLs are opened with
+    ``open_file``. The temporary files are deleted when exiting the context.
+
+    Args:
+        urls(List[str]): the URLs to download, duplicates are fetched once.
+        max_workers(int): maximum number of concurrent downloads, defaults to
+            the ``FILES_DOWNLOAD_MAX_WORKERS`` configuration variable.
+        open_file(callable): function used to open non HTTP URLs.
+
+    Yields:
+        Tuple[dict, dict]: the first one maps each downloaded URL to an
+        open temporary file with its content, the second one maps each URL
+        which couldn't be downloaded to the raised exception.
+    """
+    unique_urls = list(set(urls))
+    if not unique_urls:
+        yield {}, {}
+        return
+
+    max_workers = max_workers or current_app.config[
+        'FILES_DOWNLOAD_MAX_WORKERS']
+    timeout = current_app.config['FILES_DOWNLOAD_TIMEOUT']
+    session = _make_download_session(max_workers)
+    local_files = {
+        url: tempfile.TemporaryFile(prefix='inspire') for url in unique_urls
+    }
+
+    def _download(url):
+        try:
+            _download_to_file(
+                session, url, local_files[url], open_file, timeout)
+        except Exception as err:
+            LOGGER.warning('Cannot download %s: %s', url, err)
+            return url, err
+        local_files[url].seek(0)
+        return url, None
+
+    pool = ThreadPool(max(1, min(max_workers, len(unique_urls))))
+    try:
+        results = pool.map(_download, unique_urls)
+    finally:
+        pool.close()
+        pool.join()
+        session.close()
+
+    errors = {url: err for url, err in results if err is not None}
+    downloaded = {
+        url: local_file for url, local_file in local_files.items()
+        if url not in errors
+    }
+
+    try:
+        yield downloaded, errors
+    finally:
+        for local_file in local_files.values():
+            local_file.close()
+
+
 def get_legacy_url_for_recid(recid):
     """Get a URL to a record on INSPIRE.
 
@@ -231,15 +231,18 @@ setup(
             'inspirehep_editor = inspirehep.modules.editor:blueprint',
         ],
         'invenio_celery.tasks': [
+            'inspire_hal = inspirehep.modules.hal.tasks',
             'inspire_migrator = inspirehep.modules.migrator.tasks',
             'inspire_orcid = inspirehep.modules.orcid.tasks',
             'inspire_records = inspirehep.modules.records.tasks',
             'inspire_refextract = inspirehep.modules.refextract.tasks',
+            'inspire_theme = inspirehep.modules.theme.tasks',
         ],
         'invenio_db.alembic': [
             'inspirehep = inspirehep:alembic',
         ],
         'invenio_db.models': [
+            'inspire_hal = inspirehep.modules.hal.models',
             'inspire_workflows_audit = inspirehep.modules.workflows.models',
         ],
         'invenio_jsonschemas.schemas': [
@@ -31,6 +31,7 @@ import pytest
 import requests_mock
 
 from mock import patch
+from sqlalchemy import event
 from StringIO import StringIO
 
 from invenio_accounts.models import SessionActivity
@@ -131,6 +132,47 @@ def test_get_revisions(log_in_as_cataloger, record_with_two_revisions, api_clien
     assert result[1]['user_email'] == 'system'
 
 
+def test_get_revisions_paginates(log_in_as_cataloger, record_with_two_revisions, api_client):
+    response = api_client.get(
+        '/editor/literature/111/revisions?size=2&page=2',
+        content_type='application/json',
+    )
+
+    result = json.loads(response.data)
+
+    assert [revision['revision_id'] for revision in result] == [0]
+
+
+@pytest.mark.parametrize('query_string', ['size=2&page=0', 'size=2&page=-1', 'size=-2'])
+def test_get_revisions_rejects_invalid_pages(log_in_as_cataloger, record_with_two_revisions, api_client, query_string):
+    response = api_client.get(
+        '/editor/literature/111/revisions?' + query_string,
+        content_type='application/json',
+    )
+
+    assert response.status_code == 400
+
+
+def test_get_revisions_runs_one_query_for_the_history(log_in_as_cataloger, record_with_two_revisions, api_client):
+    statements = []
+
+    def _record_statement(conn, cursor, statement, *args):
+        if 'records_metadata_version' in statement:
+            statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', _record_statement)
+    try:
+        response = api_client.get(
+            '/editor/literature/111/revisions',
+            content_type='application/json',
+        )
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', _record_statement)
+
+    assert response.status_code == 200
+    assert len(statements) == 1
+
+
 def test_revert_to_revision(log_in_as_cataloger, record_with_two_revisions, api_client):
     record = get_db_record('lit', 111)
 
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+
+"""HAL bulk push tests, against a stub SWORD server."""
+
+from __future__ import absolute_import, division, print_function
+
+import threading
+from datetime import datetime, timedelta
+
+import mock
+import pytest
+from six.moves.BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+from invenio_db import db
+
+from inspirehep.modules.hal.bulk_push import get_push_stats, run
+from inspirehep.modules.hal.models import HALPushState
+
+RECEIPT = '''<?xml version="1.0" encoding="UTF-8"?>
+<entry xmlns="http://www.w3.org/2005/Atom">
+  <id>{hal_id}</id>
+</entry>'''
+
+
+class StubSwordHandler(BaseHTTPRequestHandler):
+    """Accept every SWORD deposit, as HAL would do for valid ones."""
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, hal_id):
+        body = RECEIPT.format(hal_id=hal_id).encode('utf8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/atom+xml;type=entry')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length', 0))
+        return self.rfile.read(length)
+
+    def do_POST(self):
+        self.server.requests.append(('POST', self.path))
+        self._read_body()
+        if self.server.failing:
+            self.send_response(500)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        hal_id = 'hal-{:08d}'.format(len(self.server.requests))
+        return self._reply(201, hal_id)
+
+    def do_PUT(self):
+        self.server.requests.append(('PUT', self.path))
+        self._read_body()
+        return self._reply(200, self.path.rsplit('/', 1)[-1])
+
+
+@pytest.fixture
+def sword_stub(app):
+    server = HTTPServer(('localhost', 0), StubSwordHandler)
+    server.requests = []
+    server.failing = False
+
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    url = 'http://localhost:{}/sword/'.format(server.server_port)
+    config = {
+        'HAL_COL_IRI': url + 'hal',
+        'HAL_EDIT_IRI': url,
+    }
+    with mock.patch.dict(app.config, config):
+        yield server
+
+    server.shutdown()
+    server.server_close()
+
+    HALPushState.query.delete()
+    db.session.commit()
+
+
+@mock.patch('inspirehep.modules.hal.bulk_push.get_recids_to_push')
+def test_run_pushes_each_record_once(mock_get_recids_to_push, sword_stub):
+    mock_get_recids_to_push.return_value = [1472986, 1498589]
+    since = datetime.utcnow() - timedelta(seconds=1)
+
+    assert run(chunk_size=1, concurrency=2) == (2, 2)
+
+    assert sorted(sword_stub.requests) == [('POST', '/sword/hal')] * 2
+    states = HALPushState.query.order_by(HALPushState.recid).all()
+    assert [state.status for state in states] == ['pushed', 'pushed']
+    assert all(state.hal_id.startswith('hal-') for state in states)
+
+    push_stats = get_push_stats(since)
+    assert push_stats['pushed'] == 2
+    assert push_stats['failed'] == 0
+    assert push_stats['throughput'] > 0
+
+    del sword_stub.requests[:]
+    run(chunk_size=1, concurrency=2)
+
+    assert sword_stub.requests == []
+
+
+@mock.patch('inspirehep.modules.hal.bulk_push.get_recids_to_push')
+def test_run_updates_records_whose_tei_changed(mock_get_recids_to_push, sword_stub):
+    mock_get_recids_to_push.return_value = [1472986]
+    run()
+    state = HALPushState.query.get(1472986)
+    state.payload_hash = 'outdated'
+    db.session.commit()
+
+    del sword_stub.requests[:]
+    run()
+
+    assert sword_stub.requests == [('PUT', '/sword/{}'.format(state.hal_id))]
+    assert HALPushState.query.get(1472986).payload_hash != 'outdated'
+
+
+@mock.patch('inspirehep.modules.hal.bulk_push.get_recids_to_push')
+def test_run_retries_failed_records(mock_get_recids_to_push, sword_stub):
+    mock_get_recids_to_push.return_value = [1472986]
+    sword_stub.failing = True
+
+    run()
+
+    state = HALPushState.query.get(1472986)
+    assert state.status == 'failed'
+    assert state.error.startswith('HAL: ')
+    assert len(sword_stub.requests) == 2
+
+    sword_stub.failing = False
+    run()
+
+    assert HALPushState.query.get(1472986).status == 'pushed'
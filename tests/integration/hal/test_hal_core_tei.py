@@ -27,10 +27,18 @@ import os
 import pkg_resources
 import pytest
 from lxml import etree
+from mock import Mock, patch
 
+from invenio_cache import current_cache
 from invenio_search.api import current_search_client as es
 
-from inspirehep.modules.hal.core.tei import convert_to_tei
+from inspirehep.modules.hal.core.tei import (
+    _get_cache_key,
+    cache_tei,
+    convert_to_tei,
+    get_cached_tei,
+    prefetch_tei_context,
+)
 from inspirehep.modules.records.api import InspireRecord
 from inspirehep.utils.record_getter import get_db_record
 
@@ -71,3 +79,45 @@ def test_convert_to_tei_handles_preprints(app):
     result = etree.fromstring(convert_to_tei(record).encode('utf8'))
 
     assert schema.validate(result)
+
+
+def test_convert_to_tei_with_a_prefetched_context_does_not_query(cern_with_hal_id):
+    records = [get_db_record('lit', 1472986), get_db_record('lit', 1498589)]
+    expected = [convert_to_tei(record) for record in records]
+
+    context = prefetch_tei_context(records)
+    with patch('inspirehep.modules.hal.utils.get_es_records') as get_es_records, \
+            patch('inspirehep.modules.hal.utils.get_db_records') as get_db_records, \
+            patch('inspirehep.modules.hal.core.tei.detect') as detect:
+        result = [convert_to_tei(record, context) for record in records]
+
+        assert not get_es_records.called
+        assert not get_db_records.called
+        assert not detect.called
+
+    assert expected == result
+
+
+def test_cache_tei_is_keyed_by_record_revision(app):
+    record = get_db_record('lit', 1498589)
+    next_revision = InspireRecord(
+        dict(record), model=Mock(version_id=record.model.version_id + 1))
+    key = _get_cache_key(record)
+    current_cache.delete(key)
+
+    try:
+        assert get_cached_tei([record]) == {}
+
+        cache_tei(record, u'<TEI/>')
+        assert get_cached_tei([record]) == {1498589: u'<TEI/>'}
+        assert get_cached_tei([next_revision]) == {}
+    finally:
+        current_cache.delete(key)
+
+
+def test_cache_tei_ignores_records_without_revision(app):
+    record = {'control_number': 1498589}
+
+    cache_tei(record, u'<TEI/>')
+
+    assert get_cached_tei([record]) == {}
@@ -24,7 +24,11 @@
 
 from __future__ import absolute_import, division, print_function
 
+import json
+import os
+
 import mock
+import pkg_resources
 import pytest
 
 
@@ -42,6 +46,31 @@ def mock_config(app):
         yield
 
 
+def _load_hep_record(name):
+    return json.loads(pkg_resources.resource_string(
+        __name__, os.path.join('fixtures', name)))
+
+
+@pytest.fixture()
+def mock_hep_record():
+    """Serve record 4328 as it was when the cassettes were recorded."""
+    with mock.patch(
+        'inspirehep.modules.orcid.api.get_db_record',
+        return_value=_load_hep_record('hep_4328.json'),
+    ) as mocked:
+        yield mocked
+
+
+@pytest.fixture()
+def mock_hep_record_changed(mock_hep_record):
+    """Serve record 4328, then a version of it with a changed title."""
+    mock_hep_record.side_effect = [
+        _load_hep_record('hep_4328.json'),
+        _load_hep_record('hep_4328_changed.json'),
+    ]
+    yield mock_hep_record
+
+
 @pytest.fixture
 def vcr_config():
     return {
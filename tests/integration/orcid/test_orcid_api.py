@@ -43,7 +43,7 @@ def mock_logger():
 
 
 @pytest.mark.vcr()
-def test_push_record_with_orcid_new(mock_config, vcr_cassette):
+def test_push_record_with_orcid_new(mock_config, mock_hep_record, vcr_cassette):
     expected_put_code = '920107'
     expected_hash = 'sha1:2995c60336bce71134ebdc12fc50b1ccaf0fd7cd'
 
@@ -61,7 +61,7 @@ def test_push_record_with_orcid_new(mock_config, vcr_cassette):
 
 
 @pytest.mark.vcr()
-def test_push_record_with_orcid_update(mock_config, vcr_cassette):
+def test_push_record_with_orcid_update(mock_config, mock_hep_record, vcr_cassette):
     expected_put_code = '920107'
     expected_hash = 'sha1:2995c60336bce71134ebdc12fc50b1ccaf0fd7cd'
 
@@ -79,7 +79,7 @@ def test_push_record_with_orcid_update(mock_config, vcr_cassette):
 
 
 @pytest.mark.vcr()
-def test_push_record_with_orcid_dont_push_if_no_change(mock_config, vcr_cassette):
+def test_push_record_with_orcid_dont_push_if_no_change(mock_config, mock_hep_record, vcr_cassette):
     expected_put_code = '920107'
     expected_hash = 'sha1:2995c60336bce71134ebdc12fc50b1ccaf0fd7cd'
 
@@ -27,14 +27,27 @@ from __future__ import absolute_import, division, print_function
 import mock
 import pytest
 import re
+import threading
+import time
 
+from multiprocessing.pool import ThreadPool
 from redis import StrictRedis
 
 import inspirehep.modules.orcid.tasks as tasks
 from inspirehep.modules.orcid.tasks import (
     attempt_push,
+    drain_orcid_push_queue,
+    get_putcode_and_hash_from_redis,
     orcid_push,
-    recache_all_author_putcodes
+    recache_all_author_putcodes,
+    store_author_putcodes_in_redis,
+    store_record_in_redis,
+)
+from inspirehep.modules.orcid.utils import (
+    ORCID_PUSH_QUEUE_KEY,
+    ORCID_PUSH_QUEUE_STATS_KEY,
+    get_orcid_push_queue_stats,
+    schedule_orcid_push,
 )
 
 
@@ -43,9 +56,11 @@ def redis_setup(app):
     redis_url = app.config.get('CACHE_REDIS_URL')
     r = StrictRedis.from_url(redis_url)
 
-    r.hmset('orcidcache:0000-0002-2152-2169:1375491', {'putcode': '1001'})
-    r.hmset('orcidcache:0000-0002-2152-2169:524480', {'putcode': '1002'})
-    r.hmset('orcidcache:0000-0002-2152-2169:701585', {'putcode': '1003'})
+    r.hmset('orcidcache:0000-0002-2152-2169', {
+        '1375491:putcode': '1001',
+        '524480:putcode': '1002',
+        '701585:putcode': '1003',
+    })
 
     yield r
 
@@ -55,6 +70,7 @@ def redis_setup(app):
 @pytest.mark.vcr()
 def test_push_to_orcid_same_with_cache(
     mock_config,
+    mock_hep_record,
     vcr_cassette,
     redis_setup,
 ):
@@ -75,6 +91,7 @@ def test_push_to_orcid_same_with_cache(
 @pytest.mark.vcr()
 def test_push_to_orcid_update_with_cache(
     mock_config,
+    mock_hep_record_changed,
     vcr_cassette,
     redis_setup,
 ):
@@ -95,6 +112,7 @@ def test_push_to_orcid_update_with_cache(
 @pytest.mark.vcr()
 def test_push_to_orcid_update_no_cache(
     mock_config,
+    mock_hep_record,
     vcr_cassette,
     redis_setup,
 ):
@@ -112,6 +130,7 @@ def test_push_to_orcid_update_no_cache(
 @pytest.mark.vcr()
 def test_push_to_orcid_with_putcode_but_without_hash(
     mock_config,
+    mock_hep_record,
     vcr_cassette,
     redis_setup,
 ):
@@ -167,6 +186,144 @@ def test_push_to_orcid_verify_correct_being_pushed(
     attempt_push(_orcid, _recid, 'fake-token')
 
 
+def _push_with_workers(app, pushes, workers):
+    def _push(args):
+        with app.app_context():
+            attempt_push(*args)
+
+    pool = ThreadPool(workers)
+    try:
+        pool.map(_push, pushes)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def test_push_to_orcid_runs_pushes_of_different_records_concurrently(
+        app,
+        redis_setup,
+        monkeypatch,
+):
+    lock = threading.Lock()
+    all_running = threading.Event()
+    running = {'now': 0, 'max': 0}
+
+    def _push_record_with_orcid(recid, orcid, oauth_token, put_code=None, old_hash=None):
+        with lock:
+            running['now'] += 1
+            running['max'] = max(running['max'], running['now'])
+            if running['now'] == 3:
+                all_running.set()
+
+        # Wait for the other pushes, without hanging if they are serialized.
+        all_running.wait(5)
+
+        with lock:
+            running['now'] -= 1
+        return put_code, 'hash-{}'.format(recid)
+
+    monkeypatch.setattr(tasks, 'push_record_with_orcid', _push_record_with_orcid)
+
+    pushes = [
+        ('0000-0002-2152-2169', recid, 'fake-token')
+        for recid in (1375491, 524480, 701585)
+    ]
+
+    _push_with_workers(app, pushes, workers=3)
+
+    assert running['max'] == 3
+
+
+def test_concurrent_pushes_of_a_new_record_add_it_once(
+        app,
+        redis_setup,
+        monkeypatch,
+):
+    added = []
+
+    def _get_author_putcodes(orcid, oauth_token):
+        return [(recid, '1004') for recid in added]
+
+    def _push_record_with_orcid(recid, orcid, oauth_token, put_code=None, old_hash=None):
+        time.sleep(0.2)
+        if not put_code:
+            added.append(recid)
+            put_code = '1004'
+        return put_code, 'new-hash'
+
+    monkeypatch.setattr(tasks, 'get_author_putcodes', _get_author_putcodes)
+    monkeypatch.setattr(tasks, 'push_record_with_orcid', _push_record_with_orcid)
+
+    pushes = [('0000-0002-2152-2169', 4328, 'fake-token')] * 4
+    _push_with_workers(app, pushes, workers=4)
+
+    assert added == ['4328']
+    assert get_putcode_and_hash_from_redis('0000-0002-2152-2169', 4328) == ('1004', 'new-hash')
+
+
+def test_store_author_putcodes_in_redis_drops_stale_hashes(app, redis_setup):
+    orcid = '0000-0002-2152-2169'
+    store_record_in_redis(orcid, 1375491, '1001', 'hash-1')
+    store_record_in_redis(orcid, 524480, '1002', 'hash-2')
+
+    store_author_putcodes_in_redis(orcid, [('1375491', '1001'), ('524480', '2002')])
+
+    assert get_putcode_and_hash_from_redis(orcid, 1375491) == ('1001', 'hash-1')
+    assert get_putcode_and_hash_from_redis(orcid, 524480) == ('2002', None)
+
+
+@pytest.fixture
+def push_queue(app):
+    redis_url = app.config.get('CACHE_REDIS_URL')
+    r = StrictRedis.from_url(redis_url)
+
+    yield r
+
+    r.delete(ORCID_PUSH_QUEUE_KEY, ORCID_PUSH_QUEUE_STATS_KEY)
+
+
+def test_schedule_orcid_push_coalesces_pushes_of_the_same_record(push_queue):
+    assert schedule_orcid_push('0000-0002-2152-2169', 4328, 300)
+    assert not schedule_orcid_push('0000-0002-2152-2169', 4328, 300)
+    assert not schedule_orcid_push('0000-0002-2152-2169', 4328, 300)
+    assert schedule_orcid_push('0000-0002-2152-2169', 1375491, 300)
+
+    expected_stats = {'scheduled': 2, 'coalesced': 2, 'pushed': 0}
+
+    assert push_queue.zcard(ORCID_PUSH_QUEUE_KEY) == 2
+    assert get_orcid_push_queue_stats() == expected_stats
+
+
+@mock.patch('inspirehep.modules.orcid.tasks.get_push_access_tokens')
+@mock.patch('inspirehep.modules.orcid.tasks.orcid_push')
+def test_drain_orcid_push_queue_pushes_due_records_once(
+        mock_orcid_push,
+        mock_get_push_access_tokens,
+        push_queue,
+):
+    mock_get_push_access_tokens.return_value = [('0000-0002-2152-2169', 'fake-token')]
+
+    schedule_orcid_push('0000-0002-2152-2169', 4328, 0)
+    schedule_orcid_push('0000-0002-2152-2169', 4328, 0)
+    schedule_orcid_push('0000-0002-2152-2169', 1375491, 300)
+
+    drain_orcid_push_queue()
+    drain_orcid_push_queue()
+
+    mock_orcid_push.apply_async.assert_called_once_with(
+        queue='orcid_push',
+        kwargs={
+            'orcid': '0000-0002-2152-2169',
+            'rec_id': 4328,
+            'oauth_token': 'fake-token',
+        },
+    )
+    expected_stats = {'scheduled': 2, 'coalesced': 1, 'pushed': 1}
+
+    assert get_orcid_push_queue_stats() == expected_stats
+    assert push_queue.zcard(ORCID_PUSH_QUEUE_KEY) == 1
+
+
 def test_feature_flag_orcid_push_whitelist_regex_none():
     FEATURE_FLAG_ORCID_PUSH_WHITELIST_REGEX = '^$'
 
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+
+"""ORCID author sync tests, against a fake ORCID server."""
+
+from __future__ import absolute_import, division, print_function
+
+import copy
+import json
+import os
+import re
+import threading
+
+import mock
+import pkg_resources
+import pytest
+from orcid import MemberAPI
+from redis import StrictRedis
+from requests.exceptions import HTTPError
+from six.moves.BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+from inspirehep.modules.orcid.api import calculate_hash_for_record
+from inspirehep.modules.orcid.tasks import (
+    _get_retry_countdown,
+    get_putcode_and_hash_from_redis,
+    store_record_in_redis,
+    sync_author,
+)
+
+ORCID = '0000-0002-2169-2152'
+WORK_URL = re.compile(r'<work:url>http://inspirehep\.net/record/(\d+)</work:url>')
+
+
+class FakeOrcidHandler(BaseHTTPRequestHandler):
+    """Serve the few endpoints of the ORCID member API used for pushes."""
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body=None, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/orcid+json')
+        self.end_headers()
+        if body is not None:
+            self.wfile.write(json.dumps(body).encode('utf8'))
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length', 0))
+        return self.rfile.read(length).decode('utf8')
+
+    def do_GET(self):
+        self.server.requests.append(('GET', self.path))
+        works = self.server.works
+
+        summaries_path = '/v2.0/{}/works'.format(ORCID)
+        if self.path == summaries_path:
+            return self._reply(200, {'group': [
+                {'work-summary': [{
+                    'put-code': int(put_code),
+                    'source': {'source-client-id': {'path': work['client']}},
+                }]}
+                for put_code, work in sorted(works.items())
+            ]})
+
+        put_codes = self.path[len(summaries_path) + 1:].split(',')
+        return self._reply(200, {'bulk': [
+            {'work': {
+                'put-code': int(put_code),
+                'url': {'value': 'http://inspirehep.net/record/{}'.format(
+                    works[put_code]['recid'])},
+            }}
+            for put_code in put_codes
+        ]})
+
+    def do_POST(self):
+        self.server.requests.append(('POST', self.path))
+        if self.server.rate_limited:
+            return self._reply(429, headers={'Retry-After': '7'})
+
+        put_code = str(len(self.server.works) + 1)
+        self.server.works[put_code] = {
+            'client': 'CHANGE_ME',
+            'recid': WORK_URL.search(self._read_body()).group(1),
+        }
+        return self._reply(201, headers={
+            'Location': 'http://localhost/v2.0/{}/work/{}'.format(ORCID, put_code),
+        })
+
+    def do_PUT(self):
+        self.server.requests.append(('PUT', self.path))
+        self._read_body()
+        return self._reply(200, {})
+
+
+@pytest.fixture
+def fake_orcid(mock_config):
+    server = HTTPServer(('localhost', 0), FakeOrcidHandler)
+    server.requests = []
+    server.rate_limited = False
+    server.works = {
+        '1': {'client': 'CHANGE_ME', 'recid': '4328'},
+        '2': {'client': 'someone-else', 'recid': '1375491'},
+    }
+
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    api = MemberAPI('CHANGE_ME', 'CHANGE_ME', sandbox=True)
+    api._endpoint = 'http://localhost:{}'.format(server.server_port)
+
+    with mock.patch('inspirehep.modules.orcid.api._get_api', return_value=api):
+        yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def hep_records():
+    def _get_db_record(pid_type, recid):
+        record = copy.deepcopy(hep_record)
+        record['control_number'] = int(recid)
+        return record
+
+    hep_record = json.loads(pkg_resources.resource_string(
+        __name__, os.path.join('fixtures', 'hep_4328.json')))
+    with mock.patch(
+        'inspirehep.modules.orcid.api.get_db_record',
+        side_effect=_get_db_record,
+    ):
+        yield _get_db_record
+
+
+@pytest.fixture
+def redis_cleanup(app):
+    redis_url = app.config.get('CACHE_REDIS_URL')
+    r = StrictRedis.from_url(redis_url)
+
+    yield r
+
+    keys = r.keys('orcidcache:*')
+    if keys:
+        r.delete(*keys)
+
+
+@mock.patch('inspirehep.modules.orcid.tasks.get_literature_recids_for_orcid')
+def test_sync_author_pushes_only_changed_works(
+        mock_get_literature_recids_for_orcid,
+        fake_orcid,
+        hep_records,
+        redis_cleanup,
+):
+    mock_get_literature_recids_for_orcid.return_value = [4328, 1375491]
+    unchanged_hash = calculate_hash_for_record(hep_records('lit', 4328))
+    store_record_in_redis(ORCID, 4328, '1', unchanged_hash)
+
+    assert sync_author(ORCID, 'fake-token') == []
+
+    expected_requests = [
+        ('GET', '/v2.0/{}/works'.format(ORCID)),
+        ('GET', '/v2.0/{}/works/1'.format(ORCID)),
+        ('POST', '/v2.0/{}/work'.format(ORCID)),
+    ]
+    assert fake_orcid.requests == expected_requests
+    assert get_putcode_and_hash_from_redis(ORCID, 4328) == ('1', unchanged_hash)
+    assert get_putcode_and_hash_from_redis(ORCID, 1375491)[0] == '3'
+
+    del fake_orcid.requests[:]
+    assert sync_author(ORCID, 'fake-token') == []
+
+    expected_requests = [
+        ('GET', '/v2.0/{}/works'.format(ORCID)),
+        ('GET', '/v2.0/{}/works/1,3'.format(ORCID)),
+    ]
+    assert fake_orcid.requests == expected_requests
+
+
+@mock.patch('inspirehep.modules.orcid.tasks.get_literature_recids_for_orcid')
+def test_sync_author_updates_works_without_hash(
+        mock_get_literature_recids_for_orcid,
+        fake_orcid,
+        hep_records,
+        redis_cleanup,
+):
+    mock_get_literature_recids_for_orcid.return_value = [4328]
+
+    assert sync_author(ORCID, 'fake-token') == []
+
+    assert ('PUT', '/v2.0/{}/work/1'.format(ORCID)) in fake_orcid.requests
+    assert get_putcode_and_hash_from_redis(ORCID, 4328)[1] is not None
+
+
+@mock.patch('inspirehep.modules.orcid.tasks.get_literature_recids_for_orcid')
+def test_sync_author_stops_when_rate_limited(
+        mock_get_literature_recids_for_orcid,
+        fake_orcid,
+        hep_records,
+        redis_cleanup,
+):
+    mock_get_literature_recids_for_orcid.return_value = [1375491]
+    fake_orcid.rate_limited = True
+
+    with pytest.raises(HTTPError) as excinfo:
+        sync_author(ORCID, 'fake-token')
+
+    assert _get_retry_countdown(excinfo.value) == 7
@@ -40,6 +40,10 @@ from invenio_oauthclient.models import (
 from inspirehep.modules.migrator.tasks import migrate_and_insert_record
 from inspirehep.modules.records.api import InspireRecord
 from inspirehep.modules.search import LiteratureSearch
+from inspirehep.utils.journals import (
+    get_journal_index,
+    invalidate_journal_index,
+)
 from inspirehep.utils.record import get_title
 
 from utils import _delete_record
@@ -285,6 +289,16 @@ def test_orcid_push_triggered_on_create_record_with_multiple_authors_with_allow_
     assert mocked_Task.apply_async.call_count == 2
 
 
+@mock.patch('inspirehep.modules.records.receivers.schedule_orcid_push')
+@mock.patch('inspirehep.modules.records.receivers.Task')
+def test_orcid_push_scheduled_on_record_update_with_debounce_delay(mocked_Task, mocked_schedule_orcid_push, app, record, user_with_permission, enable_orcid_push_feature):
+    with mock.patch.dict(app.config, {'ORCID_PUSH_DEBOUNCE_DELAY': 300}):
+        record.commit()
+
+    mocked_Task.assert_not_called()
+    mocked_schedule_orcid_push.assert_called_once_with(user_with_permission['orcid'], 1608652, 300)
+
+
 def test_that_db_changes_are_mirrored_in_es(isolated_app):
     search = LiteratureSearch()
     json = {
@@ -327,3 +341,30 @@ def test_orcid_push_not_triggered_on_create_record_no_feat_flag(mocked_Task, app
     migrate_and_insert_record(raw_record, skip_files=True)
 
     mocked_Task.assert_not_called()
+
+
+def test_that_journal_changes_are_seen_by_the_journal_index(isolated_app):
+    json = {
+        '$schema': 'http://localhost:5000/schemas/records/journals.json',
+        '_collections': ['Journals'],
+        'journal_title': {'title': 'A Journal Of Receivers'},
+        'short_title': 'J.Receivers',
+    }
+
+    assert get_journal_index().get_by_title('A Journal Of Receivers') is None
+
+    try:
+        record = InspireRecord.create(json)
+        record.commit()
+
+        journal = get_journal_index().get_by_title('a journal of receivers')
+        assert journal['short_title'] == 'J.Receivers'
+
+        record['short_title'] = 'J.Receiv.'
+        record.commit()
+
+        journal = get_journal_index().get_by_title('a journal of receivers')
+        assert journal['short_title'] == 'J.Receiv.'
+    finally:
+        # The record is rolled back, the index must forget about it.
+        invalidate_journal_index()
@@ -23,6 +23,7 @@
 from __future__ import absolute_import, division, print_function
 
 import pytest
+from flask import current_app
 
 from invenio_search import current_search_client as es
 from invenio_workflows import (
@@ -33,6 +34,7 @@ from invenio_workflows import (
     workflow_object_class,
 )
 
+from inspirehep.modules.workflows.batch_matching import resolve_exact_matches
 from inspirehep.modules.workflows.tasks.matching import (
     has_same_source,
     match_non_completed_wf_in_holdingpen,
@@ -40,6 +42,8 @@ from inspirehep.modules.workflows.tasks.matching import (
     stop_matched_holdingpen_wfs,
 )
 
+from utils import _create_record, _delete_record
+
 
 @pytest.fixture
 def simple_record(app):
@@ -154,3 +158,36 @@ def test_stop_matched_holdingpen_wfs(app, simple_record):
     stopped_wf = workflow_object_class.get(obj_id)
     assert stopped_wf.status == ObjectStatus.COMPLETED
     assert stopped_wf.extra_data['stopped-by-wf'] == obj2_id
+
+
+@pytest.fixture
+def record_with_mixed_case_doi(app):
+    record = {
+        '$schema': 'http://localhost:5000/schemas/records/hep.json',
+        '_collections': ['Literature'],
+        'control_number': 1234567,
+        'document_type': ['article'],
+        'titles': [{'title': 'Mixed case DOI'}],
+        'dois': [{'value': '10.1103/PhysRevD.98.123'}],
+    }
+    _create_record(record)
+
+    yield record
+
+    _delete_record('lit', 1234567)
+    es.indices.refresh('records-hep')
+
+
+def test_resolve_exact_matches_matches_dois_regardless_of_case(record_with_mixed_case_doi):
+    records = [
+        {'dois': [{'value': '10.1103/PhysRevD.98.123'}]},
+        {'dois': [{'value': '10.1103/physrevd.98.123'}]},
+    ]
+
+    expected = {
+        ('dois.value.raw', '10.1103/PhysRevD.98.123'): [1234567],
+        ('dois.value.raw', '10.1103/physrevd.98.123'): [1234567],
+    }
+    result = resolve_exact_matches(records, current_app.config['EXACT_MATCH'])
+
+    assert expected == result
@@ -22,13 +22,22 @@
 
 from __future__ import absolute_import, division, print_function
 
+from contextlib import contextmanager
+
 import pytest
-from sqlalchemy import inspect, text
+from mock import patch
+from sqlalchemy import event, inspect, text
 
 from invenio_db import db
 from invenio_db.utils import drop_alembic_version_table
 
 from inspirehep.factory import create_app
+from inspirehep.modules.literaturesuggest.normalizers import (
+    check_book_existence,
+    check_journal_existence,
+)
+from inspirehep.modules.refextract.tasks import create_journal_kb_file
+from inspirehep.utils.journals import _load_journals
 
 
 @pytest.fixture()
@@ -50,6 +59,25 @@ def test_downgrade(alembic_app):
     ext = alembic_app.extensions['invenio-db']
     ext.alembic.stamp()
 
+    # 7c2f1e9d8a4b
+
+    ext.alembic.downgrade(target='f6b3a1c9d2e4')
+
+    assert 'ix_workflows_pending_record_record_id' not in _get_indexes('workflows_pending_record')
+
+    # f6b3a1c9d2e4
+
+    ext.alembic.downgrade(target='e3a5c4a1ed72')
+
+    assert 'idxjournalshorttitle' not in _get_indexes('records_metadata')
+    assert 'idxjournaltitletitle' not in _get_indexes('records_metadata')
+
+    # e3a5c4a1ed72
+
+    ext.alembic.downgrade(target='402af3fbf68b')
+
+    assert 'hal_push_state' not in _get_table_names()
+
     # 402af3fbf68b
 
     ext.alembic.downgrade(target='d99c70308006')
@@ -121,6 +149,74 @@ def test_upgrade(alembic_app):
     assert 'legacy_records_mirror' in _get_table_names()
     assert 'legacy_records_mirror_recid_seq' in _get_sequences()
 
+    # e3a5c4a1ed72
+
+    ext.alembic.upgrade(target='e3a5c4a1ed72')
+
+    assert 'hal_push_state' in _get_table_names()
+    assert 'ix_hal_push_state_status' in _get_indexes('hal_push_state')
+    assert 'ix_hal_push_state_updated' in _get_indexes('hal_push_state')
+
+    # f6b3a1c9d2e4
+
+    ext.alembic.upgrade(target='f6b3a1c9d2e4')
+
+    assert 'idxjournalshorttitle' in _get_indexes('records_metadata')
+    assert 'idxjournaltitletitle' in _get_indexes('records_metadata')
+
+    # 7c2f1e9d8a4b
+
+    ext.alembic.upgrade(target='7c2f1e9d8a4b')
+
+    assert 'ix_workflows_pending_record_record_id' in _get_indexes('workflows_pending_record')
+
+
+@patch('inspirehep.modules.refextract.tasks.KbWriter')
+def test_records_metadata_lookups_use_indexes(mock_kb_writer, alembic_app):
+    ext = alembic_app.extensions['invenio-db']
+    ext.alembic.stamp()
+    ext.alembic.downgrade(target='fddb3cfe7a9c')
+    ext.alembic.upgrade()
+
+    with _capture_statements() as statements:
+        list(check_book_existence('Quantum Field Theory'))
+        list(check_journal_existence('Physical Review'))
+        _load_journals()
+        create_journal_kb_file()
+
+    assert len(statements) == 5
+
+    for statement, parameters in statements:
+        plan = _explain(statement, parameters)
+
+        assert 'Index Scan' in plan
+        assert 'Seq Scan on records_metadata' not in plan
+
+
+@contextmanager
+def _capture_statements():
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if 'records_metadata' in statement:
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', _capture)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', _capture)
+
+
+def _explain(statement, parameters):
+    """Return the plan of a query on a table too small for the planner to
+    prefer an index scan, unless sequential scans are discouraged."""
+    cursor = db.session.connection().connection.cursor()
+    cursor.execute('SET LOCAL enable_seqscan = off')
+    cursor.execute('EXPLAIN ' + statement, parameters)
+
+    return '\n'.join(row[0] for row in cursor.fetchall())
+
 
 def _get_indexes(tablename):
     query = text('''
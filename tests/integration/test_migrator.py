@@ -28,6 +28,7 @@ import zlib
 
 import pytest
 from flask import current_app
+from mock import patch
 from redis import StrictRedis
 
 from inspirehep.modules.migrator.models import LegacyRecordsMirror
@@ -148,3 +149,24 @@ def test_continuous_migration_handles_record_updates(app, record_1502656_and_upd
     result = LegacyRecordsMirror.query.get(1502656).marcxml
 
     assert expected == result
+
+
+def test_continuous_migration_handles_record_updates_in_different_batches(app, record_1502656_and_update):
+    r = StrictRedis.from_url(current_app.config.get('CACHE_REDIS_URL'))
+
+    with patch.dict(current_app.config, {'RECORDS_MIGRATION_BATCH_SIZE': 1}):
+        continuous_migration()
+
+    assert r.lrange('legacy_records', 0, 0) == []
+
+    record = get_db_record('lit', 1502656)
+
+    expected = 1
+    result = len(record['authors'])
+
+    assert expected == result
+
+    expected = record_1502656_and_update[1]
+    result = LegacyRecordsMirror.query.get(1502656).marcxml
+
+    assert expected == result
@@ -26,7 +26,12 @@ import mock
 import requests_mock
 from flask import current_app
 
-from inspirehep.modules.pidstore.providers.recid import InspireRecordIdProvider
+from invenio_pidstore.models import RecordIdentifier
+
+from inspirehep.modules.pidstore.providers.recid import (
+    InspireRecordIdProvider,
+    get_recid_pool,
+)
 
 
 def test_getting_next_recid_from_legacy(app):
@@ -51,3 +56,54 @@ def test_getting_next_recid_from_legacy(app):
             provider = InspireRecordIdProvider.create(**args)
 
             assert str(provider.pid.pid_value) == '3141592'
+
+
+def test_reserving_recids_from_legacy_in_blocks(app):
+    extra_config = {
+        'LEGACY_PID_PROVIDER': 'http://server/batchuploader/allocaterecords',
+        'PIDSTORE_RECID_RESERVATION_SIZE': 3,
+    }
+
+    with mock.patch.dict(current_app.config, extra_config):
+        with requests_mock.Mocker() as requests_mocker:
+            requests_mocker.register_uri(
+                'GET', 'http://server/batchuploader/allocaterecords?count=3',
+                text='[2718281, 2718282, 2718283]',
+                headers={'content-type': 'application/json'},
+                status_code=200,
+            )
+
+            pid_values = [
+                int(InspireRecordIdProvider.create(pid_type='lit').pid.pid_value)
+                for _ in range(3)
+            ]
+
+            assert [2718281, 2718282, 2718283] == pid_values
+            assert requests_mocker.call_count == 1
+            assert RecordIdentifier.query.filter(
+                RecordIdentifier.recid.in_(pid_values)).count() == 3
+
+
+def test_reserving_recids_from_the_sequence_in_blocks(app):
+    get_recid_pool().clear()
+
+    with mock.patch.dict(current_app.config, {'PIDSTORE_RECID_RESERVATION_SIZE': 3}):
+        pid_values = [
+            int(InspireRecordIdProvider.create(pid_type='lit').pid.pid_value)
+            for _ in range(3)
+        ]
+
+        assert pid_values == list(range(pid_values[0], pid_values[0] + 3))
+        assert RecordIdentifier.next() > pid_values[-1]
+
+
+def test_reserving_recids_from_the_sequence_skips_inserted_recids(app):
+    get_recid_pool().clear()
+
+    with mock.patch.dict(current_app.config, {'PIDSTORE_RECID_RESERVATION_SIZE': 3}):
+        next_recid = RecordIdentifier.next() + 1
+        RecordIdentifier.insert(next_recid)
+
+        pid_value = int(InspireRecordIdProvider.create(pid_type='lit').pid.pid_value)
+
+        assert pid_value > next_recid
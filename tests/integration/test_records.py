@@ -25,6 +25,7 @@ from __future__ import absolute_import, division, print_function
 import copy
 from jsonschema import ValidationError
 import pytest
+import requests_mock
 import StringIO
 from mock import patch, mock_open
 
@@ -42,7 +43,7 @@ from inspire_dojson.utils import get_recid_from_ref
 from inspire_schemas.api import validate
 from inspirehep.modules.records.api import InspireRecord
 from inspirehep.modules.records.tasks import merge_merged_records, update_refs
-from inspirehep.utils.record_getter import get_db_record
+from inspirehep.utils.record_getter import get_db_record, get_es_record
 
 from utils import _delete_record
 
@@ -315,6 +316,18 @@ def test_merged_records_stay_merged(api_client, merged_records):
     assert api_client.get('/literature/222').status_code == 301
 
 
+@patch('inspirehep.modules.records.tasks.group')
+@patch('inspirehep.modules.records.tasks.update_refs')
+def test_merge_merged_records_updates_references(mock_update_refs, mock_group, api_client, merged_records):
+    merge_merged_records()
+
+    mock_update_refs.si.assert_called_once_with(
+        'http://localhost:5000/api/literature/222',
+        'http://localhost:5000/api/literature/111',
+    )
+    assert mock_group.return_value.apply_async.called
+
+
 def test_merge_record_with_non_existing_pid(api_client, merged_records):
     def get_pid_entry(recid):
         return PersistentIdentifier.query.filter_by(pid_value=str(recid)).one_or_none()
@@ -370,6 +383,29 @@ def test_references_can_be_updated(app, records_to_be_merged):
     assert expected == result
 
 
+def test_update_refs_records_a_version_and_reindexes(app, records_to_be_merged):
+    old_ref = 'http://localhost:5000/api/literature/222'
+    new_ref = 'http://localhost:5000/api/literature/111'
+    revision_id = get_db_record('lit', 333).revision_id
+
+    with patch.dict(app.config, {'INSPIRE_REF_UPDATER_CHUNK_SIZE': 1}):
+        update_refs.delay(old_ref, new_ref)
+    es.indices.refresh('records-hep')
+
+    pointing_record = get_db_record('lit', 333)
+    assert pointing_record.revision_id == revision_id + 1
+    assert pointing_record.revisions[revision_id][
+        'accelerator_experiments'][0]['record']['$ref'] == old_ref
+
+    pointing_es_record = get_es_record('lit', 333)
+    assert get_value(
+        pointing_es_record, 'accelerator_experiments[0].record.$ref') == new_ref
+
+    update_refs.delay(old_ref, new_ref)
+
+    assert get_db_record('lit', 333).revision_id == revision_id + 1
+
+
 def test_records_files_attached_correctly(isolated_app):
     record_json = {
         '$schema': 'http://localhost:5000/schemas/records/hep.json',
@@ -457,10 +493,11 @@ def test_update_handles_documents(isolated_app):
     updated_json = record_json
     updated_json.update(copy.deepcopy(update_to_record))
 
-    with patch(
-        'inspirehep.modules.records.api.fsopen',
-        mock_open(read_data=expected_file_content),
-    ):
+    with requests_mock.Mocker() as requests_mocker:
+        requests_mocker.register_uri(
+            'GET', 'http://www.mdpi.com/2218-1997/3/1/24/pdf',
+            text=expected_file_content,
+        )
         record.update(updated_json)
 
     assert expected_key in record.files.keys
@@ -536,10 +573,11 @@ def test_update_handles_figures(isolated_app):
     updated_json = record_json
     updated_json.update(copy.deepcopy(update_to_record))
 
-    with patch(
-        'inspirehep.modules.records.api.fsopen',
-        mock_open(read_data=expected_file_content),
-    ):
+    with requests_mock.Mocker() as requests_mocker:
+        requests_mocker.register_uri(
+            'GET', 'http://www.mdpi.com/2218-1997/3/1/24/png',
+            text=expected_file_content,
+        )
         record.update(updated_json)
 
     assert expected_key in record.files.keys
@@ -602,10 +640,11 @@ def test_update_with_only_new(isolated_app):
     record.clear()
     record_json.update(copy.deepcopy(update_to_record))
 
-    with patch(
-        'inspirehep.modules.records.api.fsopen',
-        mock_open(read_data=doc2_expected_file_content),
-    ):
+    with requests_mock.Mocker() as requests_mocker:
+        requests_mocker.register_uri(
+            'GET', 'http://www.mdpi.com/2218-1997/3/1/24/pdf',
+            text=doc2_expected_file_content,
+        )
         record.update(record_json, only_new=True)
 
     assert len(record['documents']) == len(update_to_record['documents'])
@@ -855,8 +894,12 @@ def test_create_with_skip_files_param_overrides_records_skip_files_conf_and_does
     with patch.dict(isolated_app.config, {'RECORDS_SKIP_FILES': True}):
         with patch(
             'inspirehep.modules.records.api.fsopen',
-            mock_open(read_data=expected_figure_file_content),
-        ):
+            mock_open(read_data=expected_document_file_content),
+        ), requests_mock.Mocker() as requests_mocker:
+            requests_mocker.register_uri(
+                'GET', 'http://www.mdpi.com/2218-1997/3/1/24/png',
+                text=expected_figure_file_content,
+            )
             record = InspireRecord.create(record_json, skip_files=False)
 
     assert len(record.files) == 2
@@ -51,6 +51,14 @@ def fake_download_file(workflow, name, url):
     raise Exception("Download file not mocked!")
 
 
+def fake_download_files(workflow, files):
+    """Mock download_files_to_workflow func."""
+    return {
+        name: fake_download_file(workflow, name, url)
+        for name, url in files
+    }
+
+
 def fake_beard_api_request(url, data):
     """Mock json_api_request func."""
     return {
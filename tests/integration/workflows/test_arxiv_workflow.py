@@ -51,6 +51,7 @@ from calls import (
 from mocks import (
     fake_beard_api_request,
     fake_download_file,
+    fake_download_files,
     fake_magpie_api_request,
 )
 from utils import get_halted_workflow
@@ -71,8 +72,8 @@ def enable_fuzzy_matcher(workflow_app):
     'inspirehep.modules.workflows.tasks.arxiv.is_pdf_link'
 )
 @mock.patch(
-    'inspirehep.modules.workflows.tasks.actions.download_file_to_workflow',
-    side_effect=fake_download_file,
+    'inspirehep.modules.workflows.tasks.actions.download_files_to_workflow',
+    side_effect=fake_download_files,
 )
 @mock.patch(
     'inspirehep.modules.workflows.tasks.beard.json_api_request',
@@ -129,8 +130,8 @@ def test_harvesting_arxiv_workflow_manual_rejected(
     side_effect=fake_download_file,
 )
 @mock.patch(
-    'inspirehep.modules.workflows.tasks.actions.download_file_to_workflow',
-    side_effect=fake_download_file,
+    'inspirehep.modules.workflows.tasks.actions.download_files_to_workflow',
+    side_effect=fake_download_files,
 )
 @mock.patch(
     'inspirehep.modules.workflows.tasks.arxiv.is_pdf_link',
@@ -183,8 +184,8 @@ def test_harvesting_arxiv_workflow_core_record_auto_accepted(
     side_effect=fake_download_file,
 )
 @mock.patch(
-    'inspirehep.modules.workflows.tasks.actions.download_file_to_workflow',
-    side_effect=fake_download_file,
+    'inspirehep.modules.workflows.tasks.actions.download_files_to_workflow',
+    side_effect=fake_download_files,
 )
 @mock.patch(
     'inspirehep.modules.workflows.utils.download_file_to_workflow',
@@ -261,8 +262,8 @@ def test_harvesting_arxiv_workflow_manual_accepted(
     return_value=True
 )
 @mock.patch(
-    'inspirehep.modules.workflows.tasks.actions.download_file_to_workflow',
-    side_effect=fake_download_file,
+    'inspirehep.modules.workflows.tasks.actions.download_files_to_workflow',
+    side_effect=fake_download_files,
 )
 @mock.patch(
     'inspirehep.modules.workflows.tasks.beard.json_api_request',
@@ -323,8 +324,8 @@ def test_match_in_holdingpen_stops_pending_wf(
     return_value=True
 )
 @mock.patch(
-    'inspirehep.modules.workflows.tasks.actions.download_file_to_workflow',
-    side_effect=fake_download_file,
+    'inspirehep.modules.workflows.tasks.actions.download_files_to_workflow',
+    side_effect=fake_download_files,
 )
 @mock.patch(
     'inspirehep.modules.workflows.tasks.beard.json_api_request',
@@ -378,8 +379,8 @@ def test_match_in_holdingpen_previously_rejected_wf_stop(
     return_value=True
 )
 @mock.patch(
-    'inspirehep.modules.workflows.tasks.actions.download_file_to_workflow',
-    side_effect=fake_download_file,
+    'inspirehep.modules.workflows.tasks.actions.download_files_to_workflow',
+    side_effect=fake_download_files,
 )
 @mock.patch(
     'inspirehep.modules.workflows.tasks.beard.json_api_request',
@@ -763,8 +764,8 @@ def test_validation_error_callback_with_malformed_with_invalid_types(workflow_ap
     side_effect=fake_download_file,
 )
 @mock.patch(
-    'inspirehep.modules.workflows.tasks.actions.download_file_to_workflow',
-    side_effect=fake_download_file,
+    'inspirehep.modules.workflows.tasks.actions.download_files_to_workflow',
+    side_effect=fake_download_files,
 )
 @mock.patch(
     'inspirehep.modules.workflows.tasks.arxiv.is_pdf_link',
@@ -822,8 +823,8 @@ def test_keep_previously_rejected_from_fully_harvested_category_is_auto_approved
     side_effect=fake_download_file,
 )
 @mock.patch(
-    'inspirehep.modules.workflows.tasks.actions.download_file_to_workflow',
-    side_effect=fake_download_file,
+    'inspirehep.modules.workflows.tasks.actions.download_files_to_workflow',
+    side_effect=fake_download_files,
 )
 @mock.patch(
     'inspirehep.modules.workflows.tasks.arxiv.is_pdf_link',
@@ -22,11 +22,15 @@
 
 from __future__ import absolute_import, division, print_function
 
+import uuid
+
 import pytest
 
 from invenio_db import db
+from invenio_records.models import RecordMetadata
 
 from inspirehep.modules.records.api import InspireRecord
+from inspirehep.modules.workflows.models import WorkflowsRecordSources
 from inspirehep.modules.workflows.utils import (
     insert_wf_record_source,
     read_all_wf_record_sources,
@@ -110,3 +114,76 @@ def test_read_all_wf_record_sources(dummy_record):
 
     entries = read_all_wf_record_sources(dummy_record.id)
     assert len(entries) == 2
+
+
+def test_insert_wf_record_source_is_written_on_commit(dummy_record):
+    insert_wf_record_source(
+        json={'titles': [{'title': 'foo'}]},
+        record_uuid=dummy_record.id,
+        source='arXiv'
+    )
+    insert_wf_record_source(
+        json={'titles': [{'title': 'bar'}]},
+        record_uuid=dummy_record.id,
+        source='arXiv'
+    )
+
+    assert WorkflowsRecordSources.query.count() == 0
+
+    db.session.commit()
+
+    entry = WorkflowsRecordSources.query.one()
+    assert entry.source == 'arxiv'
+    assert entry.json == {'titles': [{'title': 'bar'}]}
+
+
+def test_insert_wf_record_source_of_a_record_not_flushed_yet(workflow_app):
+    record_uuid = uuid.uuid4()
+    db.session.add(RecordMetadata(id=record_uuid, json={'titles': [{'title': 'foo'}]}))
+
+    insert_wf_record_source(
+        json={'titles': [{'title': 'foo'}]},
+        record_uuid=record_uuid,
+        source='arXiv'
+    )
+    db.session.commit()
+
+    entry = read_wf_record_source(record_uuid=record_uuid, source='arXiv')
+    assert entry.json == {'titles': [{'title': 'foo'}]}
+
+    db.session.delete(entry)
+    db.session.delete(RecordMetadata.query.get(record_uuid))
+    db.session.commit()
+
+
+def test_read_wf_record_source_sees_buffered_sources(dummy_record):
+    insert_wf_record_source(
+        json=dummy_record,
+        record_uuid=dummy_record.id,
+        source='arXiv'
+    )
+    db.session.commit()
+    read_wf_record_source(record_uuid=dummy_record.id, source='arXiv')
+
+    insert_wf_record_source(
+        json={'titles': [{'title': 'bar'}]},
+        record_uuid=dummy_record.id,
+        source='arXiv'
+    )
+
+    retrieved_root = read_wf_record_source(record_uuid=dummy_record.id, source='arXiv')
+    assert {'titles': [{'title': 'bar'}]} == retrieved_root.json
+
+
+def test_insert_wf_record_source_is_discarded_on_rollback(dummy_record):
+    db.session.commit()
+
+    insert_wf_record_source(
+        json=dummy_record,
+        record_uuid=dummy_record.id,
+        source='arXiv'
+    )
+    db.session.rollback()
+    db.session.commit()
+
+    assert read_wf_record_source(record_uuid=dummy_record.id, source='arXiv') is None
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+
+from __future__ import absolute_import, division, print_function
+
+import json
+
+import mock
+import pytest
+
+from invenio_db import db
+from invenio_workflows import workflow_object_class
+
+from inspirehep.modules.workflows.models import WorkflowsPendingRecord
+
+
+@pytest.fixture
+def pending_workflows(workflow_app):
+    workflow_objects = []
+    for recid in (111, 222):
+        workflow_object = workflow_object_class.create(
+            data={},
+            id_user=1,
+            data_type='hep',
+        )
+        workflow_object.save()
+        db.session.add(WorkflowsPendingRecord(
+            workflow_id=workflow_object.id,
+            record_id=recid,
+        ))
+        workflow_objects.append(workflow_object)
+    db.session.commit()
+
+    yield workflow_objects
+
+
+@mock.patch('inspirehep.modules.workflows.views.group')
+def test_webcoll_callback_continues_all_pending_workflows_at_once(mock_group, workflow_app, pending_workflows):
+    client = workflow_app.test_client()
+
+    response = client.post(
+        '/callback/workflows/webcoll',
+        data={'recids': [111, 222, 333]},
+        content_type='application/x-www-form-urlencoded',
+    )
+
+    assert response.status_code == 200
+
+    expected = {
+        '111': {
+            'success': True,
+            'message': 'Successfully restarted workflow %s' % pending_workflows[0].id,
+        },
+        '222': {
+            'success': True,
+            'message': 'Successfully restarted workflow %s' % pending_workflows[1].id,
+        },
+    }
+    result = json.loads(response.data)
+
+    assert expected == result
+
+    assert WorkflowsPendingRecord.query.count() == 0
+
+    for workflow_object, recid in zip(pending_workflows, (111, 222)):
+        workflow_object = workflow_object_class.get(workflow_object.id)
+
+        assert workflow_object.extra_data['recid'] == recid
+        assert workflow_object.data['control_number'] == recid
+
+    tasks = list(mock_group.call_args[0][0])
+    expected_args = [
+        (pending_workflows[0].id, 'continue_next'),
+        (pending_workflows[1].id, 'continue_next'),
+    ]
+
+    assert expected_args == [tuple(task.args) for task in tasks]
+    mock_group.return_value.apply_async.assert_called_once_with()
+
+
+def test_webcoll_callback_ignores_records_that_are_not_pending(workflow_app):
+    client = workflow_app.test_client()
+
+    response = client.post(
+        '/callback/workflows/webcoll',
+        data={'recids': [333]},
+        content_type='application/x-www-form-urlencoded',
+    )
+
+    assert response.status_code == 200
+    assert json.loads(response.data) == {}
@@ -25,7 +25,7 @@ from __future__ import absolute_import, division, print_function
 from flask import current_app
 from mock import patch
 
-from inspirehep.modules.hal.core.sword import _new_connection
+from inspirehep.modules.hal.core.sword import _new_connection, get_connection
 
 
 def test_new_connection_is_secure_by_default():
@@ -41,3 +41,19 @@ def test_new_connection_can_be_configured_to_be_insecure():
         connection = _new_connection()
 
         assert connection.h.h.disable_ssl_certificate_validation
+
+
+def test_get_connection_reuses_the_connection():
+    connection = get_connection()
+
+    assert get_connection() is connection
+    assert not connection.history
+    assert not connection.keep_cache
+
+
+def test_get_connection_creates_a_new_connection_for_other_credentials():
+    connection = get_connection()
+    config = {'HAL_USER_NAME': 'another_hal_user_name'}
+
+    with patch.dict(current_app.config, config):
+        assert get_connection() is not connection
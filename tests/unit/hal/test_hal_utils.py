@@ -31,6 +31,7 @@ from inspirehep.modules.hal.utils import (
     get_conference_country,
     get_conference_end_date,
     get_conference_record,
+    get_conference_records,
     get_conference_start_date,
     get_conference_title,
     get_divulgation,
@@ -145,6 +146,44 @@ def test_get_conference_record(replace_refs):
     assert expected == result['control_number']
 
 
+@patch('inspirehep.modules.hal.utils.get_db_records')
+def test_get_conference_records(get_db_records):
+    schema = load_schema('hep')
+    publication_info_schema = schema['properties']['publication_info']
+
+    records = [
+        {
+            'publication_info': [
+                {
+                    'conference_record': {
+                        '$ref': 'http://localhost:5000/api/conferences/972464',
+                    },
+                },
+            ],
+        },
+        {
+            'publication_info': [
+                {
+                    'conference_record': {
+                        '$ref': 'http://localhost:5000/api/conferences/972464',
+                    },
+                },
+            ],
+        },
+        {},
+    ]
+    for record in records[:2]:
+        assert validate(record['publication_info'], publication_info_schema) is None
+
+    get_db_records.return_value = iter([{'control_number': 972464}])
+
+    expected = {972464: {'control_number': 972464}}
+    result = get_conference_records(records)
+
+    assert expected == result
+    get_db_records.assert_called_once_with('con', {972464})
+
+
 def test_get_conference_start_date():
     schema = load_schema('conferences')
     subschema = schema['properties']['opening_date']
@@ -24,8 +24,9 @@ from __future__ import absolute_import, division, print_function
 
 import os
 import pkg_resources
+import zlib
 
-from inspirehep.modules.migrator.tasks import read_file
+from inspirehep.modules.migrator.tasks import get_last_versions, read_file
 
 
 def test_read_file_reads_xml_file_correctly():
@@ -64,3 +65,34 @@ def test_read_file_reads_prodsync_file_correctly():
     result = list(read_file(prodsync_file))
 
     assert expected == result
+
+
+def test_get_last_versions_keeps_the_last_version_of_each_record():
+    raw_records = [
+        zlib.compress('<record><controlfield tag="001">1</controlfield>foo</record>'),
+        zlib.compress('<record><controlfield tag="001">2</controlfield>bar</record>'),
+        zlib.compress('<record><controlfield tag="001">1</controlfield>baz</record>'),
+    ]
+
+    expected = [
+        (2, '<record><controlfield tag="001">2</controlfield>bar</record>'),
+        (1, '<record><controlfield tag="001">1</controlfield>baz</record>'),
+    ]
+    result = [
+        (prod_record.recid, prod_record.marcxml)
+        for prod_record in get_last_versions(raw_records)
+    ]
+
+    assert expected == result
+
+
+def test_get_last_versions_skips_records_without_recid():
+    raw_records = [
+        zlib.compress('<record>foo</record>'),
+        zlib.compress('<record><controlfield tag="001">1</controlfield>bar</record>'),
+    ]
+
+    expected = [1]
+    result = [prod_record.recid for prod_record in get_last_versions(raw_records)]
+
+    assert expected == result
@@ -169,6 +169,29 @@ def test_add_citation():
     assert xml_compare(result, expected)
 
 
+def test_add_citation_to_existing_record():
+    expected = xml_parse("""
+    <work:work xmlns:common="http://www.orcid.org/ns/common" xmlns:work="http://www.orcid.org/ns/work">
+        <work:journal-title>Nucl.Phys.</work:journal-title>
+        <work:citation>
+            <work:citation-type>bibtex</work:citation-type>
+            <work:citation-value>@article{...}</work:citation-value>
+        </work:citation>
+        <work:type>journal-article</work:type>
+    </work:work>
+    """)
+
+    existing = OrcidBuilder()
+    existing.add_journal_title("Nucl.Phys.")
+    existing.add_type("journal-article")
+
+    builder = OrcidBuilder(existing.get_xml())
+    builder.add_citation("bibtex", "@article{...}")
+    result = builder.get_xml()
+
+    assert xml_compare(result, expected)
+
+
 def test_add_country_code():
     expected = xml_parse("""
     <work:work xmlns:common="http://www.orcid.org/ns/common" xmlns:work="http://www.orcid.org/ns/work">
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+
+from __future__ import absolute_import, division, print_function
+
+import mock
+from flask import current_app
+from requests import Response
+from requests.exceptions import HTTPError
+
+from inspirehep.modules.orcid.tasks import (
+    _get_retry_countdown,
+    orcid_sync_author,
+)
+
+
+def _rate_limited_error(retry_after=None):
+    response = Response()
+    response.status_code = 429
+    if retry_after is not None:
+        response.headers['Retry-After'] = retry_after
+    return HTTPError(response=response)
+
+
+def test_get_retry_countdown_with_seconds():
+    assert _get_retry_countdown(_rate_limited_error('7')) == 7
+
+
+@mock.patch('inspirehep.modules.orcid.tasks.time.time', return_value=1445412480)
+def test_get_retry_countdown_with_an_http_date(mock_time):
+    error = _rate_limited_error('Wed, 21 Oct 2015 07:30:00 GMT')
+
+    assert _get_retry_countdown(error) == 120
+
+
+def test_get_retry_countdown_falls_back_to_the_default():
+    assert _get_retry_countdown(_rate_limited_error('soon')) == 60
+    assert _get_retry_countdown(_rate_limited_error()) == 60
+
+
+def test_get_retry_countdown_when_not_rate_limited():
+    assert _get_retry_countdown(HTTPError()) == 300
+
+
+@mock.patch.object(orcid_sync_author, 'retry')
+@mock.patch.object(orcid_sync_author, 'apply_async')
+@mock.patch('inspirehep.modules.orcid.tasks.sync_author')
+def test_orcid_sync_author_is_queued_again_when_rate_limited(mock_sync_author, mock_apply_async, mock_retry):
+    mock_sync_author.side_effect = _rate_limited_error('7')
+    config = {'FEATURE_FLAG_ORCID_PUSH_WHITELIST_REGEX': '.*'}
+
+    with mock.patch.dict(current_app.config, config):
+        orcid_sync_author('0000-0002-2169-2152', 'fake-token')
+
+    mock_apply_async.assert_called_once_with(
+        queue=None,
+        countdown=7,
+        kwargs={
+            'orcid': '0000-0002-2169-2152',
+            'oauth_token': 'fake-token',
+        },
+    )
+    mock_retry.assert_not_called()
@@ -33,6 +33,7 @@ from lxml import etree
 from sqlalchemy.orm.exc import NoResultFound
 
 from inspirehep.modules.orcid.utils import (
+    RateLimiter,
     _split_lists,
     canonicalize_xml_element,
     log_time,
@@ -183,3 +184,25 @@ def test_log_time_fails():
 
     assert mock_logger.message.startswith('measured_function took ')
     assert mock_logger.message.endswith(' to fail')
+
+
+@mock.patch('inspirehep.modules.orcid.utils.time')
+def test_rate_limiter_spaces_calls(mock_time):
+    mock_time.time.return_value = 100.0
+
+    limiter = RateLimiter()
+    for _ in range(3):
+        limiter.wait(4)
+
+    assert mock_time.sleep.call_args_list == [mock.call(0.25), mock.call(0.5)]
+
+
+@mock.patch('inspirehep.modules.orcid.utils.time')
+def test_rate_limiter_does_not_limit_without_rate(mock_time):
+    mock_time.time.return_value = 100.0
+
+    limiter = RateLimiter()
+    for _ in range(3):
+        limiter.wait(None)
+
+    mock_time.sleep.assert_not_called()
@@ -23,6 +23,7 @@
 from __future__ import absolute_import, division, print_function
 
 from inspirehep.modules.pidstore.utils import (
+    _get_pid_type_endpoint_map,
     get_endpoint_from_pid_type,
     get_pid_type_from_endpoint,
     get_pid_type_from_schema,
@@ -61,3 +62,7 @@ def test_get_pid_from_schema_supports_relative_urls():
 def test_get_pid_types_from_endpoint(app):
     pid_types = set(('lit', 'con', 'exp', 'jou', 'aut', 'job', 'ins'))
     assert pid_types.issubset(get_pid_types_from_endpoints())
+
+
+def test_get_pid_type_endpoint_map_is_computed_once(app):
+    assert _get_pid_type_endpoint_map() is _get_pid_type_endpoint_map()
@@ -662,6 +662,22 @@ def test_populate_recid_from_ref():
     assert json_dict['embedded_record']['recid'] == 5
 
 
+def test_populate_recid_from_ref_handles_a_record_with_many_references():
+    json_dict = {
+        'references': [
+            {'record': {'$ref': 'http://localhost:5000/api/literature/%d' % i}}
+            for i in range(3000)
+        ],
+    }
+
+    populate_recid_from_ref(None, json_dict)
+
+    expected = list(range(3000))
+    result = [reference['recid'] for reference in json_dict['references']]
+
+    assert expected == result
+
+
 def test_populate_recid_from_ref_handles_deleted_records():
     json_dict = {
         'deleted_records': [
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+
+from __future__ import absolute_import, division, print_function
+
+import mock
+import pytest
+from werkzeug.contrib.cache import SimpleCache
+
+from inspirehep.modules.theme.landing import get_landing_page_block
+from inspirehep.modules.theme.tasks import refresh_landing_page_blocks
+
+
+@pytest.fixture
+def literature_count():
+    count = mock.Mock(side_effect=[42, 43])
+    blocks = {'literature_count': count}
+
+    with mock.patch('inspirehep.modules.theme.landing.current_cache', SimpleCache()), \
+            mock.patch.dict('inspirehep.modules.theme.landing.LANDING_PAGE_BLOCKS', blocks):
+        yield count
+
+
+@mock.patch('inspirehep.modules.theme.landing.time.time', return_value=0)
+@mock.patch('inspirehep.modules.theme.tasks.refresh_landing_page_blocks.delay')
+def test_get_landing_page_block_computes_it_when_not_cached(delay, now, literature_count):
+    assert get_landing_page_block('literature_count') == 42
+    assert get_landing_page_block('literature_count') == 42
+
+    assert literature_count.call_count == 1
+    assert delay.call_count == 0
+
+
+@mock.patch('inspirehep.modules.theme.landing.time.time', return_value=0)
+@mock.patch('inspirehep.modules.theme.tasks.refresh_landing_page_blocks.delay')
+def test_get_landing_page_block_serves_stale_values_while_refreshing(delay, now, literature_count):
+    get_landing_page_block('literature_count')
+
+    now.return_value = 3600
+    assert get_landing_page_block('literature_count') == 42
+    assert get_landing_page_block('literature_count') == 42
+    delay.assert_called_once_with(['literature_count'])
+
+    refresh_landing_page_blocks(['literature_count'])
+
+    assert get_landing_page_block('literature_count') == 43
+    assert literature_count.call_count == 2
+    assert delay.call_count == 1
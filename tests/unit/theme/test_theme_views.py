@@ -25,6 +25,7 @@ from __future__ import absolute_import, division, print_function
 import json
 
 import mock
+from werkzeug.contrib.cache import SimpleCache
 
 from mocks import MockUser
 
@@ -120,3 +121,29 @@ def test_page_not_Found_returns_json_when_in_api(api_client):
     result = json.loads(response.data)
 
     assert expected == result
+
+
+@mock.patch('inspirehep.modules.theme.views.current_cache', SimpleCache())
+@mock.patch('inspirehep.modules.theme.views.get_institution_people_datatables_rows')
+def test_ajax_institutions_people_caches_and_paginates_rows(mock_get_rows, app_client):
+    mock_get_rows.return_value = [['foo', 3], ['bar', 2], ['baz', 1]]
+
+    response = app_client.get('/ajax/institutions/people?recid=902725')
+
+    assert response.status_code == 200
+    assert json.loads(response.data)['data'] == [['foo', 3], ['bar', 2], ['baz', 1]]
+
+    response = app_client.get(
+        '/ajax/institutions/people?recid=902725&draw=2&start=1&length=1')
+
+    expected = {
+        'data': [['bar', 2]],
+        'draw': 2,
+        'recordsFiltered': 3,
+        'recordsTotal': 3,
+        'total': 3,
+    }
+    result = json.loads(response.data)
+
+    assert expected == result
+    mock_get_rows.assert_called_once_with('902725')
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+
+from __future__ import absolute_import, division, print_function
+
+from mock import patch
+
+from inspirehep.utils import journals
+from inspirehep.utils.journals import JournalIndex, get_journal_index
+
+
+PHYS_REV = {
+    '_collections': ['Journals'],
+    'control_number': 1214516,
+    'journal_title': {'title': 'Physical Review'},
+    'refereed': True,
+    'self': {'$ref': 'http://localhost:5000/api/journals/1214516'},
+    'short_title': 'Phys.Rev.',
+    'title_variants': ['PHYS REV', 'Phys. Rev.'],
+}
+
+PHYS_REV_LETT = {
+    '_collections': ['Journals'],
+    '_harvesting_info': {'coverage': 'full'},
+    'control_number': 1214495,
+    'journal_title': {'title': 'Physical Review Letters'},
+    'self': {'$ref': 'http://localhost:5000/api/journals/1214495'},
+    'short_title': 'Phys.Rev.Lett.',
+    'title_variants': ['Phys.Rev.'],
+}
+
+
+def test_journal_index_get_by_title_is_case_insensitive():
+    index = JournalIndex([PHYS_REV, PHYS_REV_LETT])
+
+    assert index.get_by_title('physical review')['control_number'] == 1214516
+    assert index.get_by_title('Phys. Rev.')['control_number'] == 1214516
+    assert index.get_by_title('PHYSICAL REVIEW LETTERS')['control_number'] == 1214495
+    assert index.get_by_title('Unknown') is None
+    assert index.get_by_title(None) is None
+
+
+def test_journal_index_prefers_short_titles_to_title_variants():
+    index = JournalIndex([PHYS_REV, PHYS_REV_LETT])
+
+    assert index.get_by_title('Phys.Rev.')['control_number'] == 1214516
+
+
+def test_journal_index_keeps_only_the_needed_fields():
+    index = JournalIndex([PHYS_REV_LETT])
+
+    expected = {
+        '_harvesting_info': {'coverage': 'full'},
+        'control_number': 1214495,
+        'self': {'$ref': 'http://localhost:5000/api/journals/1214495'},
+        'short_title': 'Phys.Rev.Lett.',
+    }
+    result = index.get_by_recid(1214495)
+
+    assert expected == result
+
+
+def test_journal_index_get_by_refs_skips_unknown_journals():
+    index = JournalIndex([PHYS_REV, PHYS_REV_LETT])
+
+    refs = [
+        {'$ref': 'http://localhost:5000/api/journals/1214495'},
+        {'$ref': 'http://localhost:5000/api/journals/1'},
+    ]
+
+    assert [el['control_number'] for el in index.get_by_refs(refs)] == [1214495]
+    assert index.get_by_refs(None) == []
+
+
+@patch('inspirehep.utils.journals._INDEX', None)
+@patch('inspirehep.utils.journals._load_journals')
+@patch('inspirehep.utils.journals._get_redis')
+def test_get_journal_index_reloads_when_the_version_changes(mock_get_redis, mock_load_journals, app):
+    mock_load_journals.return_value = [PHYS_REV]
+    mock_get_redis.return_value.get.return_value = '1'
+
+    index = get_journal_index()
+    assert get_journal_index() is index
+    assert mock_load_journals.call_count == 1
+
+    mock_load_journals.return_value = [PHYS_REV, PHYS_REV_LETT]
+    mock_get_redis.return_value.get.return_value = '2'
+
+    assert get_journal_index() is not index
+    assert len(get_journal_index()) == 2
+    assert mock_load_journals.call_count == 2
+    assert journals._INDEX.version == '2'
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+
+from __future__ import absolute_import, division, print_function
+
+from elasticsearch_dsl import result
+from flask import current_app
+from jinja2 import Template
+from mock import Mock, patch
+
+from inspirehep.modules.records.wrappers import LiteratureRecord
+from inspirehep.modules.theme.jinja2filters import (
+    link_to_hep_affiliation,
+    proceedings_link,
+    publication_info,
+)
+from inspirehep.utils.template import render_macro_from_template
+from inspirehep.utils.template_prefetch import (
+    get_pid_from_ref,
+    get_template_prefetch_context,
+    template_prefetch,
+)
+
+
+def _build_ref(endpoint, recid):
+    server = current_app.config['SERVER_NAME']
+    if not server.startswith('http://'):
+        server = 'http://{}'.format(server)
+    return {'$ref': '{}/api/{}/{}'.format(server, endpoint, recid)}
+
+
+def _aggregations_response(name, buckets):
+    return result.Response({
+        'hits': {'hits': [], 'max_score': 0, 'total': 0},
+        'aggregations': {name: {'buckets': buckets}},
+        'timed_out': False,
+        'took': 1,
+    })
+
+
+def test_get_pid_from_ref():
+    expected = ('con', '976391')
+    result = get_pid_from_ref(_build_ref('conferences', 976391))
+
+    assert expected == result
+
+
+def test_get_pid_from_ref_returns_none_on_other_servers():
+    assert get_pid_from_ref({'$ref': 'http://x/api/conferences/1'}) is None
+
+
+def test_get_pid_from_ref_returns_none_without_ref():
+    assert get_pid_from_ref({}) is None
+
+
+def test_template_prefetch_is_only_active_inside_its_block():
+    assert get_template_prefetch_context() is None
+
+    with template_prefetch() as context:
+        assert context is get_template_prefetch_context()
+
+    assert get_template_prefetch_context() is None
+
+
+@patch('inspirehep.modules.records.wrappers.replace_refs')
+@patch('inspirehep.utils.template_prefetch.get_es_records')
+def test_publication_info_resolves_refs_once_per_detail_page_render(g_e_r, r_r):
+    es_records = {
+        'con': [
+            {'control_number': 976391, 'titles': [{'title': 'Moriond'}]},
+            {'control_number': 1331207, 'titles': [{'title': 'Moriond'}]},
+        ],
+        'lit': [
+            {'control_number': 1402672, 'titles': [{'title': 'Proceedings'}]},
+        ],
+    }
+    g_e_r.side_effect = lambda pid_type, recids: es_records[pid_type]
+
+    record = LiteratureRecord({
+        'publication_info': [
+            {
+                'conference_record': _build_ref('conferences', 976391),
+                'parent_record': _build_ref('literature', 1402672),
+            },
+            {'conference_record': _build_ref('conferences', 1331207)},
+            {'conference_record': _build_ref('conferences', 976391)},
+        ],
+    })
+
+    with template_prefetch(record):
+        # The detail page calls the filter twice.
+        publication_info(record)
+        result = publication_info(record)
+
+    assert g_e_r.call_count == 2
+    assert r_r.call_count == 0
+    assert '976391' in result['conf_info']
+
+
+@patch('inspirehep.modules.records.wrappers.replace_refs')
+@patch('inspirehep.utils.template_prefetch.get_es_records')
+def test_publication_info_falls_back_to_refs_not_prefetched(g_e_r, r_r):
+    r_r.return_value = {'control_number': 976391}
+
+    record = LiteratureRecord({
+        'publication_info': [
+            {'conference_record': {'$ref': 'http://x/api/conferences/976391'}},
+        ],
+    })
+
+    with template_prefetch(record):
+        publication_info(record)
+
+    assert g_e_r.call_count == 0
+    assert r_r.call_count == 1
+
+
+@patch('inspirehep.modules.records.wrappers.replace_refs')
+@patch('inspirehep.utils.record_getter.PersistentIdentifier')
+@patch('inspirehep.modules.search.api.es.mget')
+def test_publication_info_falls_back_when_the_es_document_is_missing(mget, pid, r_r):
+    pid.query.filter.return_value.all.return_value = [
+        Mock(object_uuid='a-redirect-uuid'),
+    ]
+    mget.return_value = {
+        'docs': [
+            {
+                '_index': 'records-conferences',
+                '_type': 'conferences',
+                '_id': 'a-redirect-uuid',
+                'found': False,
+            },
+        ],
+    }
+    r_r.return_value = None
+
+    record = LiteratureRecord({
+        'publication_info': [
+            {'conference_record': _build_ref('conferences', 976391)},
+        ],
+    })
+
+    with template_prefetch(record) as context:
+        result = publication_info(record)
+
+    assert context.records == {}
+    assert r_r.call_count == 1
+    assert 'conf_info' not in result
+
+
+@patch('inspirehep.utils.template_prefetch.LiteratureSearch.execute')
+def test_proceedings_link_uses_the_prefetched_proceedings(s):
+    s.return_value = _aggregations_response('proceedings', {
+        'C15-03-14': {
+            'doc_count': 1,
+            'hits': {'hits': {'hits': [
+                {'_source': {'control_number': 1410174}},
+            ]}},
+        },
+        'C16-01-01': {
+            'doc_count': 0,
+            'hits': {'hits': {'hits': []}},
+        },
+    })
+
+    records = [{'cnum': 'C15-03-14'}, {'cnum': 'C16-01-01'}]
+
+    with template_prefetch(*records):
+        results = [proceedings_link(record) for record in records]
+
+    expected = ['<a href="/record/1410174">Proceedings</a>', '']
+
+    assert expected == results
+    assert s.call_count == 1
+
+
+@patch('inspirehep.utils.template_prefetch.InstitutionsSearch.execute')
+def test_link_to_hep_affiliation_uses_the_prefetched_counts(s):
+    s.return_value = _aggregations_response('affiliations', {
+        'CERN': {'doc_count': 2},
+        'DESY': {'doc_count': 1},
+    })
+
+    records = [{'ICN': 'CERN'}, {'ICN': 'DESY'}]
+
+    with template_prefetch(*records):
+        results = [link_to_hep_affiliation(record) for record in records]
+
+    expected = ['2 Papers from CERN', '1 Paper from DESY']
+
+    assert expected == results
+    assert s.call_count == 1
+
+
+def test_render_macro_from_template_reuses_the_template_module():
+    make_module = Template.make_module
+
+    with patch.object(Template, 'make_module', autospec=True) as m_m:
+        m_m.side_effect = make_module
+
+        with template_prefetch():
+            for _ in range(3):
+                render_macro_from_template(
+                    name='pub_info',
+                    template='inspirehep_theme/format/record/Publication_info.tpl',
+                    ctx={'journal_title': 'JINST'},
+                )
+
+    assert m_m.call_count == 1
@@ -22,7 +22,45 @@
 
 from __future__ import absolute_import, division, print_function
 
-from inspirehep.utils.tickets import _strip_lines
+from mock import patch
+from werkzeug.contrib.cache import SimpleCache
+
+from inspirehep.utils.tickets import (
+    _strip_lines,
+    get_tickets_by_recid,
+    get_users,
+    resolve_ticket,
+)
+
+
+class StubRt(object):
+    """In-memory stand-in for the RT client."""
+
+    url = 'https://rt.inspirehep.net/REST/1.0/'
+
+    def __init__(self, tickets):
+        self.tickets = tickets
+        self.calls = []
+
+    def _get_current_object(self):
+        return self
+
+    def search(self, **kwargs):
+        self.calls.append(('search', kwargs['CF_RecordID']))
+        return [
+            {'id': 'ticket/{}'.format(ticket_id), 'Subject': subject}
+            for ticket_id, subject in self.tickets.get(kwargs['CF_RecordID'], [])
+        ]
+
+    def get_attachments_ids(self, ticket_id):
+        self.calls.append(('get_attachments_ids', ticket_id))
+        return [1]
+
+    def get_attachment(self, ticket_id, attachment_id):
+        return {'ContentType': 'text/plain', 'Content': 'text of ' + ticket_id}
+
+    def edit_ticket(self, ticket_id, **kwargs):
+        self.calls.append(('edit_ticket', ticket_id))
 
 
 def test__strip_lines():
@@ -34,3 +72,56 @@ def test__strip_lines():
     stripped = _strip_lines(multiline_string)
 
     assert expected == stripped
+
+
+def test_get_tickets_by_recid_sets_extra_attributes_and_caches():
+    rt = StubRt({'1': [('10', 'foo'), ('11', 'bar')]})
+
+    with patch('inspirehep.utils.tickets.rt_instance', rt), \
+            patch('inspirehep.utils.tickets.current_cache', SimpleCache()):
+        expected = [
+            {
+                'id': 'ticket/10',
+                'Id': '10',
+                'Subject': 'foo',
+                'Text': 'text of 10',
+                'Link': 'https://rt.inspirehep.net/Ticket/Display.html?id=10',
+            },
+            {
+                'id': 'ticket/11',
+                'Id': '11',
+                'Subject': 'bar',
+                'Text': 'text of 11',
+                'Link': 'https://rt.inspirehep.net/Ticket/Display.html?id=11',
+            },
+        ]
+        assert expected == get_tickets_by_recid(1)
+        assert expected == get_tickets_by_recid(1)
+
+    assert rt.calls.count(('search', '1')) == 1
+    assert rt.calls.count(('get_attachments_ids', '10')) == 1
+
+
+def test_resolve_ticket_invalidates_the_tickets_of_the_record():
+    rt = StubRt({'1': [('10', 'foo')]})
+
+    with patch('inspirehep.utils.tickets.rt_instance', rt), \
+            patch('inspirehep.utils.tickets.current_cache', SimpleCache()):
+        get_tickets_by_recid(1)
+        resolve_ticket('10')
+        rt.tickets = {}
+
+        assert [] == get_tickets_by_recid(1)
+
+    assert rt.calls.count(('search', '1')) == 2
+
+
+@patch('inspirehep.utils.tickets._query_all_of')
+def test_get_users_is_cached(mock_query_all_of):
+    mock_query_all_of.return_value = [{'id': '1', 'name': 'cataloger'}]
+
+    with patch('inspirehep.utils.tickets.current_cache', SimpleCache()):
+        assert [{'id': '1', 'name': 'cataloger'}] == get_users()
+        assert [{'id': '1', 'name': 'cataloger'}] == get_users()
+
+    mock_query_all_of.assert_called_once_with('user')
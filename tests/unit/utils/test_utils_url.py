@@ -25,15 +25,19 @@ from __future__ import absolute_import, division, print_function
 import os
 
 import pytest
+import requests
 import requests_mock
 from flask import current_app
 from mock import patch
 from six import binary_type, text_type
 
 from inspirehep.utils.url import (
+    IncompleteDownloadError,
+    download_files,
     get_legacy_url_for_recid,
     is_pdf_link,
     make_user_agent_string,
+    pop_probed_content,
     retrieve_uri,
 )
 
@@ -50,6 +54,97 @@ def test_is_pdf_link_handles_pdfs_starting_with_blank_lines():
     assert is_pdf_link('https://arxiv.org/pdf/1803.01183.pdf')
 
 
+def test_is_pdf_link_does_not_probe_pdf_links_again():
+    with requests_mock.Mocker() as requests_mocker:
+        requests_mocker.register_uri(
+            'GET', 'http://example.org/probed-once.pdf', content=b'%PDF-1.4')
+
+        assert is_pdf_link('http://example.org/probed-once.pdf')
+        assert is_pdf_link('http://example.org/probed-once.pdf')
+        assert requests_mocker.call_count == 1
+
+
+def test_is_pdf_link_keeps_content():
+    with requests_mock.Mocker() as requests_mocker:
+        requests_mocker.register_uri(
+            'GET', 'http://example.org/not-a-pdf', content=b'<html></html>')
+
+        assert not is_pdf_link('http://example.org/not-a-pdf', keep_content=True)
+
+        probed_content = pop_probed_content('http://example.org/not-a-pdf')
+        assert probed_content.read() == b'<html></html>'
+        assert pop_probed_content('http://example.org/not-a-pdf') is None
+
+
+def test_download_files_uses_content_kept_by_is_pdf_link():
+    with requests_mock.Mocker() as requests_mocker:
+        requests_mocker.register_uri(
+            'GET', 'http://example.org/kept.pdf', content=b'%PDF kept')
+
+        assert is_pdf_link('http://example.org/kept.pdf', keep_content=True)
+
+        with download_files(['http://example.org/kept.pdf']) as (downloaded, errors):
+            assert not errors
+            assert downloaded['http://example.org/kept.pdf'].read() == b'%PDF kept'
+
+        assert requests_mocker.call_count == 1
+
+
+def test_download_files():
+    with requests_mock.Mocker() as requests_mocker:
+        requests_mocker.register_uri(
+            'GET', 'http://example.org/foo.pdf', content=b'%PDF foo')
+        requests_mocker.register_uri(
+            'GET', 'http://example.org/bar.pdf', content=b'%PDF bar')
+
+        urls = [
+            'http://example.org/foo.pdf',
+            'http://example.org/bar.pdf',
+            'http://example.org/foo.pdf',
+        ]
+
+        with download_files(urls, max_workers=2) as (downloaded, errors):
+            assert not errors
+            assert downloaded['http://example.org/foo.pdf'].read() == b'%PDF foo'
+            assert downloaded['http://example.org/bar.pdf'].read() == b'%PDF bar'
+
+        assert requests_mocker.call_count == 2
+
+
+def test_download_files_reports_failed_downloads():
+    with requests_mock.Mocker() as requests_mocker:
+        requests_mocker.register_uri(
+            'GET', 'http://example.org/missing.pdf', status_code=404)
+        requests_mocker.register_uri(
+            'GET', 'http://example.org/truncated.pdf', content=b'%PDF',
+            headers={'Content-Length': '1024'})
+
+        urls = [
+            'http://example.org/missing.pdf',
+            'http://example.org/truncated.pdf',
+        ]
+
+        with download_files(urls) as (downloaded, errors):
+            assert not downloaded
+            assert isinstance(
+                errors['http://example.org/missing.pdf'],
+                requests.exceptions.HTTPError,
+            )
+            assert isinstance(
+                errors['http://example.org/truncated.pdf'],
+                IncompleteDownloadError,
+            )
+
+
+def test_download_files_opens_local_files(tmpdir):
+    test_file = tmpdir.join('file.txt')
+    test_file.write('some content')
+
+    with download_files([binary_type(test_file)]) as (downloaded, errors):
+        assert not errors
+        assert downloaded[binary_type(test_file)].read() == 'some content'
+
+
 @patch('inspirehep.utils.url.__version__', '0.1.0')
 def test_make_user_agent_string():
     """Test that user agent is created."""
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+from __future__ import absolute_import, division, print_function
+
+from mock import Mock, patch
+
+from inspirehep.modules.workflows.batch_matching import (
+    can_batch_match,
+    get_exact_matches,
+    invalidate_exact_matches,
+    resolve_exact_matches,
+)
+
+
+EXACT_MATCH_CONFIG = {
+    'algorithm': [
+        {
+            'queries': [
+                {
+                    'path': 'arxiv_eprints.value',
+                    'search_path': 'arxiv_eprints.value.raw',
+                    'type': 'exact',
+                },
+                {
+                    'path': 'dois.value',
+                    'search_path': 'dois.value.raw',
+                    'type': 'exact',
+                },
+            ],
+        },
+    ],
+    'doc_type': 'hep',
+    'index': 'records-hep',
+}
+
+
+class MockCache(object):
+
+    def __init__(self):
+        self.data = {}
+
+    def get_many(self, *keys):
+        return [self.data.get(key) for key in keys]
+
+    def set_many(self, mapping, timeout=None):
+        self.data.update(mapping)
+
+    def delete_many(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def add(self, key, value, timeout=None):
+        if key in self.data:
+            return False
+        self.data[key] = value
+        return True
+
+
+def test_can_batch_match():
+    assert can_batch_match(EXACT_MATCH_CONFIG)
+
+
+def test_can_batch_match_returns_false_with_fuzzy_queries():
+    config = {
+        'algorithm': [
+            {
+                'queries': [
+                    {
+                        'clauses': [{'boost': 20, 'path': 'titles'}],
+                        'type': 'fuzzy',
+                    },
+                ],
+            },
+        ],
+        'doc_type': 'hep',
+        'index': 'records-hep',
+    }
+
+    assert not can_batch_match(config)
+
+
+@patch('inspirehep.modules.workflows.batch_matching.scan')
+def test_resolve_exact_matches_runs_one_query_per_identifier_type(mock_scan):
+    mock_scan.side_effect = [
+        iter([
+            {'_source': {'control_number': 1, 'arxiv_eprints': [{'value': '1801.00001'}]}},
+        ]),
+        iter([
+            {'_source': {'control_number': 2, 'dois': [{'value': '10.1/foo'}]}},
+            {'_source': {'control_number': 1, 'dois': [{'value': '10.1/foo'}]}},
+        ]),
+    ]
+
+    records = [
+        {'arxiv_eprints': [{'value': '1801.00001'}], 'dois': [{'value': '10.1/foo'}]},
+        {'arxiv_eprints': [{'value': '1801.00002'}]},
+    ]
+
+    expected = {
+        ('arxiv_eprints.value.raw', '1801.00001'): [1],
+        ('arxiv_eprints.value.raw', '1801.00002'): [],
+        ('dois.value.raw', '10.1/foo'): [1, 2],
+    }
+    result = resolve_exact_matches(records, EXACT_MATCH_CONFIG)
+
+    assert expected == result
+    assert mock_scan.call_count == 2
+
+
+@patch('inspirehep.modules.workflows.batch_matching.resolve_exact_matches')
+def test_get_exact_matches_resolves_the_batch_once(mock_resolve):
+    mock_resolve.return_value = {
+        ('arxiv_eprints.value.raw', '1801.00001'): [1],
+        ('arxiv_eprints.value.raw', '1801.00002'): [],
+    }
+
+    record = {'arxiv_eprints': [{'value': '1801.00001'}]}
+    other_record = {'arxiv_eprints': [{'value': '1801.00002'}]}
+
+    with patch(
+        'inspirehep.modules.workflows.batch_matching.current_cache',
+        MockCache(),
+    ):
+        assert [1] == get_exact_matches(
+            record, EXACT_MATCH_CONFIG, lambda: [other_record])
+        assert [] == get_exact_matches(
+            other_record, EXACT_MATCH_CONFIG, lambda: [record])
+
+    assert mock_resolve.call_count == 1
+
+
+@patch('inspirehep.modules.workflows.batch_matching.scan')
+def test_resolve_exact_matches_ignores_the_case_of_identifiers(mock_scan):
+    mock_scan.return_value = iter([
+        {'_source': {'control_number': 1, 'dois': [{'value': '10.1103/PhysRevD.98.123'}]}},
+    ])
+
+    records = [{'dois': [{'value': '10.1103/physrevd.98.123'}]}]
+
+    expected = {('dois.value.raw', '10.1103/physrevd.98.123'): [1]}
+    result = resolve_exact_matches(records, EXACT_MATCH_CONFIG)
+
+    assert expected == result
+    assert mock_scan.call_args[1]['query'] == {
+        'query': {
+            'bool': {
+                'should': [
+                    {'match': {'dois.value.raw': '10.1103/physrevd.98.123'}},
+                ],
+                'minimum_should_match': 1,
+            },
+        },
+    }
+
+
+@patch('inspirehep.modules.workflows.batch_matching.resolve_exact_matches')
+def test_get_exact_matches_loads_the_batch_once(mock_resolve):
+    mock_resolve.side_effect = lambda records, config: {
+        ('arxiv_eprints.value.raw', record['arxiv_eprints'][0]['value']): []
+        for record in records
+    }
+    get_batch_records = Mock(return_value=[])
+
+    with patch(
+        'inspirehep.modules.workflows.batch_matching.current_cache',
+        MockCache(),
+    ):
+        for i in range(3):
+            record = {'arxiv_eprints': [{'value': '1801.0000%d' % i}]}
+            get_exact_matches(
+                record, EXACT_MATCH_CONFIG, get_batch_records, 'a-job-id')
+
+    assert mock_resolve.call_count == 3
+    assert get_batch_records.call_count == 1
+
+
+@patch('inspirehep.modules.workflows.batch_matching.resolve_exact_matches')
+def test_get_exact_matches_finds_stored_records_not_yet_searchable(mock_resolve):
+    mock_resolve.return_value = {
+        ('dois.value.raw', '10.1103/PhysRevD.98.123'): [],
+    }
+
+    stored_record = {
+        'control_number': 1234567,
+        'dois': [{'value': '10.1103/PhysRevD.98.123'}],
+    }
+    duplicate = {'dois': [{'value': '10.1103/PhysRevD.98.123'}]}
+
+    with patch(
+        'inspirehep.modules.workflows.batch_matching.current_cache',
+        MockCache(),
+    ):
+        invalidate_exact_matches(stored_record, EXACT_MATCH_CONFIG)
+        # Elasticsearch wasn't refreshed yet: the stored record isn't found.
+        assert [1234567] == get_exact_matches(duplicate, EXACT_MATCH_CONFIG)
+        assert [1234567] == get_exact_matches(duplicate, EXACT_MATCH_CONFIG)
+
+    assert mock_resolve.call_count == 1
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+from __future__ import absolute_import, division, print_function
+
+import threading
+
+import pytest
+import requests
+from flask import current_app
+from mock import patch
+
+from inspirehep.modules.workflows.predictions import (
+    PredictionBatcher,
+    batched_prediction_request,
+    can_coalesce_requests,
+)
+
+
+def _predict_concurrently(batcher, payloads, request):
+    results = [None] * len(payloads)
+
+    def _predict(index, payload):
+        results[index] = batcher.predict(payload, request)
+
+    threads = [
+        threading.Thread(target=_predict, args=(index, payload))
+        for index, payload in enumerate(payloads)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return results
+
+
+def test_prediction_batcher_coalesces_concurrent_requests():
+    calls = []
+
+    def request(url, data):
+        calls.append(url)
+        return [{'echo': el['text']} for el in data]
+
+    batcher = PredictionBatcher(
+        url='http://magpie/predict',
+        batch_url='http://magpie/predict/batch',
+        max_wait=0.5,
+        max_size=3,
+    )
+
+    payloads = [{'text': 'foo'}, {'text': 'bar'}, {'text': 'baz'}]
+
+    expected_results = [{'echo': 'foo'}, {'echo': 'bar'}, {'echo': 'baz'}]
+    expected_calls = ['http://magpie/predict/batch']
+    result = _predict_concurrently(batcher, payloads, request)
+
+    assert expected_results == result
+    assert expected_calls == calls
+
+
+def test_prediction_batcher_falls_back_to_single_requests():
+    calls = []
+
+    def request(url, data):
+        calls.append(url)
+        if url.endswith('/batch'):
+            return None
+        return {'echo': data['text']}
+
+    batcher = PredictionBatcher(
+        url='http://beard/predictor/coreness',
+        batch_url='http://beard/predictor/coreness/batch',
+        max_wait=0.5,
+        max_size=2,
+    )
+
+    payloads = [{'text': 'foo'}, {'text': 'bar'}]
+
+    expected_results = [{'echo': 'foo'}, {'echo': 'bar'}]
+    result = _predict_concurrently(batcher, payloads, request)
+
+    assert expected_results == result
+    assert calls.count('http://beard/predictor/coreness/batch') == 1
+    assert calls.count('http://beard/predictor/coreness') == 2
+    assert not batcher.supports_batches
+
+    assert {'echo': 'qux'} == batcher.predict({'text': 'qux'}, request)
+    assert calls.count('http://beard/predictor/coreness/batch') == 1
+
+
+def test_prediction_batcher_probes_the_batch_endpoint_again():
+    calls = []
+    replies = [None, [{'echo': 'foo'}, {'echo': 'bar'}]]
+
+    def request(url, data):
+        calls.append(url)
+        if url.endswith('/batch'):
+            return replies.pop(0)
+        return {'echo': data['text']}
+
+    batcher = PredictionBatcher(
+        url='http://magpie/predict',
+        batch_url='http://magpie/predict/batch',
+        max_wait=0.5,
+        max_size=2,
+        reprobe_after=0,
+    )
+
+    payloads = [{'text': 'foo'}, {'text': 'bar'}]
+
+    expected_results = [{'echo': 'foo'}, {'echo': 'bar'}]
+    assert expected_results == _predict_concurrently(batcher, payloads, request)
+    assert batcher.supports_batches
+    assert expected_results == _predict_concurrently(batcher, payloads, request)
+
+    assert calls.count('http://magpie/predict/batch') == 2
+    assert calls.count('http://magpie/predict') == 2
+
+
+def test_prediction_batcher_propagates_request_errors():
+    def request(url, data):
+        raise requests.exceptions.ConnectionError()
+
+    batcher = PredictionBatcher(
+        url='http://magpie/predict',
+        batch_url='http://magpie/predict/batch',
+        max_wait=0,
+        max_size=10,
+    )
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        batcher.predict({'text': 'foo'}, request)
+
+
+def test_batched_prediction_request_sends_right_away_when_disabled():
+    config = {'WORKFLOWS_PREDICTION_BATCH_MAX_WAIT': 0}
+
+    def request(url, data):
+        return {'url': url, 'data': data}
+
+    with patch.dict(current_app.config, config):
+        expected = {'url': 'http://magpie/predict', 'data': {'text': 'foo'}}
+        result = batched_prediction_request(
+            'http://magpie/predict', {'text': 'foo'}, request)
+
+        assert expected == result
+
+
+def test_can_coalesce_requests_only_outside_of_the_main_thread():
+    results = []
+
+    thread = threading.Thread(
+        target=lambda: results.append(can_coalesce_requests()))
+    thread.start()
+    thread.join()
+
+    assert not can_coalesce_requests()
+    assert results == [True]
+
+
+@patch('inspirehep.modules.workflows.predictions.get_prediction_batcher')
+def test_batched_prediction_request_sends_right_away_from_the_main_thread(mock_get_batcher):
+    config = {'WORKFLOWS_PREDICTION_BATCH_MAX_WAIT': 0.5}
+
+    def request(url, data):
+        return {'url': url, 'data': data}
+
+    with patch.dict(current_app.config, config):
+        expected = {'url': 'http://magpie/predict', 'data': {'text': 'foo'}}
+        result = batched_prediction_request(
+            'http://magpie/predict', {'text': 'foo'}, request)
+
+        assert expected == result
+        mock_get_batcher.assert_not_called()
+
+
+@patch('inspirehep.modules.workflows.predictions.can_coalesce_requests', return_value=True)
+@patch('inspirehep.modules.workflows.predictions.get_prediction_batcher')
+def test_batched_prediction_request_uses_the_batcher_when_it_can_coalesce(mock_get_batcher, mock_can_coalesce):
+    config = {'WORKFLOWS_PREDICTION_BATCH_MAX_WAIT': 0.5}
+    mock_get_batcher.return_value.predict.return_value = {'echo': 'foo'}
+
+    with patch.dict(current_app.config, config):
+        result = batched_prediction_request(
+            'http://magpie/predict', {'text': 'foo'}, None)
+
+    assert {'echo': 'foo'} == result
+    mock_get_batcher.assert_called_once_with('http://magpie/predict')
@@ -26,6 +26,7 @@ import os
 from mock import patch
 import pkg_resources
 import pytest
+import requests
 import requests_mock
 from flask import current_app
 from jsonschema import ValidationError
@@ -155,6 +156,53 @@ def test_download_documents_with_multiple_documents():
         assert expected_document_url_2 == documents[1]['url']
 
 
+def test_download_documents_skips_documents_with_an_error_status():
+    with requests_mock.Mocker() as requests_mocker:
+        requests_mocker.register_uri(
+            'GET', 'http://export.arxiv.org/pdf/1605.03844',
+            status_code=404,
+        )
+
+        data = {
+            'documents': [
+                {
+                    'key': '1605.03844.pdf',
+                    'url': 'http://export.arxiv.org/pdf/1605.03844'
+                },
+            ],
+        }
+        obj = MockObj(data, {}, files=MockFiles({}))
+        eng = MockEng()
+
+        assert download_documents(obj, eng) is None
+
+        expected_document_url = 'http://export.arxiv.org/pdf/1605.03844'
+
+        assert expected_document_url == obj.data['documents'][0]['url']
+
+
+def test_download_documents_raises_on_connection_errors():
+    with requests_mock.Mocker() as requests_mocker:
+        requests_mocker.register_uri(
+            'GET', 'http://export.arxiv.org/pdf/1605.03844',
+            exc=requests.exceptions.ConnectionError,
+        )
+
+        data = {
+            'documents': [
+                {
+                    'key': '1605.03844.pdf',
+                    'url': 'http://export.arxiv.org/pdf/1605.03844'
+                },
+            ],
+        }
+        obj = MockObj(data, {}, files=MockFiles({}))
+        eng = MockEng()
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            download_documents(obj, eng)
+
+
 def test_mark():
     obj = MockObj({}, {})
     eng = MockEng()
@@ -741,15 +789,15 @@ def fix_submission_number_does_nothing_if_method_is_not_hepcrawl():
     assert expected == result
 
 
-@patch('inspirehep.modules.workflows.tasks.actions.replace_refs')
-def test_populate_journal_coverage_writes_full_if_any_coverage_is_full(mock_replace_refs):
+@patch('inspirehep.modules.workflows.tasks.actions.get_journal_index')
+def test_populate_journal_coverage_writes_full_if_any_coverage_is_full(mock_get_journal_index):
     schema = load_schema('journals')
     subschema = schema['properties']['_harvesting_info']
 
     journals = [{'_harvesting_info': {'coverage': 'full'}}]
     assert validate(journals[0]['_harvesting_info'], subschema) is None
 
-    mock_replace_refs.return_value = journals
+    mock_get_journal_index.return_value.get_by_refs.return_value = journals
 
     schema = load_schema('hep')
     subschema = schema['properties']['publication_info']
@@ -773,15 +821,15 @@ def test_populate_journal_coverage_writes_full_if_any_coverage_is_full(mock_repl
     assert expected == result
 
 
-@patch('inspirehep.modules.workflows.tasks.actions.replace_refs')
-def test_populate_journal_coverage_writes_partial_if_all_coverages_are_partial(mock_replace_refs):
+@patch('inspirehep.modules.workflows.tasks.actions.get_journal_index')
+def test_populate_journal_coverage_writes_partial_if_all_coverages_are_partial(mock_get_journal_index):
     schema = load_schema('journals')
     subschema = schema['properties']['_harvesting_info']
 
     journals = [{'_harvesting_info': {'coverage': 'partial'}}]
     assert validate(journals[0]['_harvesting_info'], subschema) is None
 
-    mock_replace_refs.return_value = journals
+    mock_get_journal_index.return_value.get_by_refs.return_value = journals
 
     schema = load_schema('hep')
     subschema = schema['properties']['publication_info']
@@ -805,9 +853,9 @@ def test_populate_journal_coverage_writes_partial_if_all_coverages_are_partial(m
     assert expected == result
 
 
-@patch('inspirehep.modules.workflows.tasks.actions.replace_refs')
-def test_populate_journal_coverage_does_nothing_if_no_journal_is_found(mock_replace_refs):
-    mock_replace_refs.return_value = []
+@patch('inspirehep.modules.workflows.tasks.actions.get_journal_index')
+def test_populate_journal_coverage_does_nothing_if_no_journal_is_found(mock_get_journal_index):
+    mock_get_journal_index.return_value.get_by_refs.return_value = []
 
     data = {}
     extra_data = {}
@@ -1021,15 +1069,15 @@ def test_populate_submission_document_without_pdf():
         assert 0 == len(documents)
 
 
-@patch('inspirehep.modules.workflows.tasks.actions.replace_refs')
-def test_set_refereed_and_fix_document_type(mock_replace_refs):
+@patch('inspirehep.modules.workflows.tasks.actions.get_journal_index')
+def test_set_refereed_and_fix_document_type(mock_get_journal_index):
     schema = load_schema('journals')
     subschema = schema['properties']['refereed']
 
     journals = [{'refereed': True}]
     assert validate(journals[0]['refereed'], subschema) is None
 
-    mock_replace_refs.return_value = journals
+    mock_get_journal_index.return_value.get_by_refs.return_value = journals
 
     schema = load_schema('hep')
     subschema = schema['properties']['refereed']
@@ -1049,8 +1097,8 @@ def test_set_refereed_and_fix_document_type(mock_replace_refs):
     assert expected == result
 
 
-@patch('inspirehep.modules.workflows.tasks.actions.replace_refs')
-def test_set_refereed_and_fix_document_type_handles_journals_that_publish_mixed_content(mock_replace_refs):
+@patch('inspirehep.modules.workflows.tasks.actions.get_journal_index')
+def test_set_refereed_and_fix_document_type_handles_journals_that_publish_mixed_content(mock_get_journal_index):
     schema = load_schema('journals')
     proceedings_schema = schema['properties']['proceedings']
     refereed_schema = schema['properties']['refereed']
@@ -1059,7 +1107,7 @@ def test_set_refereed_and_fix_document_type_handles_journals_that_publish_mixed_
     assert validate(journals[0]['proceedings'], proceedings_schema) is None
     assert validate(journals[0]['refereed'], refereed_schema) is None
 
-    mock_replace_refs.return_value = journals
+    mock_get_journal_index.return_value.get_by_refs.return_value = journals
 
     schema = load_schema('hep')
     subschema = schema['properties']['refereed']
@@ -1079,15 +1127,15 @@ def test_set_refereed_and_fix_document_type_handles_journals_that_publish_mixed_
     assert expected == result
 
 
-@patch('inspirehep.modules.workflows.tasks.actions.replace_refs')
-def test_set_refereed_and_fix_document_type_sets_refereed_to_false_if_all_journals_are_not_refereed(mock_replace_refs):
+@patch('inspirehep.modules.workflows.tasks.actions.get_journal_index')
+def test_set_refereed_and_fix_document_type_sets_refereed_to_false_if_all_journals_are_not_refereed(mock_get_journal_index):
     schema = load_schema('journals')
     subschema = schema['properties']['refereed']
 
     journals = [{'refereed': False}]
     assert validate(journals[0]['refereed'], subschema) is None
 
-    mock_replace_refs.return_value = journals
+    mock_get_journal_index.return_value.get_by_refs.return_value = journals
 
     schema = load_schema('hep')
     subschema = schema['properties']['refereed']
@@ -1107,15 +1155,15 @@ def test_set_refereed_and_fix_document_type_sets_refereed_to_false_if_all_journa
     assert expected == result
 
 
-@patch('inspirehep.modules.workflows.tasks.actions.replace_refs')
-def test_set_refereed_and_fix_document_type_replaces_article_with_conference_paper_if_needed(mock_replace_refs):
+@patch('inspirehep.modules.workflows.tasks.actions.get_journal_index')
+def test_set_refereed_and_fix_document_type_replaces_article_with_conference_paper_if_needed(mock_get_journal_index):
     schema = load_schema('journals')
     subschema = schema['properties']['proceedings']
 
     journals = [{'proceedings': True}]
     assert validate(journals[0]['proceedings'], subschema) is None
 
-    mock_replace_refs.return_value = journals
+    mock_get_journal_index.return_value.get_by_refs.return_value = journals
 
     schema = load_schema('hep')
     subschema = schema['properties']['document_type']
@@ -1135,9 +1183,9 @@ def test_set_refereed_and_fix_document_type_replaces_article_with_conference_pap
     assert expected == result
 
 
-@patch('inspirehep.modules.workflows.tasks.actions.replace_refs')
-def test_set_refereed_and_fix_document_type_does_nothing_if_no_journals_were_found(mock_replace_refs):
-    mock_replace_refs.return_value = []
+@patch('inspirehep.modules.workflows.tasks.actions.get_journal_index')
+def test_set_refereed_and_fix_document_type_does_nothing_if_no_journals_were_found(mock_get_journal_index):
+    mock_get_journal_index.return_value.get_by_refs.return_value = []
 
     data = {'document_type': ['article']}
     extra_data = {}
@@ -29,7 +29,12 @@ import pytest
 from mock import patch
 from six import binary_type
 
-from inspirehep.modules.workflows.tasks.classifier import classify_paper
+from invenio_classifier.reader import get_cache
+
+from inspirehep.modules.workflows.tasks.classifier import (
+    classify_paper,
+    preload_taxonomy,
+)
 from mocks import MockEng, MockObj
 
 
@@ -180,3 +185,23 @@ def test_classify_paper_does_not_raise_on_unprintable_keywords(get_document_in_w
         with_author_keywords=True,
         no_cache=True,
     )(obj, eng)  # Does not raise.
+
+
+def test_preload_taxonomy(higgs_ontology):
+    preload_taxonomy(higgs_ontology)
+
+    single_keywords, composite_keywords = get_cache(higgs_ontology)[:2]
+    assert 'Higgs particle' in [
+        keyword.concept for keyword in single_keywords.values()
+    ]
+
+
+def test_preload_taxonomy_does_nothing_when_already_loaded(higgs_ontology):
+    preload_taxonomy(higgs_ontology)
+
+    with patch(
+        'inspirehep.modules.workflows.tasks.classifier.get_regular_expressions'
+    ) as get_regular_expressions:
+        preload_taxonomy(higgs_ontology)
+
+        get_regular_expressions.assert_not_called()
@@ -67,6 +67,28 @@ def test_exact_match_returns_true_if_something_matched(mock_match):
     assert expected == result
 
 
+@patch('inspirehep.modules.workflows.tasks.matching.get_harvest_records')
+@patch('inspirehep.modules.workflows.tasks.matching.get_exact_matches')
+@patch('inspirehep.modules.workflows.tasks.matching.match')
+def test_exact_match_resolves_the_harvest_in_batch_with_feature_flag(mock_match, mock_get_exact_matches, mock_get_harvest_records, app):
+    mock_get_exact_matches.return_value = [4328]
+
+    data = {}
+    extra_data = {'crawler_job_id': 'a-job-id'}
+
+    obj = MockObj(data, extra_data)
+    eng = MockEng()
+
+    with patch.dict(app.config, {'FEATURE_FLAG_ENABLE_BATCH_EXACT_MATCH': True}):
+        assert exact_match(obj, eng)
+
+    expected = [4328]
+    result = get_value(obj.extra_data, 'matches.exact')
+
+    assert expected == result
+    mock_match.assert_not_called()
+
+
 def test_set_exact_match_as_approved_in_extradata():
     data = {}
     extra_data = {